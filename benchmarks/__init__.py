@@ -0,0 +1 @@
+"""Скрипты измерения производительности."""
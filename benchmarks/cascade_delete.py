@@ -0,0 +1,99 @@
+"""
+Удаление книги с длинной историей выдач.
+
+Запуск: BENCHMARK_DB_URI=... python -m benchmarks.cascade_delete [выдач]
+Создаёт книгу с историей (по умолчанию 10 000 выдач) и удаляет её
+прежним путём (история загружается в сессию и удаляется ORM)
+и новым (один DELETE, историю удаляет ON DELETE CASCADE базы).
+Печатает время и число SQL-выражений. Нужна пустая база
+или база со схемой проекта: недостающие таблицы создаются.
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from os import getenv
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from lib_api.business_models.base_model.base_model import Base
+from lib_api.business_models.library_models.models_lib import (Book, Reader,
+                                                               ReaderBook)
+
+
+async def add_history(session_factory, loans: int) -> int:
+    """Создаёт книгу с loans закрытыми выдачами, возвращает её ID."""
+    async with session_factory() as db:
+        book = Book(title="Benchmark", author="Benchmark", copies_count=1)
+        reader = Reader(
+            name="Benchmark",
+            email=f"cascade-{time.monotonic_ns()}@example.com",
+        )
+        db.add_all([book, reader])
+        await db.flush()
+        start = datetime.now(timezone.utc) - timedelta(days=1)
+        await db.execute(insert(ReaderBook), [
+            {
+                "reader_id": reader.id, "book_id": book.id,
+                "borrow_date": start + timedelta(seconds=i),
+                "return_date": start + timedelta(seconds=i + 1),
+            }
+            for i in range(loans)
+        ])
+        await db.commit()
+        return book.id
+
+
+async def timed_delete(engine, session_factory, book_id, options) -> tuple:
+    """Загружает и удаляет книгу, возвращает (мс, число выражений)."""
+    statements = []
+
+    def collect(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", collect)
+    started = time.perf_counter()
+    try:
+        async with session_factory() as db:
+            book = await db.get(Book, book_id, options=options)
+            await db.delete(book)
+            await db.commit()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", collect)
+    return (time.perf_counter() - started) * 1000, len(statements)
+
+
+async def measure(uri: str, loans: int) -> None:
+    """Сравнивает прежний и новый путь удаления."""
+    engine = create_async_engine(uri)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    cases = (
+        ("loaded history (before)", [selectinload(Book.reader_books)]),
+        ("passive delete (after)", None),
+    )
+    print(f"{'delete with ' + str(loans) + ' loans':<26}"
+          f" {'ms':>10} {'statements':>12}")
+    for name, options in cases:
+        book_id = await add_history(session_factory, loans)
+        elapsed, count = await timed_delete(
+            engine, session_factory, book_id, options
+        )
+        print(f"{name:<26} {elapsed:>10.1f} {count:>12}")
+    await engine.dispose()
+
+
+def main(loans: int) -> None:
+    """Запускает измерение."""
+    uri = getenv("BENCHMARK_DB_URI")
+    if not uri:
+        sys.exit("BENCHMARK_DB_URI is not set")
+    asyncio.run(measure(uri, loans))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,57 @@
+"""
+Сравнение скорости проверки JWT токенов.
+
+Запуск: python -m benchmarks.jwt_verification [число проверок]
+Печатает число проверок в секунду для прежнего пути
+(jose.jwt.decode на каждый запрос) и новых верификаторов.
+"""
+
+import sys
+import time
+from importlib.util import find_spec
+
+from lib_api.business_models.librarian.token_verifier import (
+    CachingTokenVerifier, JoseTokenVerifier, PyJWTTokenVerifier)
+
+SECRET = "benchmark-secret-of-at-least-32-bytes"
+
+
+def measure(name: str, decode, token: str, rounds: int) -> None:
+    """Выполняет rounds проверок и печатает их скорость."""
+    decode(token)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decode(token)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<32} {rounds / elapsed:>12,.0f} verifications/sec")
+
+
+def main(rounds: int) -> None:
+    """Сравнивает реализации на одном и том же токене."""
+    from jose import jwt
+
+    claims = {"sub": "librarian@example.com", "exp": int(time.time()) + 3600}
+    jose_verifier = JoseTokenVerifier(SECRET, "HS256")
+    token = jose_verifier.encode(claims)
+
+    measure(
+        "jose.jwt.decode (current)",
+        lambda t: jwt.decode(t, SECRET, algorithms=["HS256"]),
+        token, rounds,
+    )
+    measure("JoseTokenVerifier", jose_verifier.decode, token, rounds)
+    if find_spec("jwt"):
+        pyjwt_verifier = PyJWTTokenVerifier("HS256", secret=SECRET)
+        measure("PyJWTTokenVerifier", pyjwt_verifier.decode, token, rounds)
+        measure(
+            "CachingTokenVerifier(PyJWT)",
+            CachingTokenVerifier(pyjwt_verifier).decode, token, rounds,
+        )
+    measure(
+        "CachingTokenVerifier(jose)",
+        CachingTokenVerifier(jose_verifier).decode, token, rounds,
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
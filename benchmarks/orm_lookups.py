@@ -0,0 +1,109 @@
+"""
+Накладные расходы ORM на выборку по ключу.
+
+Запуск: python -m benchmarks.orm_lookups [число выборок]
+Печатает время подготовки запроса в микросекундах
+для прежнего пути (новый select(...).where(...) на вызов)
+и заранее построенных запросов из lookups.
+Если задан BENCHMARK_DB_URI, дополнительно измеряет
+полное время выборки через сессию на этой базе.
+"""
+
+import asyncio
+import sys
+import time
+from os import getenv
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from lib_api.business_models.librarian.librarian_model import (
+    LIBRARIAN_BY_EMAIL, Librarian)
+from lib_api.business_models.library_models.lookups import (BOOK_BY_ISBN,
+                                                            READER_BY_EMAIL)
+from lib_api.business_models.library_models.models_lib import Book, Reader
+
+EMAIL = "benchmark@example.com"
+ISBN = "benchmark-isbn"
+
+
+def per_call(func, rounds: int) -> float:
+    """Выполняет func rounds раз и возвращает микросекунды на вызов."""
+    func()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1_000_000
+
+
+def build_book_by_isbn():
+    """Прежний путь: тот же запрос, что BOOK_BY_ISBN, на каждый вызов."""
+    return select(Book).where(Book.isbn == ISBN, Book.deleted_at.is_(None))
+
+
+def report(name: str, before: float, after: float) -> None:
+    """Печатает время до и после для одного запроса."""
+    print(f"{name:<24} {before:>10.2f} us {after:>10.2f} us")
+
+
+def measure_preparation(rounds: int) -> None:
+    """
+    Сравнивает подготовку запроса без обращения к базе.
+
+    SQLAlchemy на каждое выполнение вычисляет ключ кэша
+    компиляции; у заранее построенного запроса он запоминается.
+    """
+    cases = (
+        ("Book by isbn", build_book_by_isbn, BOOK_BY_ISBN),
+        ("Reader by email",
+         lambda: select(Reader).where(
+             func.lower(Reader.email) == func.lower(EMAIL),
+             Reader.deleted_at.is_(None),
+         ),
+         READER_BY_EMAIL),
+        ("Librarian by email",
+         lambda: select(Librarian).where(
+             func.lower(Librarian.email) == func.lower(EMAIL)
+         ),
+         LIBRARIAN_BY_EMAIL),
+    )
+    print(f"{'statement preparation':<24} {'before':>13} {'after':>13}")
+    for name, build, prebuilt in cases:
+        # Метод берётся через атрибут на каждом вызове:
+        # после первого вызова его заменяет запомненный результат.
+        report(
+            name,
+            per_call(lambda: build()._generate_cache_key(), rounds),
+            per_call(lambda: prebuilt._generate_cache_key(), rounds),
+        )
+
+
+async def measure_lookups(uri: str, rounds: int) -> None:
+    """Сравнивает полное время выборки книги по isbn через сессию."""
+    engine = create_async_engine(uri)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        async def timed(execute) -> float:
+            await execute()
+            started = time.perf_counter()
+            for _ in range(rounds):
+                await execute()
+            return (time.perf_counter() - started) / rounds * 1_000_000
+
+        before = await timed(lambda: db.execute(build_book_by_isbn()))
+        after = await timed(lambda: db.execute(BOOK_BY_ISBN, {"isbn": ISBN}))
+    await engine.dispose()
+    print(f"{'full lookup':<24} {'before':>13} {'after':>13}")
+    report("Book by isbn", before, after)
+
+
+def main(rounds: int) -> None:
+    """Запускает измерения."""
+    measure_preparation(rounds)
+    uri = getenv("BENCHMARK_DB_URI")
+    if uri:
+        asyncio.run(measure_lookups(uri, rounds // 10 or 1))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -1,15 +1,55 @@
 """Приложение FastApi."""
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
 
 from lib_api.business_models.base_model.base_model import Base
-from lib_api.database import async_engine
+from lib_api.business_models.availability.availability_hub import \
+    availability_hub
+from lib_api.business_models.jobs.hold_expiry import run_hold_expiry
+from lib_api.business_models.jobs.overdue_loans import run_overdue_scanner
+from lib_api.business_models.jobs.soft_delete_purge import \
+    run_soft_delete_purge
+from lib_api.business_models.jobs.stats_refresh import run_stats_refresher
+from lib_api.business_models.librarian.librarian_model import \
+    LIBRARIAN_BY_EMAIL
+from lib_api.business_models.librarian.revocation import (revocation_list,
+                                                          run_revocation_sync)
+from lib_api.business_models.librarian.security import get_pwd_context
+from lib_api.business_models.library_models.borrow_return_service import \
+    loan_partitions
+from lib_api.business_models.library_models.lookups import (
+    BOOK_BY_ISBN, BOOK_ID_EXISTS, READER_BY_EMAIL, READER_ID_EXISTS)
+from lib_api.database import (DB_WARMUP_CONNECTIONS, async_engine,
+                              async_session, replica_engine, warm_up_pool)
+from lib_api.health_routing import router as health_router
+from lib_api.idempotency.idempotency_middleware import IdempotencyMiddleware
+from lib_api.idempotency.idempotency_store import (idempotency_store,
+                                                   run_idempotency_cleanup)
 from lib_api.logs import logger
+from lib_api.middlewares.compression import CompressionMiddleware
+from lib_api.middlewares.read_your_writes import ReadYourWritesMiddleware
 from lib_api.routing import router as tasks_router
+from lib_api.throttling.login_throttle import (LOGIN_BUCKET_IDLE_SECONDS,
+                                               LoginThrottleMiddleware,
+                                               login_bucket_store)
+from lib_api.throttling.stores import run_bucket_cleanup
+
+# Те же объекты запросов, что выполняют обработчики: прогреваются
+# их ключи кэша компиляции и prepared statements соединений.
+WARM_UP_STATEMENTS = (
+    (LIBRARIAN_BY_EMAIL, {"email": ""}),
+    (READER_BY_EMAIL, {"email": ""}),
+    (BOOK_BY_ISBN, {"isbn": ""}),
+    (BOOK_ID_EXISTS, {"book_id": 0}),
+    (READER_ID_EXISTS, {"reader_id": 0}),
+)
 
 
 @asynccontextmanager
@@ -19,12 +59,58 @@ async def database_life_cycle(api: FastAPI) -> AsyncIterator:
 
     Устанавливает и закрывает соединение.
     Создает таблицы моделей, если их нет.
+    Заранее создаёт секции таблицы выдач на ближайшие годы.
+    Прогревает мапперы, контекст bcrypt, пул соединений
+    и горячие запросы, чтобы первые запросы не платили за это.
+    Загружает список отозванных токенов и запускает его синхронизацию.
+    Запускает фоновый поиск просроченных выдач,
+    обновление представлений статистики
+    очистку мягко удалённых книг и читателей
+    и устаревших ключей идемпотентности.
+    Открывает соединение LISTEN для потока доступности книг.
     """
     # async with async_engine.begin() as conn:
     #     await conn.run_sync(Base.metadata.create_all)
     #     logger.info(f"Tables are successfully created with {api}")
+    try:
+        async with async_engine.begin() as conn:
+            await loan_partitions.ensure_loan_partitions(conn)
+    except (OSError, SQLAlchemyError) as err:
+        logger.error(f"Loan partitions maintenance skipped: {err}")
+    configure_mappers()
+    await asyncio.to_thread(get_pwd_context)
+    try:
+        await warm_up_pool(
+            async_engine, DB_WARMUP_CONNECTIONS, WARM_UP_STATEMENTS
+        )
+    except (OSError, SQLAlchemyError) as err:
+        logger.error(f"Connection pool warm-up skipped: {err}")
+    try:
+        async with async_session() as session:
+            await revocation_list.sync(session)
+    except (OSError, SQLAlchemyError) as err:
+        logger.error(f"Revocation list preload skipped: {err}")
+    background_tasks = [
+        asyncio.create_task(run_overdue_scanner(async_session)),
+        asyncio.create_task(run_hold_expiry(async_session)),
+        asyncio.create_task(run_revocation_sync(async_session)),
+        asyncio.create_task(run_stats_refresher(async_engine)),
+        asyncio.create_task(run_soft_delete_purge(async_session)),
+        asyncio.create_task(run_idempotency_cleanup(idempotency_store)),
+        asyncio.create_task(run_bucket_cleanup(
+            login_bucket_store, LOGIN_BUCKET_IDLE_SECONDS
+        )),
+        asyncio.create_task(availability_hub.listen(async_engine)),
+    ]
     yield
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
     await async_engine.dispose()
+    if replica_engine is not async_engine:
+        await replica_engine.dispose()
 
 app = FastAPI(lifespan=database_life_cycle)
 origins = [
@@ -38,8 +124,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],        # разрешённые HTTP методы
     # allow_headers=["*"],
-    allow_headers=["Content-Type", "X-My-Fancy-Header"],
-    expose_headers=["Content-Type", "X-Custom-Header"],
+    allow_headers=["Content-Type", "X-My-Fancy-Header",
+                   "X-Consistency", "Idempotency-Key"],
+    expose_headers=["Content-Type", "X-Custom-Header",
+                    "Idempotent-Replayed"],
+)
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    session_factory=async_session,
+    enabled=replica_engine is not async_engine,
 )
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+app.add_middleware(LoginThrottleMiddleware, store=login_bucket_store)
+app.add_middleware(CompressionMiddleware)
 
+app.include_router(health_router)
 app.include_router(tasks_router)
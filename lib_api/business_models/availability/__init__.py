@@ -0,0 +1 @@
+"""Инициализация рассылки доступности книг."""
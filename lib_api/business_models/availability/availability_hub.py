@@ -0,0 +1,305 @@
+"""Рассылка изменений доступности книг подписчикам SSE."""
+
+import asyncio
+from os import getenv
+from typing import AsyncIterator, Iterable, Optional
+
+from asyncpg import InterfaceError, PostgresError
+from fastapi import status
+from sqlalchemy import ARRAY, Integer, any_, bindparam, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from lib_api.business_models.availability.notifications import \
+    AVAILABILITY_CHANNEL
+from lib_api.business_models.library_models.batch_loader import \
+    BATCH_MAX_IDS
+from lib_api.business_models.library_models.models_lib import Book
+from lib_api.factories.error_factory import handle_db_error
+from lib_api.logs import logger
+from lib_api.schemas.availability_serialization import AvailabilityEvent
+
+AVAILABILITY_QUEUE_SIZE = int(getenv("AVAILABILITY_QUEUE_SIZE") or 32)
+AVAILABILITY_HEARTBEAT_SECONDS = float(
+    getenv("AVAILABILITY_HEARTBEAT_SECONDS") or 15
+)
+AVAILABILITY_RECONNECT_SECONDS = 5
+AVAILABILITY_PING_SECONDS = float(getenv("AVAILABILITY_PING_SECONDS") or 30)
+
+AVAILABILITY_SNAPSHOT = select(
+    Book.id.label("book_id"), Book.copies_count
+).where(Book.id == any_(bindparam("ids", type_=ARRAY(Integer))))
+
+
+class Subscriber:
+    """
+    Подписка одного клиента на книги с ограниченной очередью.
+
+    None в очереди означает, что подписка закрыта.
+    """
+
+    def __init__(self, book_ids: Iterable[int], queue_size: int) -> None:
+        self.book_ids = frozenset(book_ids)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def close(self) -> None:
+        """Отбрасывает непрочитанные события и завершает поток."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class AvailabilityHub:
+    """
+    Рассылка событий доступности в процессе.
+
+    Одно соединение LISTEN на воркер раздаёт события
+    всем подписчикам; у каждого своя очередь queue_size.
+    Подписчик с переполненной очередью отключается,
+    чтобы медленный клиент не задерживал остальных.
+    """
+
+    def __init__(self, queue_size: int = AVAILABILITY_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[Subscriber]] = {}
+
+    def subscribe(self, book_ids: Iterable[int]) -> Subscriber:
+        """
+        Подписывает клиента на книги.
+
+        :return: Subscriber
+        """
+        subscriber = Subscriber(book_ids, self.queue_size)
+        for book_id in subscriber.book_ids:
+            self._subscribers.setdefault(book_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Снимает подписку клиента."""
+        for book_id in subscriber.book_ids:
+            subscribers = self._subscribers.get(book_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[book_id]
+
+    def subscriber_count(self) -> int:
+        """
+        Число активных подписчиков.
+
+        :return: int
+        """
+        return len({
+            sub for subs in self._subscribers.values() for sub in subs
+        })
+
+    def publish(self, event: AvailabilityEvent) -> None:
+        """Раздаёт событие подписчикам книги без ожидания."""
+        for subscriber in list(self._subscribers.get(event.book_id, ())):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Slow availability subscriber disconnected")
+                subscriber.dropped = True
+                self.unsubscribe(subscriber)
+                subscriber.close()
+
+    def on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        """Обработчик NOTIFY для asyncpg add_listener."""
+        try:
+            event = AvailabilityEvent.model_validate_json(payload)
+        except ValueError:
+            logger.error(f"Bad availability payload: {payload!r}")
+            return
+        self.publish(event)
+
+    async def resync(self, conn: AsyncConnection) -> None:
+        """
+        Раздаёт текущее число копий всех книг с подписчиками.
+
+        Уведомления, отправленные пока соединение LISTEN было
+        разорвано, потеряны; после переподключения подписчики
+        получают актуальное состояние.
+        :return: None
+        """
+        ids = list(self._subscribers)
+        if not ids:
+            return
+        result = await conn.execute(AVAILABILITY_SNAPSHOT, {"ids": ids})
+        for row in result:
+            self.publish(AvailabilityEvent.model_validate(row))
+
+    async def listen(
+            self,
+            engine: AsyncEngine,
+            ready: Optional[asyncio.Event] = None,
+            ping_seconds: float = AVAILABILITY_PING_SECONDS,
+            reconnect_seconds: float = AVAILABILITY_RECONNECT_SECONDS,
+    ) -> None:
+        """
+        Держит одно соединение LISTEN и раздаёт уведомления.
+
+        Обрыв соединения замечается по сигналу закрытия asyncpg
+        или по SELECT 1 раз в ping_seconds; тогда через
+        reconnect_seconds соединение открывается заново,
+        и подписчики получают текущее состояние.
+        :return: None
+        """
+        connected_before = False
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    closed = asyncio.get_running_loop().create_future()
+
+                    def on_close(_conn) -> None:
+                        if not closed.done():
+                            closed.set_result(None)
+
+                    driver.add_termination_listener(on_close)
+                    await driver.add_listener(
+                        AVAILABILITY_CHANNEL, self.on_notify
+                    )
+                    try:
+                        if connected_before:
+                            await self.resync(conn)
+                        await conn.rollback()
+                        connected_before = True
+                        if ready is not None:
+                            ready.set()
+                        await self._watch(conn, closed, ping_seconds)
+                    finally:
+                        if driver.is_closed():
+                            await conn.invalidate()
+                        else:
+                            driver.remove_termination_listener(on_close)
+                            await driver.remove_listener(
+                                AVAILABILITY_CHANNEL, self.on_notify
+                            )
+            except (
+                    OSError, SQLAlchemyError, InterfaceError, PostgresError
+            ) as err:
+                # Вызовы драйвера asyncpg бросают его собственные ошибки.
+                logger.error(f"Availability listener failed: {err!r}")
+                await asyncio.sleep(reconnect_seconds)
+
+    @staticmethod
+    async def _watch(
+            conn: AsyncConnection,
+            closed: asyncio.Future,
+            ping_seconds: float,
+    ) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(asyncio.shield(closed), ping_seconds)
+            except asyncio.TimeoutError:
+                await conn.execute(text("SELECT 1"))
+                await conn.rollback()
+                continue
+            raise ConnectionError("LISTEN connection closed")
+
+
+availability_hub = AvailabilityHub()
+
+
+def get_availability_hub() -> AvailabilityHub:
+    """
+    Зависимость FastAPI с рассылкой процесса.
+
+    :return: AvailabilityHub
+    """
+    return availability_hub
+
+
+async def get_availability_snapshot(
+        ids: list[int], db: AsyncSession
+) -> list[AvailabilityEvent]:
+    """
+    Текущее число копий книг для первого события потока.
+
+    Читается с основной базы: NOTIFY приходят с неё, и снимок
+    с отстающей реплики мог бы оказаться старше уже
+    полученных событий.
+    После чтения транзакция закрывается, и соединение
+    возвращается в пул до конца потока.
+    :return: list[AvailabilityEvent]
+    """
+    result = await db.execute(AVAILABILITY_SNAPSHOT, {"ids": ids})
+    snapshot = [AvailabilityEvent.model_validate(row) for row in result]
+    await db.rollback()
+    return snapshot
+
+
+def format_sse(event: AvailabilityEvent) -> str:
+    """
+    Событие в формате text/event-stream.
+
+    :return: str
+    """
+    return f"event: availability\ndata: {event.model_dump_json()}\n\n"
+
+
+async def availability_events(
+        hub: AvailabilityHub,
+        subscriber: Subscriber,
+        snapshot: Iterable[AvailabilityEvent],
+        heartbeat: float = AVAILABILITY_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Поток SSE: сначала текущее состояние, затем изменения.
+
+    Без событий раз в heartbeat секунд отправляется комментарий,
+    чтобы прокси не закрывали соединение.
+    Отключённый медленный клиент получает событие dropped.
+    :return: Асинхронный итератор строк SSE.
+    """
+    try:
+        for event in snapshot:
+            yield format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(), heartbeat
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                if subscriber.dropped:
+                    yield "event: dropped\ndata: {}\n\n"
+                return
+            yield format_sse(event)
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+async def open_availability_stream(
+        ids: list[int], db: AsyncSession, hub: AvailabilityHub
+) -> AsyncIterator[str]:
+    """
+    Подписывает клиента на книги и готовит поток SSE.
+
+    Подписка оформляется до чтения текущего состояния,
+    поэтому изменение между ними не теряется.
+    Больше BATCH_MAX_IDS книг за подписку — ошибка 400.
+    :return: Асинхронный итератор строк SSE.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if len(unique_ids) > BATCH_MAX_IDS:
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="TooManyIds",
+            message=f"At most {BATCH_MAX_IDS} ids per request",
+            st_code=status.HTTP_400_BAD_REQUEST,
+        )
+    subscriber = hub.subscribe(unique_ids)
+    try:
+        snapshot = await get_availability_snapshot(unique_ids, db)
+    except BaseException:
+        hub.unsubscribe(subscriber)
+        raise
+    return availability_events(hub, subscriber, snapshot)
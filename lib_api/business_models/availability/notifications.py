@@ -0,0 +1,31 @@
+"""Уведомления об изменении доступности книг через NOTIFY."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+AVAILABILITY_CHANNEL = "book_availability"
+
+# NOTIFY доставляется слушателям только после COMMIT,
+# откат транзакции уведомление отменяет.
+NOTIFY_AVAILABILITY = text(
+    f"""
+    SELECT pg_notify(
+        '{AVAILABILITY_CHANNEL}',
+        json_build_object('book_id', id, 'copies_count', copies_count)::text
+    )
+      FROM books
+     WHERE id = :book_id
+    """
+)
+
+
+async def notify_availability(db: AsyncSession, book_id: int) -> None:
+    """
+    Ставит уведомление о числе копий книги в текущей транзакции.
+
+    Число копий читается тем же запросом, поэтому учитывает
+    изменения транзакции, в том числе атомарный UPDATE.
+    Транзакцию не фиксирует.
+    :return: None
+    """
+    await db.execute(NOTIFY_AVAILABILITY, {"book_id": book_id})
@@ -0,0 +1 @@
+"""Инициализация объединения одинаковых одновременных запросов."""
@@ -0,0 +1,168 @@
+"""Объединение одинаковых одновременных чтений (single-flight)."""
+
+import asyncio
+from os import getenv
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.database import CONSISTENCY_HEADER, LSN_COOKIE
+from lib_api.logs import logger
+
+SINGLE_FLIGHT_TIMEOUT_SECONDS = float(
+    getenv("SINGLE_FLIGHT_TIMEOUT_SECONDS") or 5
+)
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """
+    Одно выполнение на ключ для одновременных одинаковых вызовов.
+
+    Первый вызов с ключом запускает produce в отдельной задаче,
+    остальные ждут её результата или исключения.
+    Ожидание ограничено timeout: дольше вызов выполняет
+    produce сам. Отмена запроса-лидера не отменяет задачу,
+    поэтому остальные получают результат.
+    Ведёт счётчики по группам ключей для оценки доли
+    объединённых вызовов.
+    """
+
+    def __init__(
+            self, timeout: float = SINGLE_FLIGHT_TIMEOUT_SECONDS
+    ) -> None:
+        self.timeout = timeout
+        self._flights: dict[tuple, asyncio.Task] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _count(self, group: str, counter: str) -> None:
+        stats = self._stats.setdefault(group, {
+            "calls": 0, "executions": 0, "coalesced": 0, "timeouts": 0,
+        })
+        stats[counter] += 1
+
+    def _forget(self, flight: tuple, task: asyncio.Task) -> None:
+        if self._flights.get(flight) is task:
+            del self._flights[flight]
+
+    async def do(
+            self,
+            group: str,
+            key: Hashable,
+            produce: Callable[[], Awaitable[Any]],
+            timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Выполняет produce или присоединяется к выполняющемуся.
+
+        :return: Результат produce.
+        """
+        self._count(group, "calls")
+        flight = (group, key)
+        task = self._flights.get(flight)
+        if task is not None:
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(task), timeout or self.timeout
+                )
+            except TimeoutError:
+                self._count(group, "timeouts")
+                logger.warning(
+                    f"Single-flight {group} {key} timed out, running alone"
+                )
+            else:
+                self._count(group, "coalesced")
+                return result
+        self._count(group, "executions")
+        if task is not None:
+            return await produce()
+        task = asyncio.ensure_future(produce())
+        self._flights[flight] = task
+        task.add_done_callback(_retrieve_exception)
+        task.add_done_callback(lambda done: self._forget(flight, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """
+        Число выполняющихся сейчас задач.
+
+        :return: int
+        """
+        return len(self._flights)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """
+        Счётчики по группам и доля объединённых вызовов.
+
+        :return: {группа: {calls, executions, coalesced, timeouts, ratio}}
+        """
+        return {
+            group: {
+                **stats,
+                "ratio": stats["coalesced"] / stats["calls"]
+                if stats["calls"] else 0.0,
+            }
+            for group, stats in self._stats.items()
+        }
+
+    def reset(self) -> None:
+        """Сбрасывает счётчики."""
+        self._stats.clear()
+
+
+single_flight = SingleFlight()
+
+
+def wants_fresh_read(request: Request) -> bool:
+    """
+    Требует ли клиент чтения не старше своей записи.
+
+    Заголовок X-Consistency: primary или cookie lib_lsn
+    после недавней записи: такой запрос не присоединяется
+    к выборке, начатой, возможно, до фиксации этой записи.
+    :return: bool
+    """
+    return (
+        request.headers.get(CONSISTENCY_HEADER, "").lower() == "primary"
+        or LSN_COOKIE in request.cookies
+    )
+
+
+async def shared_json(
+        group: str,
+        key: Hashable,
+        db: AsyncSession,
+        produce: Callable[[AsyncSession], Awaitable[BaseModel]],
+        fresh: bool = False,
+) -> Response:
+    """
+    Ответ JSON, общий для одинаковых одновременных запросов.
+
+    Ключ включает движок сессии, чтобы чтения с реплики
+    и с основной базы не смешивались. Общая задача открывает
+    на этом движке свою сессию: сессию запроса-лидера FastAPI
+    закрывает при его отключении, а остальные ещё ждут результат.
+    Сериализация выполняется один раз, все участники получают
+    те же байты. При fresh выборка выполняется отдельно
+    в сессии запроса (см. wants_fresh_read).
+    :return: Response с application/json.
+    """
+    if fresh:
+        body = (await produce(db)).model_dump_json().encode()
+        return Response(content=body, media_type="application/json")
+    engine = db.bind
+
+    async def render() -> bytes:
+        async with AsyncSession(
+                bind=engine, expire_on_commit=False
+        ) as session:
+            return (await produce(session)).model_dump_json().encode()
+
+    body = await single_flight.do(group, (engine, key), render)
+    return Response(content=body, media_type="application/json")
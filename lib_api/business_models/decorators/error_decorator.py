@@ -3,13 +3,12 @@
 from functools import wraps
 
 from fastapi import HTTPException, status
-from jose import JWTError
-from psycopg2 import IntegrityError as pgIntegrityError
 from sqlalchemy.exc import IntegrityError, InvalidRequestError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.exc import NoResultFound
 
 from lib_api.factories import error_factory
+from lib_api.factories.error_factory import TokenValidationError
 
 
 def handle_db_exceptions(func):
@@ -49,7 +48,7 @@ def handle_db_exceptions(func):
                 st_code=status.HTTP_404_NOT_FOUND,
             )
 
-        except (IntegrityError, pgIntegrityError) as ine:
+        except IntegrityError as ine:
             await error_factory.handle_db_error(
                 db=db,
                 error=ine,
@@ -58,7 +57,7 @@ def handle_db_exceptions(func):
                 st_code=status.HTTP_409_CONFLICT,
             )
 
-        except JWTError as jwt_err:
+        except TokenValidationError as jwt_err:
             await error_factory.handle_db_error(
                 db=db,
                 error=jwt_err,
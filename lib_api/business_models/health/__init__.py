@@ -0,0 +1 @@
+"""Инициализация проверок здоровья сервиса."""
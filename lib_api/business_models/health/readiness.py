@@ -0,0 +1,115 @@
+"""Дешёвая проверка готовности сервиса к приёму запросов."""
+
+import asyncio
+import time
+from os import getenv
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib_api.database import DB_MAX_OVERFLOW, async_engine
+from lib_api.logs import logger
+
+READINESS_CACHE_SECONDS = float(getenv("READINESS_CACHE_SECONDS") or 2)
+READINESS_TIMEOUT_SECONDS = float(getenv("READINESS_TIMEOUT_SECONDS") or 1)
+
+
+class ReadinessProbe:
+    """
+    Проверка готовности с кэшированием результата.
+
+    SELECT 1 выполняется не чаще одного раза за cache_seconds,
+    одновременные пробы ждут один и тот же запрос.
+    Если пул соединений исчерпан, запрос в базу не делается:
+    сервис считается неготовым, пока пул не освободится.
+    max_overflow должен совпадать с настройкой пула движка.
+    """
+
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            cache_seconds: float = READINESS_CACHE_SECONDS,
+            timeout: float = READINESS_TIMEOUT_SECONDS,
+            max_overflow: int = DB_MAX_OVERFLOW,
+    ) -> None:
+        self.engine = engine
+        self.max_overflow = max_overflow
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self._lock = asyncio.Lock()
+        self._checked_at: Optional[float] = None
+        self._database_ok = False
+
+    def pool_status(self) -> dict:
+        """
+        Состояние пула соединений без обращения к базе.
+
+        :return: Размер пула, занятые соединения, переполнение
+            и признак исчерпания.
+        """
+        pool = self.engine.pool
+        size = pool.size()
+        checked_out = pool.checkedout()
+        saturated = (
+            self.max_overflow >= 0 and
+            checked_out >= size + self.max_overflow
+        )
+        return {
+            "size": size,
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "saturated": saturated,
+        }
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None and
+            time.monotonic() - self._checked_at < self.cache_seconds
+        )
+
+    async def _select_one(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _ping(self) -> bool:
+        try:
+            await asyncio.wait_for(self._select_one(), self.timeout)
+        except (OSError, SQLAlchemyError, asyncio.TimeoutError) as err:
+            logger.warning(f"Readiness probe failed: {err}")
+            return False
+        return True
+
+    async def check(self) -> dict:
+        """
+        Возвращает состояние готовности.
+
+        При исчерпанном пуле сразу отвечает неготовностью,
+        иначе отдаёт кэшированный результат SELECT 1 или,
+        если он устарел, обновляет его одним запросом.
+        :return: Признак готовности, состояние базы и пула.
+        """
+        pool = self.pool_status()
+        if pool["saturated"]:
+            return {"ready": False, "database": self._database_ok,
+                    "pool": pool}
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    self._database_ok = await self._ping()
+                    self._checked_at = time.monotonic()
+        return {"ready": self._database_ok, "database": self._database_ok,
+                "pool": pool}
+
+
+readiness_probe = ReadinessProbe(async_engine)
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    """
+    Зависимость, предоставляющая проверку готовности.
+
+    :return: Общий экземпляр ReadinessProbe.
+    """
+    return readiness_probe
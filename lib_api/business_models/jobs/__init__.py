@@ -0,0 +1 @@
+"""Инициализация фоновых задач."""
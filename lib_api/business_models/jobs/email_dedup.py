@@ -0,0 +1,115 @@
+"""Слияние читателей и библиотекарей с email, различающимся регистром."""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_READER, OP_DELETE, change, record_changes)
+from lib_api.database import async_session
+from lib_api.logs import logger
+
+# Миграция f1b7d4e2c6a9 выполняет копию этих запросов: миграции
+# не импортируют код приложения, её копия заморожена на момент
+# создания индексов. Изменения здесь в миграцию не переносятся.
+LOCK_TABLES = (
+    "LOCK TABLE readers, librarian, holds, readers_books"
+    " IN SHARE ROW EXCLUSIVE MODE"
+)
+READER_MERGE = """
+CREATE TEMP TABLE reader_email_merge ON COMMIT DROP AS
+SELECT id, min(id) OVER (PARTITION BY lower(email)) AS keeper
+  FROM readers
+ WHERE deleted_at IS NULL
+"""
+DROP_CONFLICTING_HOLDS = """
+DELETE FROM holds h
+ USING (
+       SELECT h.id,
+              row_number() OVER (
+                  PARTITION BY m.keeper, h.book_id
+                  ORDER BY h.status = 'ready' DESC, h.created_at, h.id
+              ) AS rn
+         FROM holds h
+         JOIN reader_email_merge m ON m.id = h.reader_id
+        WHERE h.status IN ('waiting', 'ready')
+       ) ranked
+ WHERE h.id = ranked.id AND ranked.rn > 1
+"""
+MOVE_TO_KEEPER = """
+UPDATE {table} t SET reader_id = m.keeper
+  FROM reader_email_merge m
+ WHERE t.reader_id = m.id AND m.id <> m.keeper
+"""
+SOFT_DELETE_MERGED = """
+UPDATE readers r SET deleted_at = now()
+  FROM reader_email_merge m
+ WHERE r.id = m.id AND m.id <> m.keeper
+RETURNING r.id
+"""
+DELETE_DUPLICATE_LIBRARIANS = """
+DELETE FROM librarian l
+ USING (
+       SELECT id, min(id) OVER (PARTITION BY lower(email)) AS keeper
+         FROM librarian
+       ) d
+ WHERE l.id = d.id AND d.id <> d.keeper
+"""
+NORMALIZE = """
+UPDATE {table} SET email = lower(email)
+ WHERE email <> lower(email)
+"""
+
+
+async def dedup_emails(db: AsyncSession) -> dict[str, int]:
+    """
+    Сливает записи, чей email совпадает без учёта регистра.
+
+    Из живых читателей группы остаётся первый по id: к нему
+    переходят выдачи и резервы остальных (из двух активных
+    резервов одной книги остаётся ready или старший), а сами
+    остальные мягко удаляются с событием журнала изменений.
+    Из библиотекарей остаётся первый по id, прочие удаляются
+    вместе с токенами. Затем все email приводятся к нижнему
+    регистру. Читатели, библиотекари, резервы и выдачи
+    блокируются от записи до commit, поэтому запускать
+    в окно обслуживания — перед миграцией
+    с уникальными индексами lower(email) или после неё.
+    :return: dict: Число слитых читателей, удалённых
+        библиотекарей и нормализованных email.
+    """
+    await db.execute(text(LOCK_TABLES))
+    await db.execute(text(READER_MERGE))
+    await db.execute(text(DROP_CONFLICTING_HOLDS))
+    for table in ("holds", "readers_books"):
+        await db.execute(text(MOVE_TO_KEEPER.format(table=table)))
+    merged = (await db.execute(text(SOFT_DELETE_MERGED))).scalars().all()
+    if merged:
+        await record_changes(db, *(
+            change(ENTITY_READER, reader_id, OP_DELETE)
+            for reader_id in merged
+        ))
+    librarians = await db.execute(text(DELETE_DUPLICATE_LIBRARIANS))
+    normalized = 0
+    for table in ("readers", "librarian"):
+        result = await db.execute(text(NORMALIZE.format(table=table)))
+        normalized += result.rowcount
+    await db.commit()
+    counts = {
+        "readers_merged": len(merged),
+        "librarians_removed": librarians.rowcount,
+        "emails_normalized": normalized,
+    }
+    logger.info(f"Email dedup finished: {counts}")
+    return counts
+
+
+async def main() -> None:
+    """Запускает слияние на основной базе."""
+    async with async_session() as db:
+        await dedup_emails(db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
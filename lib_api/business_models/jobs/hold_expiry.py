@@ -0,0 +1,87 @@
+"""Истечение невостребованных готовых резервов."""
+
+import asyncio
+from datetime import timedelta
+from os import getenv
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from lib_api.business_models.availability.notifications import \
+    notify_availability
+from lib_api.business_models.library_models.hold_service.allocate_hold import \
+    allocate_returned_copy
+from lib_api.business_models.library_models.models_lib import (HOLD_EXPIRED,
+                                                               HOLD_READY,
+                                                               Hold)
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_BOOK, OP_UPDATE, change, record_changes)
+from lib_api.logs import logger
+
+HOLD_READY_DAYS = float(getenv("HOLD_READY_DAYS") or 3)
+HOLD_EXPIRY_BATCH = int(getenv("HOLD_EXPIRY_BATCH") or 100)
+HOLD_EXPIRY_INTERVAL_SECONDS = int(
+    getenv("HOLD_EXPIRY_INTERVAL_SECONDS") or 300
+)
+
+
+async def expire_ready_holds(
+        db: AsyncSession,
+        ready_days: float = HOLD_READY_DAYS,
+        batch_size: int = HOLD_EXPIRY_BATCH,
+) -> list[int]:
+    """
+    Снимает готовые резервы, не выданные за ready_days дней.
+
+    Резервы выбираются по частичному индексу ix_holds_ready_at
+    под FOR UPDATE SKIP LOCKED и переводятся в expired;
+    закреплённая копия уходит следующему ожидающему резерву
+    или возвращается в фонд.
+    :return: list[int]: ID истёкших резервов.
+    """
+    result = await db.execute(
+        select(Hold)
+        .where(
+            Hold.status == HOLD_READY,
+            Hold.ready_at <= func.now() - timedelta(days=ready_days),
+        )
+        .order_by(Hold.ready_at, Hold.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    holds = list(result.scalars().all())
+    if not holds:
+        return []
+    for hold in holds:
+        hold.status = HOLD_EXPIRED
+        db.add(hold)
+        if await allocate_returned_copy(book_id=hold.book_id, db=db) is None:
+            await notify_availability(db, hold.book_id)
+    await record_changes(db, *(
+        change(ENTITY_BOOK, book_id, OP_UPDATE)
+        for book_id in sorted({hold.book_id for hold in holds})
+    ))
+    await db.commit()
+    expired = [hold.id for hold in holds]
+    logger.info(f"Expired ready holds: {expired}")
+    return expired
+
+
+async def run_hold_expiry(
+        session_factory: async_sessionmaker,
+        interval: float = HOLD_EXPIRY_INTERVAL_SECONDS,
+) -> None:
+    """
+    Периодически запускает expire_ready_holds до отмены задачи.
+
+    Ошибки базы логируются, следующий проход выполняется по расписанию.
+    :return: None
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                await expire_ready_holds(db)
+        except (OSError, SQLAlchemyError) as err:
+            logger.error(f"Hold expiry failed: {err}")
+        await asyncio.sleep(interval)
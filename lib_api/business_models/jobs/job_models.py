@@ -0,0 +1,34 @@
+"""Модели состояния фоновых задач."""
+
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from lib_api.business_models.base_model.base_model import Base
+
+
+class JobWatermark(Base):
+    """
+    Отметка, до которой фоновая задача обработала данные.
+
+    Attributes:
+        name (str): Имя задачи, первичный ключ.
+        watermark (datetime): Верхняя граница последнего прохода.
+    """
+
+    __tablename__ = "job_watermarks"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+
+    def __repr__(self):
+        """
+        Возвращает строковое представление отметки.
+
+        :return: Строка в формате <JobWatermark(name=NAME, watermark=TS)>
+        """
+        return (f"<JobWatermark(name={self.name},"
+                f" watermark={self.watermark})>")
@@ -0,0 +1,101 @@
+"""Инкрементальный поиск просроченных выдач."""
+
+import asyncio
+from datetime import datetime, timezone
+from os import getenv
+
+from sqlalchemy import and_, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from lib_api.business_models.jobs.job_models import JobWatermark
+from lib_api.business_models.library_models.models_lib import ReaderBook
+from lib_api.logs import logger
+
+JOB_NAME = "overdue_loans"
+SCAN_BATCH_SIZE = 500
+OVERDUE_SCAN_INTERVAL_SECONDS = int(
+    getenv("OVERDUE_SCAN_INTERVAL_SECONDS") or 300
+)
+
+
+async def scan_newly_overdue(db: AsyncSession) -> list[int]:
+    """
+    Находит выдачи, просроченные с момента прошлого прохода.
+
+    Берёт отметку задачи под FOR UPDATE SKIP LOCKED:
+    если её держит другой воркер, проход пропускается.
+    Читает только открытые выдачи с due_date в (отметка, now()]
+    по частичному индексу ix_readers_books_open_due,
+    закрытые выдачи не просматриваются.
+    Сдвигает отметку в той же транзакции.
+    :return:
+        list[int]: ID выдач, ставших просроченными.
+    """
+    await db.execute(
+        insert(JobWatermark)
+        .values(name=JOB_NAME, watermark=func.now())
+        .on_conflict_do_nothing(index_elements=[JobWatermark.name])
+    )
+    result = await db.execute(
+        select(JobWatermark)
+        .where(JobWatermark.name == JOB_NAME)
+        .with_for_update(skip_locked=True)
+    )
+    mark = result.scalars().first()
+    if mark is None:
+        await db.rollback()
+        return []
+
+    upper = (await db.execute(select(func.now()))).scalar_one()
+    overdue_ids: list[int] = []
+    last_key = None
+    while True:
+        stmt = (
+            select(ReaderBook.due_date, ReaderBook.id)
+            .where(and_(
+                ReaderBook.return_date.is_(None),
+                ReaderBook.due_date > mark.watermark,
+                ReaderBook.due_date <= upper,
+            ))
+            .order_by(ReaderBook.due_date, ReaderBook.id)
+            .limit(SCAN_BATCH_SIZE)
+        )
+        if last_key is not None:
+            stmt = stmt.where(
+                tuple_(ReaderBook.due_date, ReaderBook.id) > tuple_(*last_key)
+            )
+        rows = (await db.execute(stmt)).all()
+        overdue_ids.extend(row.id for row in rows)
+        if len(rows) < SCAN_BATCH_SIZE:
+            break
+        last_key = (rows[-1].due_date, rows[-1].id)
+
+    mark.watermark = upper
+    await db.commit()
+    if overdue_ids:
+        logger.warning(
+            f"Newly overdue loans: {len(overdue_ids)}, ids {overdue_ids}"
+        )
+    return overdue_ids
+
+
+async def run_overdue_scanner(
+        session_factory: async_sessionmaker,
+        interval: float = OVERDUE_SCAN_INTERVAL_SECONDS,
+) -> None:
+    """
+    Периодически запускает scan_newly_overdue до отмены задачи.
+
+    Ошибки базы логируются, следующий проход выполняется по расписанию.
+    :return: None
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                await scan_newly_overdue(db)
+        except (OSError, SQLAlchemyError) as err:
+            logger.error(f"Overdue scan failed at"
+                         f" {datetime.now(timezone.utc)}: {err}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,102 @@
+"""Фоновая очистка мягко удалённых книг и читателей."""
+
+import asyncio
+from datetime import timedelta
+from os import getenv
+from typing import Type
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from lib_api.business_models.base_model.base_model import BaseModel
+from lib_api.business_models.library_models.models_lib import \
+    SOFT_DELETE_MODELS
+from lib_api.logs import logger
+
+SOFT_DELETE_PURGE_BATCH = int(getenv("SOFT_DELETE_PURGE_BATCH") or 100)
+SOFT_DELETE_PURGE_INTERVAL_SECONDS = int(
+    getenv("SOFT_DELETE_PURGE_INTERVAL_SECONDS") or 300
+)
+SOFT_DELETE_RETENTION_SECONDS = int(
+    getenv("SOFT_DELETE_RETENTION_SECONDS") or 0
+)
+
+
+async def purge_batch(
+        db: AsyncSession,
+        model: Type[BaseModel],
+        batch_size: int = SOFT_DELETE_PURGE_BATCH,
+        retention: int = SOFT_DELETE_RETENTION_SECONDS,
+) -> int:
+    """
+    Окончательно удаляет одну пачку мягко удалённых строк модели.
+
+    Строки выбираются по частичному индексу deleted_at
+    под FOR UPDATE SKIP LOCKED, поэтому несколько воркеров
+    не удаляют одно и то же. Выдачи и резервы удаляет
+    ON DELETE CASCADE базы, ORM их не загружает.
+    :return: int — число удалённых строк.
+    """
+    doomed = (
+        select(model.id)
+        .where(
+            model.deleted_at.is_not(None),
+            model.deleted_at <= func.now() - timedelta(seconds=retention),
+        )
+        .order_by(model.deleted_at, model.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        delete(model)
+        .where(model.id.in_(doomed.scalar_subquery()))
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    purged = len(result.all())
+    await db.commit()
+    return purged
+
+
+async def purge_soft_deleted(
+        db: AsyncSession,
+        batch_size: int = SOFT_DELETE_PURGE_BATCH,
+        retention: int = SOFT_DELETE_RETENTION_SECONDS,
+) -> int:
+    """
+    Очищает мягко удалённые книги и читателей пачками.
+
+    Каждая пачка — отдельная короткая транзакция,
+    блокировки не копятся на время всей очистки.
+    :return: int — общее число удалённых строк.
+    """
+    total = 0
+    for model in SOFT_DELETE_MODELS:
+        while True:
+            purged = await purge_batch(db, model, batch_size, retention)
+            total += purged
+            if purged < batch_size:
+                break
+    if total:
+        logger.info(f"Purged soft-deleted rows: {total}")
+    return total
+
+
+async def run_soft_delete_purge(
+        session_factory: async_sessionmaker,
+        interval: float = SOFT_DELETE_PURGE_INTERVAL_SECONDS,
+) -> None:
+    """
+    Периодически запускает purge_soft_deleted до отмены задачи.
+
+    Ошибки базы логируются, следующий проход выполняется по расписанию.
+    :return: None
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                await purge_soft_deleted(db)
+        except (OSError, SQLAlchemyError) as err:
+            logger.error(f"Soft delete purge failed: {err}")
+        await asyncio.sleep(interval)
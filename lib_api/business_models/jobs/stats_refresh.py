@@ -0,0 +1,32 @@
+"""Периодическое обновление представлений статистики."""
+
+import asyncio
+from os import getenv
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib_api.business_models.stats.stats_views import refresh_stats_views
+from lib_api.logs import logger
+
+STATS_REFRESH_SECONDS = int(getenv("STATS_REFRESH_SECONDS") or 60)
+
+
+async def run_stats_refresher(
+        engine: AsyncEngine,
+        interval: float = STATS_REFRESH_SECONDS,
+) -> None:
+    """
+    Обновляет представления статистики каждые interval секунд.
+
+    Ошибки базы логируются, следующий проход выполняется по расписанию.
+    :return: None
+    """
+    while True:
+        try:
+            async with engine.begin() as conn:
+                if await refresh_stats_views(conn):
+                    logger.debug("Stats views refreshed")
+        except (OSError, SQLAlchemyError) as err:
+            logger.error(f"Stats views refresh failed: {err}")
+        await asyncio.sleep(interval)
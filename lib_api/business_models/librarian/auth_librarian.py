@@ -1,7 +1,6 @@
 """Модуль аутентификации читателя."""
 
 from fastapi import status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lib_api.business_models.decorators.error_decorator import \
@@ -26,10 +25,9 @@ async def get_librarian_by_auth(
         ValueError: При отсутствии библиотекаря с таким email.
         При неверном пароле.
     """
-    result = await db.execute(
-        select(Librarian).where(Librarian.email == user_auth.email)
+    librarian = await Librarian.get_librarian_by_email(
+        db=db, email=user_auth.email
     )
-    librarian = result.scalars().first()
     if not librarian:
         logger.error("Librarian with souch email or password not found")
         await handle_db_error(
@@ -1,41 +1,50 @@
 """Модуль аутентификации и получения текущего библиотекаря."""
 
-from fastapi import Depends
+from datetime import datetime, timezone
+
+from fastapi import Depends, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from lib_api.business_models.decorators.error_decorator import \
-    handle_db_exceptions
-from lib_api.business_models.librarian.librarian_model import Librarian
-from lib_api.business_models.librarian.security import ALGORITHM, SECRET_KEY
-from lib_api.database import get_session_db
+from lib_api.business_models.librarian.revocation import revocation_list
+from lib_api.business_models.librarian.security import decode_access_token
+from lib_api.factories.error_factory import (TokenValidationError,
+                                             raise_http_error)
+from lib_api.schemas.librarian_serialization import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/librarian/oauth2-login")
 
 
-@handle_db_exceptions
 async def get_current_librarian(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_session_db)
-) -> Librarian:
+) -> TokenPayload:
     """
     Получает текущего авторизованного библиотекаря из JWT токена.
 
-    Декодирует JWT токен, извлекает email библиотекаря.
-    Загружает его из базы данных.
+    Проверяет подпись и срок действия токена, затем ищет его jti
+    в списке отозванных в памяти процесса. В базу не обращается:
+    токены доступа короткоживущие, а удалённый библиотекарь
+    не сможет обменять refresh-токен на новый.
     :return:
-        Librarian: Объект текущего авторизованного библиотекаря.
+        TokenPayload: email, jti и срок действия токена.
     Raises:
-        JWTError: Если токен недействителен или истек.
-        ValueError: Если библиотекарь с указанным email не найден.
+        HTTPException: 401, если токен недействителен, истек или отозван.
     """
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    email: str = payload.get("sub")
-    result = await db.execute(
-        select(Librarian).where(Librarian.email == email)
+    try:
+        payload = decode_access_token(token)
+        jti = payload.get("jti")
+        if not jti or not payload.get("sub"):
+            raise TokenValidationError("Token has no subject or jti")
+        if jti in revocation_list:
+            raise TokenValidationError("Token has been revoked")
+    except TokenValidationError as jwt_err:
+        raise_http_error(
+            error=jwt_err,
+            er_type="JWTError",
+            message="Could not validate credentials",
+            st_code=status.HTTP_401_UNAUTHORIZED,
+        )
+    return TokenPayload(
+        email=payload["sub"],
+        jti=jti,
+        exp=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
     )
-    librarian = result.scalars().first()
-
-    return librarian
@@ -2,7 +2,7 @@
 from typing import Optional
 
 from fastapi import status
-from sqlalchemy import String, select
+from sqlalchemy import Index, String, bindparam, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,7 @@ from lib_api.business_models.base_model.base_model import BaseModel
 from lib_api.business_models.decorators.error_decorator import \
     handle_db_exceptions
 from lib_api.business_models.librarian.security import get_password_hash
+from lib_api.business_models.library_models.lookups import lookup_first
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 from lib_api.schemas.librarian_serialization import LibrarianCreate
@@ -21,18 +22,20 @@ class Librarian(BaseModel):
 
     Attributes:
         name: Полное имя библиотекаря (максимум 100 символов).
-        email: Уникальный email-адрес для входа в систему.
+        email: Email для входа; уникален без учёта регистра.
         password: Хэшированный пароль для аутентификации.
     """
 
     __tablename__ = "librarian"
 
     name: Mapped[str] = mapped_column(String(100), nullable=False)
-    email: Mapped[str] = mapped_column(
-        String(255), unique=True, nullable=False
-    )
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
 
+    __table_args__ = (
+        Index("uq_librarian_email_lower", text("lower(email)"), unique=True),
+    )
+
     def __repr__(self):
         """
         Возвращает строковое представление объекта библиотекаря.
@@ -46,7 +49,7 @@ class Librarian(BaseModel):
             cls, db: AsyncSession, email: str
     ) -> Optional["Librarian"]:
         """
-        Поиск библиотекаря по email.
+        Поиск библиотекаря по email без учёта регистра.
 
         Args:
             db (AsyncSession): Асинхронная сессия БД
@@ -55,10 +58,7 @@ class Librarian(BaseModel):
         Returns:
             Librarian | None: Объект библиотекаря или None
         """
-        result = await db.execute(
-            select(cls).where(cls.email == email)
-        )
-        return result.scalars().first()
+        return await lookup_first(db, LIBRARIAN_BY_EMAIL, email=email)
 
     @classmethod
     @handle_db_exceptions
@@ -102,3 +102,10 @@ class Librarian(BaseModel):
         await db.refresh(db_librarian)
         logger.info(f"Librarian {db_librarian.id} created successfully")
         return db_librarian
+
+
+# Библиотекари не удаляются мягко: include_deleted избавляет запрос
+# от опций exclude_soft_deleted и сохраняет запомненный ключ кэша.
+LIBRARIAN_BY_EMAIL = select(Librarian).where(
+    func.lower(Librarian.email) == func.lower(bindparam("email"))
+).execution_options(include_deleted=True)
@@ -0,0 +1,182 @@
+"""Выдача, ротация и отзыв пар токенов доступа и обновления."""
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import status
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.decorators.error_decorator import \
+    handle_db_exceptions
+from lib_api.business_models.librarian.librarian_model import Librarian
+from lib_api.business_models.librarian.revocation import revocation_list
+from lib_api.business_models.librarian.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS)
+from lib_api.business_models.librarian.token_models import (RefreshToken,
+                                                            RevokedToken)
+from lib_api.business_models.librarian.util import get_access_token_for_user
+from lib_api.factories.error_factory import handle_db_error
+from lib_api.logs import logger
+from lib_api.schemas.librarian_serialization import Token, TokenPayload
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """
+    Хэширует refresh-токен для хранения и поиска.
+
+    Токен случайный и длинный, поэтому достаточно SHA-256.
+    :return: Хэш в шестнадцатеричном виде.
+    """
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+async def issue_token_pair(
+        librarian: Librarian,
+        db: AsyncSession,
+        family_id: Optional[str] = None,
+) -> Token:
+    """
+    Выдаёт короткоживущий токен доступа и refresh-токен.
+
+    В базе сохраняется только хэш refresh-токена и jti
+    токена доступа, выданного вместе с ним.
+    :return:
+        Token: Пара токенов.
+    """
+    now = datetime.now(timezone.utc)
+    jti = uuid4().hex
+    refresh_token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        librarian_id=librarian.id,
+        token_hash=hash_refresh_token(refresh_token),
+        family_id=family_id or uuid4().hex,
+        access_jti=jti,
+        access_expires_at=now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    await db.commit()
+    access_token = await get_access_token_for_user(
+        librarian=librarian, jti=jti
+    )
+    return Token(access_token=access_token, refresh_token=refresh_token)
+
+
+async def revoke_family(family_id: str, db: AsyncSession) -> None:
+    """
+    Отзывает все refresh-токены цепочки и их токены доступа.
+
+    jti токенов доступа, которые ещё действуют, записываются
+    в revoked_tokens и сразу в список этого процесса.
+    :return: None
+    """
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id,
+               RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    rows = (await db.execute(
+        select(RefreshToken.access_jti, RefreshToken.access_expires_at)
+        .where(RefreshToken.family_id == family_id,
+               RefreshToken.access_expires_at > now)
+    )).all()
+    await revoke_access_tokens(rows, db)
+
+
+async def revoke_access_tokens(
+        tokens: list[tuple[str, datetime]], db: AsyncSession
+) -> None:
+    """
+    Заносит токены доступа (jti, срок) в denylist.
+
+    :return: None
+    """
+    if not tokens:
+        return
+    await db.execute(
+        insert(RevokedToken)
+        .values([{"jti": jti, "expires_at": exp} for jti, exp in tokens])
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    for jti, exp in tokens:
+        revocation_list.add(jti, exp)
+
+
+@handle_db_exceptions
+async def rotate_refresh_token(refresh_token: str, db: AsyncSession) -> Token:
+    """
+    Обменивает refresh-токен на новую пару токенов.
+
+    Предъявленный токен помечается использованным.
+    Повторное предъявление использованного токена считается
+    кражей: вся цепочка и её токены доступа отзываются.
+    :return:
+        Token: Новая пара токенов.
+    """
+    result = await db.execute(
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == hash_refresh_token(refresh_token))
+        .with_for_update()
+    )
+    stored = result.scalars().first()
+    now = datetime.now(timezone.utc)
+    if stored is None or stored.expires_at <= now:
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="ValueError",
+            message="Invalid refresh token",
+            st_code=status.HTTP_401_UNAUTHORIZED,
+        )
+    if stored.revoked_at is not None:
+        logger.warning(
+            f"Refresh token reuse detected, family {stored.family_id}"
+        )
+        await revoke_family(stored.family_id, db)
+        await db.commit()
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="ValueError",
+            message="Invalid refresh token",
+            st_code=status.HTTP_401_UNAUTHORIZED,
+        )
+    librarian = await db.get(Librarian, stored.librarian_id)
+    stored.revoked_at = now
+    return await issue_token_pair(
+        librarian=librarian, db=db, family_id=stored.family_id
+    )
+
+
+@handle_db_exceptions
+async def logout_librarian(
+        current: TokenPayload,
+        refresh_token: Optional[str],
+        db: AsyncSession,
+) -> None:
+    """
+    Отзывает текущий токен доступа и, если передан, refresh-токен.
+
+    Отзыв refresh-токена отзывает всю его цепочку.
+    :return: None
+    """
+    await revoke_access_tokens([(current.jti, current.exp)], db)
+    if refresh_token:
+        family_id = await db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == hash_refresh_token(refresh_token),
+                RefreshToken.librarian_id == select(Librarian.id).where(
+                    func.lower(Librarian.email) == func.lower(current.email)
+                ).scalar_subquery(),
+            )
+        )
+        if family_id is not None:
+            await revoke_family(family_id, db)
+    await db.commit()
+    logger.info(f"Librarian {current.email} logged out")
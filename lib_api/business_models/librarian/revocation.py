@@ -0,0 +1,120 @@
+"""Список отозванных токенов доступа в памяти процесса."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from os import getenv
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from lib_api.business_models.librarian.token_models import (RefreshToken,
+                                                            RevokedToken)
+from lib_api.logs import logger
+
+REVOCATION_SYNC_SECONDS = int(getenv("REVOCATION_SYNC_SECONDS") or 5)
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationList:
+    """
+    Множество отозванных jti со сроками действия.
+
+    Проверка при каждом запросе — поиск в словаре, без обращения
+    к базе. Новые отзывы подтягиваются из revoked_tokens
+    инкрементально по revoked_at с небольшим перекрытием,
+    чтобы не пропустить транзакции, зафиксированные позже
+    своей отметки времени. Истёкшие jti удаляются при синхронизации.
+    """
+
+    def __init__(self) -> None:
+        self._expires: dict[str, float] = {}
+        self.synced_until: Optional[datetime] = None
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._expires
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """Добавляет jti, отозванный в этом процессе."""
+        self._expires[jti] = expires_at.timestamp()
+
+    def prune(self) -> None:
+        """Удаляет jti токенов, срок которых уже истёк."""
+        now = time.time()
+        self._expires = {
+            jti: exp for jti, exp in self._expires.items() if exp > now
+        }
+
+    async def sync(self, db: AsyncSession) -> int:
+        """
+        Загружает отзывы, появившиеся после прошлой синхронизации.
+
+        :return: Число полученных записей.
+        """
+        stmt = select(
+            RevokedToken.jti, RevokedToken.expires_at,
+            RevokedToken.revoked_at,
+        ).where(RevokedToken.expires_at > func.now())
+        if self.synced_until is not None:
+            stmt = stmt.where(
+                RevokedToken.revoked_at > self.synced_until - SYNC_OVERLAP
+            )
+        rows = (await db.execute(stmt)).all()
+        for jti, expires_at, revoked_at in rows:
+            self.add(jti, expires_at)
+            if self.synced_until is None or revoked_at > self.synced_until:
+                self.synced_until = revoked_at
+        self.prune()
+        return len(rows)
+
+    def clear(self) -> None:
+        """Очищает список и отметку синхронизации."""
+        self._expires.clear()
+        self.synced_until = None
+
+
+revocation_list = RevocationList()
+
+
+async def purge_expired_revocations(db: AsyncSession) -> None:
+    """
+    Удаляет записи истёкших токенов из revoked_tokens и refresh_tokens.
+
+    Истёкший refresh-токен не принимается при обмене, поэтому
+    его строка, в том числе уже использованная при ротации,
+    больше не нужна.
+    :return: None
+    """
+    await db.execute(
+        delete(RevokedToken).where(RevokedToken.expires_at < func.now())
+    )
+    await db.execute(
+        delete(RefreshToken).where(RefreshToken.expires_at < func.now())
+    )
+    await db.commit()
+
+
+async def run_revocation_sync(
+        session_factory: async_sessionmaker,
+        interval: int = REVOCATION_SYNC_SECONDS,
+) -> None:
+    """
+    Периодически синхронизирует revocation_list с базой.
+
+    Отзыв, сделанный другим воркером, начинает действовать
+    здесь не позже чем через interval секунд.
+    Ошибки прохода логируются, цикл продолжается.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                await revocation_list.sync(session)
+                await purge_expired_revocations(session)
+        except (OSError, SQLAlchemyError) as err:
+            logger.error(f"Revocation list sync failed: {err}")
+        await asyncio.sleep(interval)
@@ -1,19 +1,32 @@
 """Хеширования пароля и создание JWT токена доступа."""
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from os import getenv
 from typing import Optional
 
-from jose import jwt
-from passlib.context import CryptContext
+from lib_api.business_models.librarian.token_verifier import \
+    get_token_verifier
 
-SECRET_KEY = getenv("SECRET_KEY")
-ALGORITHM = getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(getenv(
     "ACCESS_TOKEN_EXPIRE_MINUTES")
 )
+REFRESH_TOKEN_EXPIRE_DAYS = int(getenv("REFRESH_TOKEN_EXPIRE_DAYS") or 14)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """
+    Создаёт контекст хеширования паролей при первом обращении.
+
+    passlib при создании контекста проверяет бэкенды bcrypt,
+    поэтому импорт отложен до первой проверки или хеширования пароля.
+    :return:
+        CryptContext: Контекст bcrypt.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(
@@ -29,7 +42,7 @@ def verify_password(
     :return:
         bool: True, если пароль совпадает с хэшем, иначе False.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -41,7 +54,7 @@ def get_password_hash(password: str) -> str:
     :return:
         str: Хэшированный пароль.
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(
@@ -60,8 +73,21 @@ def create_access_token(
     """
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.now() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now() + timedelta(minutes=15)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return get_token_verifier().encode(to_encode)
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Проверяет подпись и срок действия JWT токена.
+
+    Args:
+        token (str): JWT токен из заголовка Authorization.
+    :raise TokenValidationError: Если токен недействителен или истек.
+    :return:
+        dict: Полезная нагрузка токена.
+    """
+    return get_token_verifier().decode(token)
@@ -0,0 +1,99 @@
+"""Модели refresh-токенов и отозванных токенов доступа."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP, ForeignKey, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from lib_api.business_models.base_model.base_model import Base, BaseModel
+
+
+class RefreshToken(BaseModel):
+    """
+    Выданный refresh-токен, хранится только SHA-256 хэш.
+
+    Токены одной цепочки ротации имеют общий family_id:
+    повторное предъявление уже использованного токена
+    отзывает всю цепочку.
+
+    Attributes:
+        librarian_id (int): Владелец токена.
+        token_hash (str): SHA-256 от значения токена.
+        family_id (str): Идентификатор цепочки ротации.
+        access_jti (str): jti токена доступа, выданного в паре.
+        access_expires_at (datetime): Срок действия этого токена доступа.
+        expires_at (datetime): Срок действия refresh-токена.
+        revoked_at (datetime | None): Когда токен использован или отозван.
+    """
+
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        Index("ix_refresh_tokens_librarian_id", "librarian_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
+
+    librarian_id: Mapped[int] = mapped_column(
+        ForeignKey("librarian.id", ondelete="CASCADE"), nullable=False
+    )
+    token_hash: Mapped[str] = mapped_column(
+        String(64), unique=True, nullable=False
+    )
+    family_id: Mapped[str] = mapped_column(String(32), nullable=False)
+    access_jti: Mapped[str] = mapped_column(String(32), nullable=False)
+    access_expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+
+    def __repr__(self):
+        """
+        Возвращает строковое представление refresh-токена.
+
+        :return: Строка в формате <RefreshToken(id=ID, family=FAMILY)>
+        """
+        return (f"<RefreshToken(id={self.id},"
+                f" family={self.family_id})>")
+
+
+class RevokedToken(Base):
+    """
+    Отозванный токен доступа (denylist по jti).
+
+    Запись нужна только до истечения самого токена,
+    потом её можно удалить.
+
+    Attributes:
+        jti (str): Идентификатор токена доступа.
+        expires_at (datetime): Срок действия отозванного токена.
+        revoked_at (datetime): Время отзыва, по нему идёт синхронизация.
+    """
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("ix_revoked_tokens_revoked_at", "revoked_at"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False,
+        server_default=func.clock_timestamp()
+    )
+
+    def __repr__(self):
+        """
+        Возвращает строковое представление отозванного токена.
+
+        :return: Строка в формате <RevokedToken(jti=JTI)>
+        """
+        return f"<RevokedToken(jti={self.jti})>"
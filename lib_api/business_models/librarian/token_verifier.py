@@ -0,0 +1,211 @@
+"""Подключаемые реализации подписи и проверки JWT токенов."""
+
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from os import getenv
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Protocol
+
+from lib_api.factories.error_factory import TokenValidationError
+
+SECRET_KEY = getenv("SECRET_KEY")
+ALGORITHM = getenv("ALGORITHM")
+JWT_BACKEND = getenv("JWT_BACKEND") or "jose"
+JWT_PRIVATE_KEY_FILE = getenv("JWT_PRIVATE_KEY_FILE")
+JWT_PUBLIC_KEY_FILE = getenv("JWT_PUBLIC_KEY_FILE")
+TOKEN_CACHE_SIZE = int(getenv("TOKEN_CACHE_SIZE") or 1024)
+
+
+class TokenVerifier(Protocol):
+    """Интерфейс подписи и проверки токенов доступа."""
+
+    def encode(self, claims: dict) -> str:
+        """Подписывает claims и возвращает токен."""
+
+    def decode(self, token: str) -> dict:
+        """
+        Проверяет подпись и срок действия токена.
+
+        :raise TokenValidationError: Если токен недействителен или истёк.
+        :return: claims токена.
+        """
+
+
+class JoseTokenVerifier:
+    """Реализация на python-jose, только симметричные ключи."""
+
+    def __init__(self, key: str, algorithm: str) -> None:
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+        self.key = key
+        self.algorithms = [algorithm]
+
+    def encode(self, claims: dict) -> str:
+        """Подписывает claims и возвращает токен."""
+        return self._jwt.encode(claims, self.key, algorithm=self.algorithms[0])
+
+    def decode(self, token: str) -> dict:
+        """
+        Проверяет подпись и срок действия токена.
+
+        :raise TokenValidationError: Если токен недействителен или истёк.
+        :return: claims токена.
+        """
+        try:
+            return self._jwt.decode(
+                token, self.key, algorithms=self.algorithms
+            )
+        except self._error as err:
+            raise TokenValidationError(str(err)) from err
+
+
+class PyJWTTokenVerifier:
+    """
+    Реализация на PyJWT и cryptography.
+
+    Поддерживает HS256/384/512 с общим секретом и EdDSA
+    с парой ключей. Ключи разбираются один раз при создании,
+    а не при каждой проверке.
+    """
+
+    def __init__(
+            self,
+            algorithm: str,
+            secret: Optional[str] = None,
+            private_key_pem: Optional[bytes] = None,
+            public_key_pem: Optional[bytes] = None,
+    ) -> None:
+        import jwt
+        from jwt.algorithms import get_default_algorithms
+
+        self._jwt = jwt
+        self.algorithm = algorithm
+        self.algorithms = [algorithm]
+        impl = get_default_algorithms()[algorithm]
+        if algorithm.startswith("HS"):
+            self.signing_key = self.verifying_key = impl.prepare_key(secret)
+        else:
+            self.signing_key = (
+                impl.prepare_key(private_key_pem)
+                if private_key_pem else None
+            )
+            self.verifying_key = (
+                impl.prepare_key(public_key_pem) if public_key_pem
+                else self.signing_key.public_key()
+            )
+
+    def encode(self, claims: dict) -> str:
+        """Подписывает claims и возвращает токен."""
+        if self.signing_key is None:
+            raise TokenValidationError("Signing key is not configured")
+        return self._jwt.encode(
+            claims, self.signing_key, algorithm=self.algorithm
+        )
+
+    def decode(self, token: str) -> dict:
+        """
+        Проверяет подпись и срок действия токена.
+
+        :raise TokenValidationError: Если токен недействителен или истёк.
+        :return: claims токена.
+        """
+        try:
+            return self._jwt.decode(
+                token, self.verifying_key, algorithms=self.algorithms,
+                options={"require": ["exp"]},
+            )
+        except self._jwt.PyJWTError as err:
+            raise TokenValidationError(str(err)) from err
+
+
+class CachingTokenVerifier:
+    """
+    LRU уже проверенных токенов поверх другого верификатора.
+
+    Повторный запрос с тем же токеном не проверяет подпись,
+    а сравнивает только exp из сохранённых claims:
+    истёкший токен удаляется из кэша и отклоняется.
+    Токены без exp не кэшируются.
+    """
+
+    def __init__(self, inner: TokenVerifier,
+                 maxsize: int = TOKEN_CACHE_SIZE) -> None:
+        self.inner = inner
+        self.maxsize = maxsize
+        self._claims: OrderedDict[str, dict] = OrderedDict()
+        self._lock = Lock()
+
+    def encode(self, claims: dict) -> str:
+        """Подписывает claims и возвращает токен."""
+        return self.inner.encode(claims)
+
+    def decode(self, token: str) -> dict:
+        """
+        Возвращает claims из кэша или проверяет токен.
+
+        :raise TokenValidationError: Если токен недействителен или истёк.
+        :return: claims токена.
+        """
+        with self._lock:
+            claims = self._claims.get(token)
+            if claims is not None:
+                if claims["exp"] > time.time():
+                    self._claims.move_to_end(token)
+                    return claims
+                del self._claims[token]
+                raise TokenValidationError("Signature has expired")
+        claims = self.inner.decode(token)
+        if isinstance(claims.get("exp"), (int, float)):
+            with self._lock:
+                self._claims[token] = claims
+                if len(self._claims) > self.maxsize:
+                    self._claims.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        """Очищает кэш проверенных токенов."""
+        with self._lock:
+            self._claims.clear()
+
+
+def _read_key(path: Optional[str]) -> Optional[bytes]:
+    return Path(path).read_bytes() if path else None
+
+
+def build_token_verifier(
+        backend: str = JWT_BACKEND,
+        algorithm: Optional[str] = ALGORITHM,
+        secret: Optional[str] = SECRET_KEY,
+) -> TokenVerifier:
+    """
+    Создаёт верификатор по настройкам окружения.
+
+    JWT_BACKEND=pyjwt включает PyJWT (нужен для EdDSA, ключи
+    из JWT_PRIVATE_KEY_FILE / JWT_PUBLIC_KEY_FILE), по умолчанию
+    используется python-jose. Основной выигрыш даёт кэш:
+    на HMAC обе библиотеки проверяют подпись примерно одинаково.
+    :return: Верификатор с кэшем проверенных токенов.
+    """
+    if backend == "pyjwt":
+        inner = PyJWTTokenVerifier(
+            algorithm, secret=secret,
+            private_key_pem=_read_key(JWT_PRIVATE_KEY_FILE),
+            public_key_pem=_read_key(JWT_PUBLIC_KEY_FILE),
+        )
+    else:
+        inner = JoseTokenVerifier(secret, algorithm)
+    return CachingTokenVerifier(inner)
+
+
+@lru_cache(maxsize=1)
+def get_token_verifier() -> TokenVerifier:
+    """
+    Общий верификатор приложения, создаётся при первом обращении.
+
+    :return: Верификатор токенов доступа.
+    """
+    return build_token_verifier()
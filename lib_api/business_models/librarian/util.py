@@ -6,13 +6,14 @@ from lib_api.business_models.librarian.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token)
 
 
-async def get_access_token_for_user(librarian) -> str:
+async def get_access_token_for_user(librarian, jti: str) -> str:
     """
     Генерирует JWT токен доступа для указанного библиотекаря.
 
     Args:
         librarian: Объект библиотекаря, для которого создается токен.
                    Должен содержать атрибут email.
+        jti: Идентификатор токена, по нему токен можно отозвать.
 
     :return:
         librarian: Объект библиотекаря, для которого создается токен.
@@ -22,6 +23,6 @@ async def get_access_token_for_user(librarian) -> str:
         minutes=ACCESS_TOKEN_EXPIRE_MINUTES
     )
     return create_access_token(
-        data={"sub": librarian.email},
+        data={"sub": librarian.email, "jti": jti},
         expires_delta=access_token_expires
     )
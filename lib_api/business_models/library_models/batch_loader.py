@@ -0,0 +1,145 @@
+"""Загрузка записей пачкой по списку ID."""
+
+import asyncio
+from os import getenv
+from typing import Any, Iterable, Optional, Type
+
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.base_model.base_model import BaseModel
+from lib_api.business_models.library_models.lookups import by_ids_statement
+from lib_api.factories.error_factory import handle_db_error
+
+BATCH_MAX_IDS = int(getenv("BATCH_MAX_IDS") or 100)
+
+# Ссылки на запущенные отправки: иначе задачу может собрать GC.
+_dispatch_tasks: set[asyncio.Task] = set()
+
+
+async def fetch_by_ids(
+        db: AsyncSession,
+        model: Type[BaseModel],
+        ids: Iterable[int],
+        raise_related: bool = False,
+) -> dict[int, Any]:
+    """
+    Загружает записи модели одним запросом WHERE id = ANY(:ids).
+
+    Список передаётся одним параметром-массивом, поэтому
+    текст запроса и prepared statement не зависят от числа ID.
+    raise_related запрещает ленивую загрузку связей.
+    :return: Словарь ID -> объект, отсутствующих ID в нём нет.
+    """
+    result = await db.execute(
+        by_ids_statement(model, raise_related), {"ids": list(ids)}
+    )
+    return {row.id: row for row in result.scalars()}
+
+
+class BatchLoader:
+    """
+    Объединяет одновременные загрузки по ID в один запрос.
+
+    Вызовы load, сделанные в одной итерации цикла событий
+    (например, через asyncio.gather), ждут общий запрос,
+    который отправляется на следующей итерации.
+    Результаты не кэшируются: последовательные вызовы
+    выполняют отдельные запросы, как и раньше.
+    Отправки загрузчиков разных моделей одной сессии идут
+    по очереди под общей блокировкой: AsyncSession не допускает
+    параллельных запросов.
+    """
+
+    def __init__(self, db: AsyncSession, model: Type[BaseModel]) -> None:
+        self.db = db
+        self.model = model
+        self._pending: dict[int, asyncio.Future] = {}
+
+    async def load(self, key: int) -> Optional[Any]:
+        """
+        Возвращает объект по ID или None, если его нет.
+
+        :return: Объект модели или None.
+        """
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._schedule_dispatch)
+            future = loop.create_future()
+            self._pending[key] = future
+        return await future
+
+    def _schedule_dispatch(self) -> None:
+        task = asyncio.ensure_future(self._dispatch())
+        _dispatch_tasks.add(task)
+        task.add_done_callback(_dispatch_tasks.discard)
+
+    async def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        try:
+            async with session_lock(self.db):
+                rows = await fetch_by_ids(self.db, self.model, pending)
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as err:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(rows.get(key))
+
+
+def session_lock(db: AsyncSession) -> asyncio.Lock:
+    """
+    Блокировка отправок загрузчиков одной сессии.
+
+    :return: asyncio.Lock из session.info.
+    """
+    return db.info.setdefault("batch_lock", asyncio.Lock())
+
+
+def get_batch_loader(db: AsyncSession, model: Type[BaseModel]) -> BatchLoader:
+    """
+    Загрузчик модели, привязанный к сессии запроса.
+
+    Хранится в session.info, поэтому у каждого запроса свой.
+    :return: BatchLoader для модели.
+    """
+    loaders = db.info.setdefault("batch_loaders", {})
+    loader = loaders.get(model)
+    if loader is None:
+        loader = loaders[model] = BatchLoader(db, model)
+    return loader
+
+
+async def load_batch(
+        db: AsyncSession,
+        model: Type[BaseModel],
+        ids: list[int],
+) -> tuple[list[Any], list[int]]:
+    """
+    Загружает записи по списку ID в порядке запроса.
+
+    Повторяющиеся ID возвращаются один раз.
+    Больше BATCH_MAX_IDS ID за запрос — ошибка 400.
+    :return: Найденные объекты и список отсутствующих ID.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if len(unique_ids) > BATCH_MAX_IDS:
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="TooManyIds",
+            message=f"At most {BATCH_MAX_IDS} ids per request",
+            st_code=status.HTTP_400_BAD_REQUEST,
+        )
+    rows = await fetch_by_ids(db, model, unique_ids, raise_related=True)
+    items = [rows[key] for key in unique_ids if key in rows]
+    missing_ids = [key for key in unique_ids if key not in rows]
+    return items, missing_ids
@@ -8,6 +8,8 @@ from lib_api.business_models.decorators.error_decorator import \
 from lib_api.business_models.library_models.book_crud.check_isbn import \
     get_book_by_isbn
 from lib_api.business_models.library_models.models_lib import Book
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_BOOK, OP_CREATE, change, record_changes)
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 from lib_api.schemas.book_serialization import BookCreate, BookResponse
@@ -46,6 +48,10 @@ async def create_book(
         copies_count=book_in.copies_count
     )
     db.add(book)
+    await db.flush()
+    await record_changes(db, change(
+        ENTITY_BOOK, book.id, OP_CREATE, copies_count=book.copies_count
+    ))
     await db.commit()
     await db.refresh(book)
     return BookResponse.model_validate(book)
@@ -3,10 +3,11 @@
 from typing import Optional
 
 from fastapi import status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lib_api.business_models.library_models.models_lib import Book
+from lib_api.business_models.library_models.unit_of_work import \
+    get_unit_of_work
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 
@@ -17,12 +18,13 @@ async def get_book_by_id(
     """
     Получает книгу из базы данных по её идентификатору.
 
+    Уже загруженный в сессию объект берётся из identity map,
+    одновременные вызовы объединяются в один запрос.
     Если книга с ID не найдена, вызывает обработчик ошибки.
     :return:
        Optional[Book] - модель книги опционально.
     """
-    result = await db.execute(select(Book).where(Book.id == book_id))
-    book = result.scalars().first()
+    book = await get_unit_of_work(db).get(Book, book_id)
 
     if not book:
         logger.warning(f"Book with such ID {book_id} not found")
@@ -34,3 +36,22 @@ async def get_book_by_id(
             st_code=status.HTTP_404_NOT_FOUND,
         )
     return book
+
+
+async def ensure_book_exists(book_id: int, db: AsyncSession) -> None:
+    """
+    Проверяет существование книги без загрузки её связей.
+
+    Выбирает только первичный ключ.
+    Если книга с ID не найдена, вызывает обработчик ошибки.
+    :return: None
+    """
+    if not await get_unit_of_work(db).exists(Book, book_id):
+        logger.warning(f"Book with such ID {book_id} not found")
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="NotFoundBookID",
+            message="Book with given ID not found",
+            st_code=status.HTTP_404_NOT_FOUND,
+        )
@@ -0,0 +1,28 @@
+"""Книги по списку ID."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.decorators.error_decorator import \
+    handle_db_exceptions
+from lib_api.business_models.library_models.batch_loader import load_batch
+from lib_api.business_models.library_models.models_lib import Book
+from lib_api.schemas.batch_serialization import BatchResponse
+from lib_api.schemas.book_serialization import BookResponse
+
+
+@handle_db_exceptions
+async def get_books_by_ids(
+        ids: list[int], db: AsyncSession
+) -> BatchResponse[BookResponse]:
+    """
+    Получает книги по списку ID одним запросом.
+
+    Порядок книг совпадает с порядком ID в запросе.
+    :return:
+        BatchResponse[BookResponse]: Найденные книги и ненайденные ID.
+    """
+    books, missing_ids = await load_batch(db, Book, ids)
+    return BatchResponse[BookResponse](
+        items=[BookResponse.model_validate(book) for book in books],
+        missing_ids=missing_ids,
+    )
@@ -2,9 +2,10 @@
 
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from lib_api.business_models.library_models.lookups import (BOOK_BY_ISBN,
+                                                            lookup_first)
 from lib_api.business_models.library_models.models_lib import Book
 
 
@@ -17,7 +18,4 @@ async def get_book_by_isbn(
     :return:
         Optional[Book]: Объект книги, если найден, иначе None.
     """
-    result = await db.execute(
-        select(Book).where(Book.isbn == isbn)
-    )
-    return result.scalars().first()
+    return await lookup_first(db, BOOK_BY_ISBN, isbn=isbn)
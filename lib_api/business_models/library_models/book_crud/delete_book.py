@@ -1,14 +1,17 @@
 """Удаление книги."""
 
 from fastapi import status
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lib_api.business_models.decorators.error_decorator import \
     handle_db_exceptions
 from lib_api.business_models.library_models.book_crud.book_by_id import \
-    get_book_by_id
-from lib_api.business_models.library_models.models_lib import ReaderBook
+    ensure_book_exists
+from lib_api.business_models.library_models.models_lib import (Book,
+                                                               ReaderBook)
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_BOOK, OP_DELETE, change, record_changes)
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 
@@ -18,14 +21,16 @@ async def delete_book(
         book_id: int, db: AsyncSession
 ) -> None:
     """
-    Удаляет книгу без активных задач из базы данных.
+    Мягко удаляет книгу без активных выдач.
 
     Проверяет наличие активных выдач.
     На активные выдачи вызывает обработчик ошибки с кодом 400.
+    Проставляет deleted_at одним UPDATE без загрузки истории выдач,
+    строки удаляет фоновая очистка.
 
     :return: None
     """
-    book = await get_book_by_id(book_id, db)
+    await ensure_book_exists(book_id, db)
     count_stmt = select(func.count()).select_from(ReaderBook).where(
         and_(
             ReaderBook.book_id == book_id,
@@ -48,5 +53,10 @@ async def delete_book(
             st_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    await db.delete(book)
+    await db.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(deleted_at=func.now())
+    )
+    await record_changes(db, change(ENTITY_BOOK, book_id, OP_DELETE))
     await db.commit()
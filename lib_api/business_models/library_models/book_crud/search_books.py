@@ -0,0 +1,54 @@
+"""Список книг с фильтрами и курсорной пагинацией."""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from lib_api.business_models.library_models.models_lib import Book
+from lib_api.business_models.pagination.keyset import keyset_paginate
+from lib_api.schemas.book_serialization import BookFilters, BookResponse
+from lib_api.schemas.keyset_serialization import KeysetPage, KeysetParams
+
+BOOK_SORT_KEYS = {
+    "id": ((Book.id, int),),
+    "title": ((Book.title, str), (Book.id, int)),
+    "author": ((Book.author, str), (Book.title, str), (Book.id, int)),
+    "year": ((Book.publication_year, int), (Book.id, int)),
+}
+
+
+async def search_books(
+        filters: BookFilters, params: KeysetParams, db: AsyncSession
+) -> KeysetPage[BookResponse]:
+    """
+    Возвращает страницу книг по фильтрам.
+
+    Каждому ключу сортировки соответствует составной индекс
+    books (см. Book.__table_args__), поэтому страница читается
+    из индекса без сортировки. При sort=year книги без года
+    издания не выводятся.
+    :return: KeysetPage[BookResponse]: Страница книг и курсор следующей.
+    """
+    stmt = select(Book).options(raiseload("*"))
+    if filters.author is not None:
+        stmt = stmt.where(Book.author == filters.author)
+    if filters.year_from is not None:
+        stmt = stmt.where(Book.publication_year >= filters.year_from)
+    if filters.year_to is not None:
+        stmt = stmt.where(Book.publication_year <= filters.year_to)
+    if filters.available is True:
+        stmt = stmt.where(Book.copies_count > 0)
+    elif filters.available is False:
+        stmt = stmt.where(Book.copies_count == 0)
+    if filters.sort == "year":
+        stmt = stmt.where(Book.publication_year.is_not(None))
+
+    order = filters.order or ("desc" if filters.sort == "id" else "asc")
+    return await keyset_paginate(
+        db=db,
+        stmt=stmt,
+        keys=BOOK_SORT_KEYS[filters.sort],
+        params=params,
+        schema=BookResponse,
+        descending=order == "desc",
+    )
@@ -2,10 +2,14 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from lib_api.business_models.availability.notifications import \
+    notify_availability
 from lib_api.business_models.decorators.error_decorator import \
     handle_db_exceptions
 from lib_api.business_models.library_models.book_crud.book_by_id import \
     get_book_by_id
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_BOOK, OP_UPDATE, change, record_changes)
 from lib_api.schemas.book_serialization import BookResponse, BookUpdate
 
 
@@ -20,6 +24,7 @@ async def update_book_data(
 
     Загружает существующую книгу из базы данных.
     Обновляет указанные поля.
+    Об изменении числа копий уведомляет подписчиков доступности.
     Сохраняет изменения и возвращает обновленные данные.
     :return:
         BookResponse: сериализованные данные книги.
@@ -31,6 +36,12 @@ async def update_book_data(
         setattr(book, field, value)
 
     db.add(book)
+    await db.flush()
+    await record_changes(db, change(
+        ENTITY_BOOK, book.id, OP_UPDATE, copies_count=book.copies_count
+    ))
+    if "copies_count" in update_data:
+        await notify_availability(db, book.id)
     await db.commit()
     await db.refresh(book)
     return BookResponse.model_validate(book)
@@ -2,32 +2,55 @@
 
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from lib_api.business_models.library_models.models_lib import ReaderBook
+from lib_api.business_models.library_models.models_lib import Book, ReaderBook
 from lib_api.business_models.library_models.reader_crud.reader_by_id import \
-    get_reader_by_id
-from lib_api.schemas.reader_book_seeialization import BorrowedBooksListResponse
+    ensure_reader_exists
+from lib_api.schemas.reader_book_seeialization import (
+    ActiveBorrowResponse, BorrowedBookDetails, BorrowedBooksListResponse)
+
+LOAN_COLUMNS = (
+    ReaderBook.id,
+    ReaderBook.book_id,
+    ReaderBook.reader_id,
+    ReaderBook.borrow_date,
+    ReaderBook.return_date,
+    ReaderBook.due_date,
+)
+BOOK_COLUMNS = (Book.title, Book.author, Book.isbn)
 
 
 async def get_active_borrows_by_reader(
-        reader_id: int, db: AsyncSession
+        reader_id: int, db: AsyncSession, expand_book: bool = False
 ) -> BorrowedBooksListResponse:
     """
     Возвращает список актуальных книг у читателя.
 
-    Загружает читателя по ID.
-    Выбирает все книги, которые он взял и не вернул.
+    Проверяет, что читатель существует.
+    Выбирает только нужные столбцы выдач, которые он взял и не вернул,
+    без загрузки связей моделей.
+    С expand_book данные книги берутся тем же запросом через JOIN.
     :return:
         BorrowedBooksListResponse: Список активных книг у читателя.
     """
-    reader = await get_reader_by_id(reader_id=reader_id, db=db)
-    stmt = select(ReaderBook).options(joinedload(ReaderBook.book)).where(
+    await ensure_reader_exists(reader_id=reader_id, db=db)
+    stmt = select(*LOAN_COLUMNS).where(
         and_(
-            ReaderBook.reader_id == reader.id,
+            ReaderBook.reader_id == reader_id,
             ReaderBook.return_date.is_(None)
         )
     )
+    if expand_book:
+        stmt = stmt.join(Book, Book.id == ReaderBook.book_id).add_columns(
+            *BOOK_COLUMNS
+        )
     result = await db.execute(stmt)
-    books = result.scalars().all()
-    return BorrowedBooksListResponse(borrowed_books=books)
\ No newline at end of file
+    borrowed_books = []
+    for row in result.mappings():
+        borrow = ActiveBorrowResponse.model_validate(dict(row))
+        if expand_book:
+            borrow.book = BorrowedBookDetails(
+                title=row["title"], author=row["author"], isbn=row["isbn"]
+            )
+        borrowed_books.append(borrow)
+    return BorrowedBooksListResponse(borrowed_books=borrowed_books)
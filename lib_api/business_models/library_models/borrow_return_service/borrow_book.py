@@ -1,46 +1,70 @@
 """Выдача книг из библиотеки."""
 
+from datetime import timedelta
+
 from fastapi import status
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from lib_api.business_models.availability.notifications import \
+    notify_availability
 from lib_api.business_models.library_models.book_crud.book_by_id import \
     get_book_by_id
-from lib_api.business_models.library_models.models_lib import ReaderBook
+from lib_api.business_models.library_models.hold_service.allocate_hold import \
+    take_ready_hold
+from lib_api.business_models.library_models.models_lib import (
+    LOAN_PERIOD_DAYS, Book, ReaderBook)
 from lib_api.business_models.library_models.reader_crud.reader_by_id import \
-    get_reader_by_id
+    ensure_reader_exists
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_BOOK, ENTITY_LOAN, OP_CREATE, OP_UPDATE, change, record_changes)
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 from lib_api.schemas.reader_book_seeialization import BorrowedBookResponse
 
 
+async def refuse_no_copies(book_id: int, db: AsyncSession) -> None:
+    """Отклоняет выдачу книги без свободных копий с кодом 400."""
+    logger.warning(f"No copies of the book ID {book_id}")
+    await handle_db_error(
+        db=db,
+        error=ValueError(),
+        er_type="NoCopiesBook",
+        message="No available copies to borrow",
+        st_code=status.HTTP_400_BAD_REQUEST,
+    )
+
+
 async def borrow_book(
         book_id: int, reader_id: int, db: AsyncSession
 ) -> BorrowedBookResponse:
     """
     Оформляет выдачу книги читателю.
 
-    Проверяет доступность копий книги.
+    Читатель только проверяется на существование, без загрузки связей;
+    уже загруженные в сессию читатель и книга не запрашиваются повторно.
+    Погашает готовый резерв читателя на эту книгу, если он есть.
+    Иначе проверяет доступность копий книги.
     Ограничение на количество активных заимствований у читателя.
-    Создает запись о выдаче и обновляет количество доступных копий.
+    Создает запись о выдаче со сроком возврата LOAN_PERIOD_DAYS.
+    Копия списывается условным атомарным UPDATE copies_count > 0:
+    одновременные выдачи и возвраты не теряют изменений,
+    а последнюю копию получает только одна выдача.
+    События выдачи и книги пишутся в журнал изменений,
+    подписчики доступности получают уведомление после фиксации.
     :return:
         BorrowedBookResponse: Данные о выданной книге.
     """
-    reader = await get_reader_by_id(reader_id, db)
+    await ensure_reader_exists(reader_id=reader_id, db=db)
     book = await get_book_by_id(book_id, db)
-    if book.copies_count <= 0:
-        logger.warning(f"No copies of the book ID {book_id}")
-        await handle_db_error(
-            db=db,
-            error=ValueError(),
-            er_type="NoCopiesBook",
-            message="No available copies to borrow",
-            st_code=status.HTTP_400_BAD_REQUEST,
-        )
+    hold = await take_ready_hold(book_id=book_id, reader_id=reader_id, db=db)
+    if hold is None and book.copies_count <= 0:
+        await refuse_no_copies(book_id, db)
 
     active_borrows_stmt = select(func.count()).select_from(ReaderBook).where(
         and_(
-            ReaderBook.reader_id == reader.id,
+            ReaderBook.reader_id == reader_id,
             ReaderBook.return_date.is_(None)
         )
     )
@@ -56,12 +80,36 @@ async def borrow_book(
             st_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    borrow = ReaderBook(book_id=book_id, reader_id=reader.id)
+    borrow = ReaderBook(
+        book_id=book_id,
+        reader_id=reader_id,
+        due_date=func.now() + timedelta(days=LOAN_PERIOD_DAYS),
+    )
     db.add(borrow)
 
-    book.copies_count -= 1
-    db.add(book)
+    if hold is None:
+        result = await db.execute(
+            update(Book)
+            .where(Book.id == book_id, Book.copies_count > 0)
+            .values(copies_count=Book.copies_count - 1)
+            .returning(Book.copies_count)
+            .execution_options(synchronize_session=False)
+        )
+        copies_count = result.scalar_one_or_none()
+        if copies_count is None:
+            await refuse_no_copies(book_id, db)
+        set_committed_value(book, "copies_count", copies_count)
 
+    await db.flush()
+    await record_changes(
+        db,
+        change(ENTITY_LOAN, borrow.id, OP_CREATE,
+               book_id=book_id, reader_id=reader_id),
+        change(ENTITY_BOOK, book_id, OP_UPDATE,
+               copies_count=book.copies_count),
+    )
+    await notify_availability(db, book_id)
     await db.commit()
-    await db.refresh(borrow)
+    # Только столбцы, заполненные базой: без повторной загрузки связей.
+    await db.refresh(borrow, ["borrow_date", "due_date"])
     return BorrowedBookResponse.model_validate(borrow)
@@ -0,0 +1,91 @@
+"""История выдач книг читателя и книги."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from lib_api.business_models.library_models.book_crud.book_by_id import \
+    ensure_book_exists
+from lib_api.business_models.library_models.models_lib import ReaderBook
+from lib_api.business_models.library_models.reader_crud.reader_by_id import \
+    ensure_reader_exists
+from lib_api.business_models.pagination.keyset import keyset_paginate
+from lib_api.schemas.keyset_serialization import KeysetPage, KeysetParams
+from lib_api.schemas.reader_book_seeialization import BorrowedBookResponse
+
+HISTORY_KEYS = (
+    (ReaderBook.borrow_date, datetime.fromisoformat),
+    (ReaderBook.id, int),
+)
+
+
+async def _loan_history(
+        condition: ColumnElement,
+        params: KeysetParams,
+        db: AsyncSession,
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+) -> KeysetPage[BorrowedBookResponse]:
+    """
+    Выбирает страницу выдач от новых к старым.
+
+    Связи ReaderBook не подгружаются: ответ строится из колонок.
+    Границы по borrow_date отсекают лишние секции таблицы.
+    :return:
+        KeysetPage[BorrowedBookResponse]: Страница истории выдач.
+    """
+    stmt = select(ReaderBook).options(raiseload("*")).where(condition)
+    if date_from is not None:
+        stmt = stmt.where(ReaderBook.borrow_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(ReaderBook.borrow_date < date_to)
+    return await keyset_paginate(
+        db=db,
+        stmt=stmt,
+        keys=HISTORY_KEYS,
+        params=params,
+        schema=BorrowedBookResponse,
+    )
+
+
+async def get_reader_loan_history(
+        reader_id: int,
+        params: KeysetParams,
+        db: AsyncSession,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+) -> KeysetPage[BorrowedBookResponse]:
+    """
+    Возвращает историю выдач читателя, включая возвращённые книги.
+
+    Проверяет существование читателя.
+    :return:
+        KeysetPage[BorrowedBookResponse]: Страница истории выдач.
+    """
+    await ensure_reader_exists(reader_id=reader_id, db=db)
+    return await _loan_history(
+        ReaderBook.reader_id == reader_id, params, db, date_from, date_to
+    )
+
+
+async def get_book_loan_history(
+        book_id: int,
+        params: KeysetParams,
+        db: AsyncSession,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+) -> KeysetPage[BorrowedBookResponse]:
+    """
+    Возвращает историю выдач книги, включая возвращённые экземпляры.
+
+    Проверяет существование книги.
+    :return:
+        KeysetPage[BorrowedBookResponse]: Страница истории выдач.
+    """
+    await ensure_book_exists(book_id=book_id, db=db)
+    return await _loan_history(
+        ReaderBook.book_id == book_id, params, db, date_from, date_to
+    )
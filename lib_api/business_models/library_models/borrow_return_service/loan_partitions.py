@@ -0,0 +1,76 @@
+"""Обслуживание секций таблицы выдач readers_books."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from lib_api.logs import logger
+
+LOANS_TABLE = "readers_books"
+
+
+def partition_name(year: int) -> str:
+    """
+    Возвращает имя годовой секции таблицы выдач.
+
+    :return: str: Имя вида readers_books_y2025.
+    """
+    return f"{LOANS_TABLE}_y{year}"
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """
+    Проверяет, что readers_books секционирована.
+
+    В тестовой базе таблица создаётся create_all без секций.
+    :return: bool: True для секционированной таблицы.
+    """
+    relkind = await conn.scalar(
+        text("SELECT relkind::text FROM pg_class"
+             " WHERE oid = to_regclass(:table)"),
+        {"table": LOANS_TABLE},
+    )
+    return relkind == "p"
+
+
+async def ensure_loan_partitions(
+        conn: AsyncConnection, years_ahead: int = 1
+) -> None:
+    """
+    Создаёт секции текущего и следующих лет, если их ещё нет.
+
+    Новые выдачи не должны попадать в секцию DEFAULT:
+    из неё строки придётся переносить перед созданием секции года.
+    :return: None
+    """
+    if not await is_partitioned(conn):
+        return
+    current_year = datetime.now(timezone.utc).year
+    for year in range(current_year, current_year + years_ahead + 1):
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(year)}"
+                    f" PARTITION OF {LOANS_TABLE}"
+                    f" FOR VALUES FROM ('{year}-01-01')"
+                    f" TO ('{year + 1}-01-01')"
+                ))
+        except SQLAlchemyError as err:
+            logger.error(f"Loan partition for {year} not created: {err}")
+
+
+async def detach_loan_partition(conn: AsyncConnection, year: int) -> None:
+    """
+    Отсоединяет секцию года от readers_books.
+
+    Отсоединённая таблица остаётся в базе как обычная,
+    её можно выгрузить в архив и удалить без затрагивания
+    актуальных выдач.
+    :return: None
+    """
+    await conn.execute(text(
+        f"ALTER TABLE {LOANS_TABLE} DETACH PARTITION {partition_name(year)}"
+    ))
+    logger.info(f"Loan partition {partition_name(year)} detached")
@@ -0,0 +1,45 @@
+"""Список просроченных выдач."""
+
+from datetime import datetime
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from lib_api.business_models.library_models.models_lib import ReaderBook
+from lib_api.business_models.pagination.keyset import keyset_paginate
+from lib_api.schemas.keyset_serialization import KeysetPage, KeysetParams
+from lib_api.schemas.reader_book_seeialization import BorrowedBookResponse
+
+OVERDUE_KEYS = (
+    (ReaderBook.due_date, datetime.fromisoformat),
+    (ReaderBook.id, int),
+)
+
+
+async def get_overdue_loans(
+        params: KeysetParams, db: AsyncSession
+) -> KeysetPage[BorrowedBookResponse]:
+    """
+    Возвращает открытые выдачи с истёкшим сроком возврата.
+
+    Сортировка от самых давних просрочек.
+    Запрос читает только частичный индекс открытых выдач,
+    поэтому не зависит от числа закрытых записей.
+    :return:
+        KeysetPage[BorrowedBookResponse]: Страница просроченных выдач.
+    """
+    stmt = select(ReaderBook).options(raiseload("*")).where(
+        and_(
+            ReaderBook.return_date.is_(None),
+            ReaderBook.due_date < func.now(),
+        )
+    )
+    return await keyset_paginate(
+        db=db,
+        stmt=stmt,
+        keys=OVERDUE_KEYS,
+        params=params,
+        schema=BorrowedBookResponse,
+        descending=False,
+    )
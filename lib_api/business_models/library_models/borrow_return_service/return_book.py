@@ -3,10 +3,15 @@
 from fastapi import status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
-from lib_api.business_models.library_models.book_crud.book_by_id import \
-    get_book_by_id
+from lib_api.business_models.availability.notifications import \
+    notify_availability
+from lib_api.business_models.library_models.hold_service.allocate_hold import \
+    allocate_returned_copy
 from lib_api.business_models.library_models.models_lib import ReaderBook
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_BOOK, ENTITY_LOAN, OP_UPDATE, change, record_changes)
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 from lib_api.schemas.reader_book_seeialization import BorrowedBookResponse
@@ -18,15 +23,23 @@ async def return_book(
     """
     Возвращает книгу в библиотеку.
 
-    Проверяет соответствующую запись.
+    Проверяет соответствующую запись, не загружая её связи.
     Проверяет по колонке даты возврата актуальность.
     Проставляет дату возврата если проверка удачная.
-    Увеличивает количество копий книги в библиотеке.
+    Отдаёт копию первому резерву в очереди,
+    а при пустой очереди увеличивает количество копий книги.
+    События возврата и книги пишутся в журнал изменений,
+    подписчики доступности получают уведомление после фиксации.
     :raise: Обработчик исключений.
     :return:
         BorrowedBookResponse: Схема с информацией о возвращенной книге.
     """
-    stmt = select(ReaderBook).where(ReaderBook.id == borrow_id)
+    stmt = (
+        select(ReaderBook)
+        .where(ReaderBook.id == borrow_id)
+        .options(raiseload("*"))
+        .with_for_update()
+    )
     result = await db.execute(stmt)
     borrow = result.scalars().one_or_none()
 
@@ -54,10 +67,15 @@ async def return_book(
     borrow.return_date = func.now()
     db.add(borrow)
 
-    book = await get_book_by_id(borrow.book_id, db)
-    book.copies_count += 1
-    db.add(book)
+    await allocate_returned_copy(book_id=borrow.book_id, db=db)
 
+    await record_changes(
+        db,
+        change(ENTITY_LOAN, borrow.id, OP_UPDATE, book_id=borrow.book_id,
+               reader_id=borrow.reader_id, returned=True),
+        change(ENTITY_BOOK, borrow.book_id, OP_UPDATE),
+    )
+    await notify_availability(db, borrow.book_id)
     await db.commit()
-    await db.refresh(borrow)
+    await db.refresh(borrow, ["return_date"])
     return BorrowedBookResponse.model_validate(borrow)
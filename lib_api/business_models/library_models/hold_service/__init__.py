@@ -0,0 +1 @@
+"""Инициализация объектов резервов книг."""
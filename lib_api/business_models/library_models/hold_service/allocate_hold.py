@@ -0,0 +1,80 @@
+"""Закрепление возвращённых копий за резервами."""
+
+from typing import Optional
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.library_models.models_lib import (HOLD_FULFILLED,
+                                                               HOLD_READY,
+                                                               HOLD_WAITING,
+                                                               Book, Hold)
+
+
+async def allocate_returned_copy(
+        book_id: int, db: AsyncSession
+) -> Optional[Hold]:
+    """
+    Отдаёт возвращённую копию старейшему ожидающему резерву.
+
+    Копия сначала возвращается в фонд атомарным UPDATE: он же
+    блокирует строку книги, как place_hold, поэтому резерв,
+    поставленный одновременно с возвратом, виден после его
+    фиксации. Резерв выбирается FOR UPDATE SKIP LOCKED; если он
+    есть, копия снова вычитается из фонда и закрепляется за ним.
+    Транзакцию не фиксирует.
+    :return:
+        Optional[Hold]: Резерв, получивший копию, или None.
+    """
+    await db.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(copies_count=Book.copies_count + 1)
+    )
+    result = await db.execute(
+        select(Hold)
+        .where(and_(Hold.book_id == book_id, Hold.status == HOLD_WAITING))
+        .order_by(Hold.created_at, Hold.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    hold = result.scalars().first()
+    if hold is not None:
+        hold.status = HOLD_READY
+        hold.ready_at = func.now()
+        db.add(hold)
+        await db.execute(
+            update(Book)
+            .where(Book.id == book_id)
+            .values(copies_count=Book.copies_count - 1)
+        )
+        return hold
+    return None
+
+
+async def take_ready_hold(
+        book_id: int, reader_id: int, db: AsyncSession
+) -> Optional[Hold]:
+    """
+    Погашает готовый резерв читателя при выдаче книги.
+
+    Закреплённая копия уже вычтена из фонда,
+    поэтому выдача по резерву не уменьшает copies_count.
+    Транзакцию не фиксирует.
+    :return:
+        Optional[Hold]: Погашенный резерв или None.
+    """
+    result = await db.execute(
+        select(Hold)
+        .where(and_(
+            Hold.book_id == book_id,
+            Hold.reader_id == reader_id,
+            Hold.status == HOLD_READY,
+        ))
+        .with_for_update()
+    )
+    hold = result.scalars().first()
+    if hold is not None:
+        hold.status = HOLD_FULFILLED
+        db.add(hold)
+    return hold
@@ -0,0 +1,64 @@
+"""Постановка читателя в очередь на книгу."""
+
+from fastapi import status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.decorators.error_decorator import \
+    handle_db_exceptions
+from lib_api.business_models.library_models.models_lib import Book, Hold
+from lib_api.business_models.library_models.reader_crud.reader_by_id import \
+    ensure_reader_exists
+from lib_api.factories.error_factory import handle_db_error
+from lib_api.logs import logger
+from lib_api.schemas.hold_serialization import HoldResponse
+
+
+@handle_db_exceptions
+async def place_hold(
+        book_id: int, reader_id: int, db: AsyncSession
+) -> HoldResponse:
+    """
+    Ставит читателя в очередь на книгу без свободных копий.
+
+    Если копии есть, книгу нужно выдать, резерв не создаётся.
+    Строка книги блокируется до фиксации резерва, как и при
+    возврате копии: возврат между проверкой и вставкой
+    не оставит копию в фонде при ожидающем резерве.
+    Повторный активный резерв того же читателя отклоняется
+    уникальным частичным индексом с кодом 409.
+    :return:
+        HoldResponse: Данные созданного резерва.
+    """
+    await ensure_reader_exists(reader_id=reader_id, db=db)
+    result = await db.execute(
+        select(Book.copies_count)
+        .where(Book.id == book_id)
+        .with_for_update(key_share=True)
+    )
+    copies_count = result.scalar_one_or_none()
+    if copies_count is None:
+        logger.warning(f"Book with such ID {book_id} not found")
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="NotFoundBookID",
+            message="Book with given ID not found",
+            st_code=status.HTTP_404_NOT_FOUND,
+        )
+    if copies_count > 0:
+        logger.warning(f"Hold refused, book ID {book_id} has copies")
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="CopiesAvailable",
+            message="Book has available copies to borrow",
+            st_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    hold = Hold(book_id=book_id, reader_id=reader_id)
+    db.add(hold)
+    await db.commit()
+    await db.refresh(hold)
+    logger.info(f"Hold {hold.id} placed on book ID {book_id}")
+    return HoldResponse.model_validate(hold)
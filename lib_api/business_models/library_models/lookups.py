@@ -0,0 +1,68 @@
+"""
+Заранее построенные запросы для частых выборок по ключу.
+
+Условие deleted_at IS NULL записано в самих запросах, и они помечены
+include_deleted: иначе exclude_soft_deleted на каждом выполнении
+добавлял бы опции, и SQLAlchemy заново строил запрос и ключ кэша.
+"""
+
+from functools import lru_cache
+from typing import Any, Optional, Type
+
+from sqlalchemy import (ARRAY, Integer, Select, any_, bindparam, func,
+                        select)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from lib_api.business_models.base_model.base_model import BaseModel
+from lib_api.business_models.library_models.models_lib import (
+    SOFT_DELETE_MODELS, Book, Reader)
+
+BOOK_BY_ISBN = select(Book).where(
+    Book.isbn == bindparam("isbn"), Book.deleted_at.is_(None)
+).execution_options(include_deleted=True)
+READER_BY_EMAIL = select(Reader).where(
+    func.lower(Reader.email) == func.lower(bindparam("email")),
+    Reader.deleted_at.is_(None),
+).execution_options(include_deleted=True)
+BOOK_ID_EXISTS = select(Book.id).where(
+    Book.id == bindparam("book_id"), Book.deleted_at.is_(None)
+).execution_options(include_deleted=True)
+READER_ID_EXISTS = select(Reader.id).where(
+    Reader.id == bindparam("reader_id"), Reader.deleted_at.is_(None)
+).execution_options(include_deleted=True)
+
+
+@lru_cache(maxsize=None)
+def by_ids_statement(
+        model: Type[BaseModel], raise_related: bool = False
+) -> Select:
+    """
+    Запрос WHERE id = ANY(:ids) для модели, строится один раз.
+
+    raise_related запрещает ленивую загрузку связей.
+    :return: Select с параметром-массивом ids.
+    """
+    stmt = select(model).where(
+        model.id == any_(bindparam("ids", type_=ARRAY(Integer)))
+    ).execution_options(include_deleted=True)
+    if model in SOFT_DELETE_MODELS:
+        stmt = stmt.where(model.deleted_at.is_(None))
+    if raise_related:
+        stmt = stmt.options(raiseload("*"))
+    return stmt
+
+
+async def lookup_first(
+        db: AsyncSession, stmt: Select, **params: Any
+) -> Optional[Any]:
+    """
+    Выполняет заранее построенный запрос с параметрами.
+
+    Запрос не собирается заново, а ключ кэша компиляции
+    SQLAlchemy вычисляется для него один раз, поэтому на вызов
+    остаются только подстановка параметров и поход в базу.
+    :return: Первый объект результата или None.
+    """
+    result = await db.execute(stmt, params)
+    return result.scalars().first()
@@ -1,13 +1,17 @@
 """Бизнес модели библиотечного процесса."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from os import getenv
 
-from sqlalchemy import (TIMESTAMP, CheckConstraint, ForeignKey, Integer,
-                        String, func, text)
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (TIMESTAMP, CheckConstraint, ForeignKey, Index,
+                        Integer, String, event, func, text)
+from sqlalchemy.orm import (Mapped, ORMExecuteState, Session, mapped_column,
+                            relationship, with_loader_criteria)
 
 from lib_api.business_models.base_model.base_model import BaseModel
 
+LOAN_PERIOD_DAYS = int(getenv("LOAN_PERIOD_DAYS") or 14)
+
 
 class Book(BaseModel):
     """
@@ -22,6 +26,10 @@ class Book(BaseModel):
                           Количество доступных копий книги.
         readers (list[Reader]):
                               Список читателей, связанных с книгой.
+        reader_books (list[ReaderBook]):
+                              История выдач; не загружается,
+                              строки удаляет ON DELETE CASCADE базы.
+        deleted_at (datetime | None): Время мягкого удаления.
     """
 
     __tablename__ = "books"
@@ -31,27 +39,62 @@ class Book(BaseModel):
     publication_year: Mapped[int | None] = mapped_column(
         Integer, nullable=True
     )
-    isbn: Mapped[str | None] = mapped_column(
-        String(20), unique=True, nullable=True
-    )
+    isbn: Mapped[str | None] = mapped_column(String(20), nullable=True)
     copies_count: Mapped[int] = mapped_column(
         Integer, server_default=text("1"), nullable=False
     )
     description: Mapped[str | None] = mapped_column(
         String(500), nullable=True
     )
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
 
     __table_args__ = (
         CheckConstraint(
             'copies_count >= 0', name='check_copies_non_negative'
         ),
+        Index(
+            "uq_books_isbn_live",
+            "isbn",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_books_deleted",
+            "deleted_at", "id",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        Index(
+            "ix_books_title_id",
+            "title", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_books_author_title_id",
+            "author", "title", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_books_year_id",
+            "publication_year", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_books_available_id",
+            "id",
+            postgresql_where=text(
+                "deleted_at IS NULL AND copies_count > 0"
+            ),
+        ),
     )
 
     reader_books = relationship(
         "ReaderBook",
         back_populates="book",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     readers = relationship(
         "Reader",
@@ -79,23 +122,42 @@ class Reader(BaseModel):
 
     Attributes:
         name (str): Имя читателя.
-        email (str): Уникальный email адрес читателя.
+        email (str): Email читателя, уникален без учёта регистра.
         note (str | None): Дополнительная заметка о читателе.
         books (list[Book]): Список книг, связанных с читателем.
+        reader_books (list[ReaderBook]): История выдач; не загружается,
+                              строки удаляет ON DELETE CASCADE базы.
+        deleted_at (datetime | None): Время мягкого удаления.
     """
 
     __tablename__ = "readers"
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    email: Mapped[str] = mapped_column(
-        String(255), unique=True, nullable=False
-    )
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     note: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        Index(
+            "uq_readers_email_lower_live",
+            text("lower(email)"),
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_readers_deleted",
+            "deleted_at", "id",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     reader_books = relationship(
         "ReaderBook",
         back_populates="reader",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     books = relationship(
         "Book",
@@ -120,12 +182,42 @@ class ReaderBook(BaseModel):
     Модель промежуточной таблицы.
 
     Связь многие-ко-многим между читателями и книгами.
+    В рабочей базе таблица секционирована по borrow_date (RANGE)
+    миграцией, первичный ключ там (id, borrow_date);
+    id остаётся уникальным за счёт общей последовательности.
     Attributes:
         reader_id (int): Внешний ключ на таблицу читателей.
         book_id (int): Внешний ключ на таблицу книг.
+        due_date (datetime): Срок возврата книги,
+                             по умолчанию через LOAN_PERIOD_DAYS.
     """
 
     __tablename__ = "readers_books"
+    __table_args__ = (
+        Index(
+            "ix_readers_books_reader_history",
+            "reader_id", "borrow_date", "id",
+        ),
+        Index(
+            "ix_readers_books_book_history",
+            "book_id", "borrow_date", "id",
+        ),
+        Index(
+            "ix_readers_books_active_reader",
+            "reader_id",
+            postgresql_where=text("return_date IS NULL"),
+        ),
+        Index(
+            "ix_readers_books_active_book",
+            "book_id",
+            postgresql_where=text("return_date IS NULL"),
+        ),
+        Index(
+            "ix_readers_books_open_due",
+            "due_date", "id",
+            postgresql_where=text("return_date IS NULL"),
+        ),
+    )
     reader_id: Mapped[int] = mapped_column(
         ForeignKey("readers.id", ondelete="CASCADE"),
         nullable=False
@@ -143,6 +235,11 @@ class ReaderBook(BaseModel):
         TIMESTAMP(timezone=True),
         nullable=True
     )
+    due_date: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now() + timedelta(days=LOAN_PERIOD_DAYS)
+    )
 
     reader = relationship(
         "Reader",
@@ -154,3 +251,119 @@ class ReaderBook(BaseModel):
         back_populates="reader_books",
         lazy="selectin"
     )
+
+
+HOLD_WAITING = "waiting"
+HOLD_READY = "ready"
+HOLD_FULFILLED = "fulfilled"
+HOLD_EXPIRED = "expired"
+
+
+class Hold(BaseModel):
+    """
+    Модель резерва (очереди) читателя на книгу без свободных копий.
+
+    Резерв ждёт в статусе waiting, при возврате экземпляра
+    старейший резерв переходит в ready и копия закрепляется
+    за читателем; выдача по нему переводит резерв в fulfilled.
+    Невостребованный за HOLD_READY_DAYS резерв становится expired,
+    а копия переходит следующему в очереди.
+    Attributes:
+        reader_id (int): Внешний ключ на таблицу читателей.
+        book_id (int): Внешний ключ на таблицу книг.
+        status (str): waiting, ready, fulfilled или expired.
+        created_at (datetime): Время постановки в очередь.
+        ready_at (datetime | None): Время закрепления копии.
+    """
+
+    __tablename__ = "holds"
+    reader_id: Mapped[int] = mapped_column(
+        ForeignKey("readers.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, server_default=text(f"'{HOLD_WAITING}'")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+    ready_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            f"status IN ('{HOLD_WAITING}', '{HOLD_READY}',"
+            f" '{HOLD_FULFILLED}', '{HOLD_EXPIRED}')",
+            name="check_hold_status",
+        ),
+        Index(
+            "ix_holds_queue",
+            "book_id", "created_at", "id",
+            postgresql_where=text(f"status = '{HOLD_WAITING}'"),
+        ),
+        Index(
+            "ix_holds_ready_at",
+            "ready_at", "id",
+            postgresql_where=text(f"status = '{HOLD_READY}'"),
+        ),
+        Index(
+            "uq_holds_active_reader_book",
+            "reader_id", "book_id",
+            unique=True,
+            postgresql_where=text(
+                f"status IN ('{HOLD_WAITING}', '{HOLD_READY}')"
+            ),
+        ),
+    )
+
+    def __repr__(self):
+        """
+        Возвращает строковое представление резерва.
+
+        :return:
+           str: Строка в формате <Hold(id=ID, book_id=ID, status=STATUS)>
+        """
+        return (f"<Hold(id={self.id},"
+                f" book_id={self.book_id},"
+                f" status={self.status})>")
+
+
+SOFT_DELETE_MODELS = (Book, Reader)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def exclude_soft_deleted(state: ORMExecuteState) -> None:
+    """
+    Скрывает мягко удалённые книги и читателей из ORM-выборок.
+
+    Условие deleted_at IS NULL добавляется ко всем запросам
+    верхнего уровня, включая session.get и подсчёт строк.
+    Догрузка связей не фильтруется: история выдач продолжает
+    показывать удалённую книгу или читателя до очистки.
+    Опция выполнения include_deleted=True отключает фильтр;
+    готовые запросы из lookups задают условие сами и помечены ею,
+    чтобы не перестраиваться на каждом выполнении.
+    """
+    if (
+        not state.is_select
+        or state.is_relationship_load
+        or state.execution_options.get("include_deleted", False)
+    ):
+        return
+    state.statement = state.statement.options(*(
+        with_loader_criteria(
+            model,
+            model.deleted_at.is_(None),
+            include_aliases=True,
+            propagate_to_loaders=False,
+        )
+        for model in SOFT_DELETE_MODELS
+    ))
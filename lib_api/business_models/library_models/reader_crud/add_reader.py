@@ -8,6 +8,8 @@ from lib_api.business_models.decorators.error_decorator import \
 from lib_api.business_models.library_models.models_lib import Reader
 from lib_api.business_models.library_models.reader_crud.reader_by_mail import \
     get_reader_by_email
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_READER, OP_CREATE, change, record_changes)
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 from lib_api.schemas.reader_serialization import ReaderCreate, ReaderResponse
@@ -46,6 +48,8 @@ async def create_reader(
         note=reader_in.note
     )
     db.add(reader)
+    await db.flush()
+    await record_changes(db, change(ENTITY_READER, reader.id, OP_CREATE))
     await db.commit()
     await db.refresh(reader)
     return ReaderResponse.model_validate(reader)
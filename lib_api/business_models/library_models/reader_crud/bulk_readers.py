@@ -0,0 +1,142 @@
+"""Пакетная регистрация читателей."""
+
+from math import ceil
+from os import getenv
+from typing import Any, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.decorators.error_decorator import \
+    handle_db_exceptions
+from lib_api.business_models.library_models.models_lib import Reader
+from lib_api.business_models.library_models.unit_of_work import \
+    set_statement_budget
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_READER, OP_CREATE, change, record_changes)
+from lib_api.logs import logger
+from lib_api.schemas.bulk_serialization import (BulkReadersResponse,
+                                                BulkRowResult, InvalidRow)
+from lib_api.schemas.reader_serialization import ReaderCreate
+
+READERS_BULK_CHUNK_SIZE = int(getenv("READERS_BULK_CHUNK_SIZE") or 500)
+
+
+def _validation_message(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc'])) or 'row'}: {item['msg']}"
+        for item in err.errors()
+    )
+
+
+def _validate_rows(
+        rows: list[Any],
+        results: list[Optional[BulkRowResult]],
+) -> list[tuple[int, ReaderCreate]]:
+    """
+    Проверяет строки ReaderCreate и отсеивает повторы email в пакете.
+
+    Итог отклонённых строк записывается в results.
+    :return: Пары (номер строки, читатель) для вставки.
+    """
+    pending = []
+    seen = set()
+    for index, raw in enumerate(rows):
+        if isinstance(raw, InvalidRow):
+            results[index] = BulkRowResult(
+                row=index, status="invalid", error=raw.error
+            )
+            continue
+        try:
+            reader_in = ReaderCreate.model_validate(raw)
+        except ValidationError as err:
+            email = raw.get("email") if isinstance(raw, dict) else None
+            results[index] = BulkRowResult(
+                row=index, status="invalid",
+                email=email if isinstance(email, str) else None,
+                error=_validation_message(err),
+            )
+            continue
+        email = str(reader_in.email)
+        if email in seen:
+            results[index] = BulkRowResult(
+                row=index, status="duplicate", email=email
+            )
+            continue
+        seen.add(email)
+        pending.append((index, reader_in))
+    return pending
+
+
+@handle_db_exceptions
+async def create_readers_bulk(
+        rows: list[Any], db: AsyncSession
+) -> BulkReadersResponse:
+    """
+    Регистрирует пакет читателей.
+
+    Строки проверяются ReaderCreate, повторы email внутри пакета
+    отмечаются duplicate. Остальные вставляются пачками
+    по READERS_BULK_CHUNK_SIZE одним INSERT ... ON CONFLICT
+    DO NOTHING RETURNING по индексу lower(email): уже
+    зарегистрированные email в любом регистре не вставляются
+    и определяются без отдельной проверки. Каждая пачка фиксируется
+    вместе с событиями журнала изменений, поэтому на пачку
+    приходится два SQL-выражения и один commit.
+    :return:
+        BulkReadersResponse: Сводка и итог по каждой строке.
+    """
+    results: list[Optional[BulkRowResult]] = [None] * len(rows)
+    pending = _validate_rows(rows, results)
+    set_statement_budget(
+        db, 2 * ceil(len(pending) / READERS_BULK_CHUNK_SIZE) + 1
+    )
+
+    for start in range(0, len(pending), READERS_BULK_CHUNK_SIZE):
+        chunk = pending[start:start + READERS_BULK_CHUNK_SIZE]
+        result = await db.execute(
+            insert(Reader)
+            .values([
+                {
+                    "name": reader_in.name,
+                    "email": str(reader_in.email),
+                    "note": reader_in.note,
+                }
+                for _, reader_in in chunk
+            ])
+            .on_conflict_do_nothing(
+                index_elements=[func.lower(Reader.email)],
+                index_where=Reader.deleted_at.is_(None),
+            )
+            .returning(Reader.id, Reader.email)
+        )
+        created = {email: reader_id for reader_id, email in result.all()}
+        if created:
+            await record_changes(db, *(
+                change(ENTITY_READER, reader_id, OP_CREATE)
+                for reader_id in created.values()
+            ))
+        await db.commit()
+        for index, reader_in in chunk:
+            email = str(reader_in.email)
+            reader_id = created.get(email)
+            results[index] = BulkRowResult(
+                row=index,
+                status="created" if reader_id else "duplicate",
+                email=email,
+                id=reader_id,
+            )
+
+    response = BulkReadersResponse(
+        created=sum(r.status == "created" for r in results),
+        duplicates=sum(r.status == "duplicate" for r in results),
+        invalid=sum(r.status == "invalid" for r in results),
+        rows=results,
+    )
+    logger.info(
+        f"Bulk readers: {response.created} created,"
+        f" {response.duplicates} duplicates, {response.invalid} invalid"
+    )
+    return response
@@ -1,14 +1,17 @@
 """Удаление читателя."""
 
 from fastapi import status
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lib_api.business_models.decorators.error_decorator import \
     handle_db_exceptions
-from lib_api.business_models.library_models.models_lib import ReaderBook
+from lib_api.business_models.library_models.models_lib import (Reader,
+                                                               ReaderBook)
 from lib_api.business_models.library_models.reader_crud.reader_by_id import \
-    get_reader_by_id
+    ensure_reader_exists
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_READER, OP_DELETE, change, record_changes)
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 
@@ -16,14 +19,16 @@ from lib_api.logs import logger
 @handle_db_exceptions
 async def delete_reader(reader_id: int, db: AsyncSession) -> None:
     """
-    Удаляет читателя без активных задач из базы данных.
+    Мягко удаляет читателя без активных заимствований.
 
     Проверяет наличие активных заимствований у читателя.
     На активные заимствования вызывает обработчик ошибки с кодом 400.
+    Проставляет deleted_at одним UPDATE без загрузки истории выдач,
+    строки удаляет фоновая очистка.
 
     :return: None
     """
-    reader = await get_reader_by_id(reader_id, db)
+    await ensure_reader_exists(reader_id, db)
     count_stmt = select(func.count()).select_from(ReaderBook).where(
         and_(
             ReaderBook.reader_id == reader_id,
@@ -46,5 +51,10 @@ async def delete_reader(reader_id: int, db: AsyncSession) -> None:
             st_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    await db.delete(reader)
+    await db.execute(
+        update(Reader)
+        .where(Reader.id == reader_id)
+        .values(deleted_at=func.now())
+    )
+    await record_changes(db, change(ENTITY_READER, reader_id, OP_DELETE))
     await db.commit()
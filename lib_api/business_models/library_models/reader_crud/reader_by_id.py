@@ -3,10 +3,11 @@
 from typing import Optional
 
 from fastapi import status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lib_api.business_models.library_models.models_lib import Reader
+from lib_api.business_models.library_models.unit_of_work import \
+    get_unit_of_work
 from lib_api.factories.error_factory import handle_db_error
 from lib_api.logs import logger
 
@@ -17,13 +18,13 @@ async def get_reader_by_id(
     """
     Получает читателя из базы данных по его идентификатору.
 
+    Уже загруженный в сессию объект берётся из identity map,
+    одновременные вызовы объединяются в один запрос.
     Если читатель с ID не найден, вызывает обработчик ошибки.
     :return:
        Optional[Reader] - модель читателя опционально.
     """
-    result = await db.execute(select(Reader)
-                              .where(Reader.id == reader_id))
-    reader = result.scalars().first()
+    reader = await get_unit_of_work(db).get(Reader, reader_id)
 
     if not reader:
         logger.warning(f"Reader with such ID {reader_id} not found")
@@ -35,3 +36,22 @@ async def get_reader_by_id(
             st_code=status.HTTP_404_NOT_FOUND,
         )
     return reader
+
+
+async def ensure_reader_exists(reader_id: int, db: AsyncSession) -> None:
+    """
+    Проверяет существование читателя без загрузки его связей.
+
+    Выбирает только первичный ключ.
+    Если читатель с ID не найден, вызывает обработчик ошибки.
+    :return: None
+    """
+    if not await get_unit_of_work(db).exists(Reader, reader_id):
+        logger.warning(f"Reader with such ID {reader_id} not found")
+        await handle_db_error(
+            db=db,
+            error=ValueError(),
+            er_type="NotFoundReaderID",
+            message="Reader with given ID not found",
+            st_code=status.HTTP_404_NOT_FOUND,
+        )
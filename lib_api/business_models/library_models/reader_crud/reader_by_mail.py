@@ -2,9 +2,10 @@
 
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from lib_api.business_models.library_models.lookups import (READER_BY_EMAIL,
+                                                            lookup_first)
 from lib_api.business_models.library_models.models_lib import Reader
 
 
@@ -17,7 +18,4 @@ async def get_reader_by_email(
     :return:
         Optional[Reader]: Объект читателя, если найден, иначе None.
     """
-    result = await db.execute(select(Reader)
-                              .where(Reader.email == email))
-
-    return result.scalars().first()
+    return await lookup_first(db, READER_BY_EMAIL, email=email)
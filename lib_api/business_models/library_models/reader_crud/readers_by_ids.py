@@ -0,0 +1,28 @@
+"""Читатели по списку ID."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.decorators.error_decorator import \
+    handle_db_exceptions
+from lib_api.business_models.library_models.batch_loader import load_batch
+from lib_api.business_models.library_models.models_lib import Reader
+from lib_api.schemas.batch_serialization import BatchResponse
+from lib_api.schemas.reader_serialization import ReaderResponse
+
+
+@handle_db_exceptions
+async def get_readers_by_ids(
+        ids: list[int], db: AsyncSession
+) -> BatchResponse[ReaderResponse]:
+    """
+    Получает читателей по списку ID одним запросом.
+
+    Порядок читателей совпадает с порядком ID в запросе.
+    :return:
+        BatchResponse[ReaderResponse]: Найденные читатели и ненайденные ID.
+    """
+    readers, missing_ids = await load_batch(db, Reader, ids)
+    return BatchResponse[ReaderResponse](
+        items=[ReaderResponse.model_validate(reader) for reader in readers],
+        missing_ids=missing_ids,
+    )
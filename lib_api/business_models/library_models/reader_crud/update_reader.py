@@ -6,6 +6,8 @@ from lib_api.business_models.decorators.error_decorator import \
     handle_db_exceptions
 from lib_api.business_models.library_models.reader_crud.reader_by_id import \
     get_reader_by_id
+from lib_api.business_models.outbox.change_events import (
+    ENTITY_READER, OP_UPDATE, change, record_changes)
 from lib_api.schemas.reader_serialization import ReaderResponse, ReaderUpdate
 
 
@@ -30,6 +32,7 @@ async def update_reader_data(
         setattr(reader, field, value)
 
     db.add(reader)
+    await record_changes(db, change(ENTITY_READER, reader.id, OP_UPDATE))
     await db.commit()
     await db.refresh(reader)
     return ReaderResponse.model_validate(reader)
@@ -0,0 +1,161 @@
+"""Единица работы запроса поверх сессии."""
+
+from contextlib import contextmanager
+from os import getenv
+from typing import Any, Iterator, Optional, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.orm.util import identity_key
+
+from lib_api.business_models.base_model.base_model import BaseModel
+from lib_api.business_models.library_models.batch_loader import \
+    get_batch_loader
+from lib_api.business_models.library_models.lookups import (BOOK_ID_EXISTS,
+                                                            READER_ID_EXISTS,
+                                                            lookup_first)
+from lib_api.business_models.library_models.models_lib import Book, Reader
+from lib_api.logs import logger
+
+REQUEST_STATEMENT_BUDGET = int(getenv("REQUEST_STATEMENT_BUDGET") or 20)
+
+EXISTS_STATEMENTS = {
+    Book: (BOOK_ID_EXISTS, "book_id"),
+    Reader: (READER_ID_EXISTS, "reader_id"),
+}
+
+
+class StatementBudgetExceeded(RuntimeError):
+    """Запрос выполнил больше SQL-выражений, чем разрешено бюджетом."""
+
+
+@event.listens_for(Session, "do_orm_execute")
+def count_orm_statement(state: ORMExecuteState) -> None:
+    """
+    Считает ORM-выражения сессии, включая догрузку связей.
+
+    Сессия живёт один запрос, поэтому счётчик — число выражений
+    запроса. Бюджет по умолчанию REQUEST_STATEMENT_BUDGET,
+    0 отключает проверку. При превышении бюджета пишет
+    предупреждение, в строгом режиме бросает StatementBudgetExceeded.
+    """
+    info = state.session.info
+    info["statements"] = info.get("statements", 0) + 1
+    budget = info.get("statement_budget", REQUEST_STATEMENT_BUDGET)
+    if not budget or info["statements"] <= budget:
+        return
+    message = (
+        f"Statement budget {budget} exceeded: "
+        f"{info['statements']} statements in one request"
+    )
+    if info.get("statement_budget_strict"):
+        raise StatementBudgetExceeded(message)
+    if info["statements"] == budget + 1:
+        logger.warning(message)
+
+
+def set_statement_budget(
+        db: AsyncSession,
+        budget: Optional[int] = REQUEST_STATEMENT_BUDGET,
+        strict: bool = False,
+) -> None:
+    """
+    Задаёт бюджет SQL-выражений сессии запроса и сбрасывает счётчик.
+
+    :return: None
+    """
+    db.info["statements"] = 0
+    db.info["statement_budget"] = budget
+    db.info["statement_budget_strict"] = strict
+
+
+@contextmanager
+def statement_budget(db: AsyncSession, budget: int) -> Iterator[None]:
+    """
+    Строгий бюджет выражений на время блока.
+
+    Используется в тестах, чтобы ловить лишние запросы.
+    :return: Контекстный менеджер.
+    """
+    previous = {
+        key: db.info.get(key)
+        for key in ("statements", "statement_budget",
+                    "statement_budget_strict")
+    }
+    set_statement_budget(db, budget, strict=True)
+    try:
+        yield
+    finally:
+        db.info.update(previous)
+
+
+def statements_executed(db: AsyncSession) -> int:
+    """
+    Число ORM-выражений, выполненных сессией с последнего сброса.
+
+    :return: int
+    """
+    return db.info.get("statements", 0)
+
+
+class UnitOfWork:
+    """
+    Репозиторий запроса поверх одной сессии.
+
+    Сначала ищет объект в identity map сессии и обращается
+    к базе, только если его там нет, он устарел или мягко удалён.
+    Одновременные загрузки одной модели объединяются BatchLoader.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    def _cached(self, model: Type[BaseModel], key: int) -> Optional[Any]:
+        obj = self.db.identity_map.get(identity_key(model, key))
+        if obj is None:
+            return None
+        state = inspect(obj)
+        if state.expired or "deleted_at" in state.unloaded:
+            return None
+        if state.dict.get("deleted_at") is not None:
+            return None
+        return obj
+
+    async def get(self, model: Type[BaseModel], key: int) -> Optional[Any]:
+        """
+        Возвращает объект по ID.
+
+        :return: Объект модели или None.
+        """
+        obj = self._cached(model, key)
+        if obj is not None:
+            return obj
+        return await get_batch_loader(self.db, model).load(key)
+
+    async def exists(self, model: Type[BaseModel], key: int) -> bool:
+        """
+        Проверяет существование записи по ID.
+
+        Загруженный в сессию объект не запрашивается повторно,
+        иначе выбирается только первичный ключ.
+        :return: bool
+        """
+        if self._cached(model, key) is not None:
+            return True
+        stmt, param = EXISTS_STATEMENTS[model]
+        return await lookup_first(self.db, stmt, **{param: key}) is not None
+
+
+def get_unit_of_work(db: AsyncSession) -> UnitOfWork:
+    """
+    Единица работы, привязанная к сессии запроса.
+
+    Хранится в session.info, поэтому вложенные вызовы сервисов
+    одного запроса работают с одним и тем же объектом.
+    :return: UnitOfWork
+    """
+    uow = db.info.get("unit_of_work")
+    if uow is None:
+        uow = db.info["unit_of_work"] = UnitOfWork(db)
+    return uow
@@ -0,0 +1 @@
+"""Инициализация журнала изменений (outbox)."""
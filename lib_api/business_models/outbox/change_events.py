@@ -0,0 +1,119 @@
+"""Запись и чтение журнала изменений."""
+
+import asyncio
+import json
+import time
+from os import getenv
+from typing import Any
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.decorators.error_decorator import \
+    handle_db_exceptions
+from lib_api.business_models.outbox.outbox_models import ChangeEvent
+from lib_api.schemas.change_serialization import (ChangeEventResponse,
+                                                  ChangesResponse)
+
+ENTITY_BOOK = "book"
+ENTITY_READER = "reader"
+ENTITY_LOAN = "loan"
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+CHANGES_MAX_WAIT_SECONDS = float(getenv("CHANGES_MAX_WAIT_SECONDS") or 30)
+CHANGES_POLL_SECONDS = float(getenv("CHANGES_POLL_SECONDS") or 0.5)
+
+# Транзакционная блокировка держится до COMMIT, поэтому транзакции
+# получают номера seq в порядке фиксации и потребитель, читающий
+# seq > since, не пропустит событие, зафиксированное позже.
+RECORD_CHANGES = text(
+    """
+    INSERT INTO change_events (entity, entity_id, op, payload)
+    SELECT e.entity, e.entity_id, e.op, e.payload
+      FROM (SELECT pg_advisory_xact_lock(hashtext('change_events'))) AS l,
+           jsonb_to_recordset(CAST(:events AS jsonb))
+           AS e(entity text, entity_id int, op text, payload jsonb)
+    """
+)
+
+
+def change(
+        entity: str, entity_id: int, op: str, **payload: Any
+) -> dict:
+    """
+    Описание события для record_changes.
+
+    :return: dict: Сущность, ID, операция и краткие данные.
+    """
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "op": op,
+        "payload": payload or None,
+    }
+
+
+async def record_changes(db: AsyncSession, *events: dict) -> None:
+    """
+    Добавляет события в журнал в текущей транзакции.
+
+    Вызывается последним перед commit: до фиксации запись
+    журнала сериализуется блокировкой.
+    Транзакцию не фиксирует.
+    :return: None
+    """
+    await db.execute(
+        RECORD_CHANGES, {"events": json.dumps(events, default=str)}
+    )
+
+
+async def fetch_changes(
+        db: AsyncSession, since: int, limit: int
+) -> list[ChangeEvent]:
+    """
+    События с номером больше since в порядке записи.
+
+    :return: list[ChangeEvent]
+    """
+    result = await db.execute(
+        select(ChangeEvent)
+        .where(ChangeEvent.seq > since)
+        .order_by(ChangeEvent.seq)
+        .limit(limit)
+    )
+    return list(result.scalars())
+
+
+@handle_db_exceptions
+async def wait_for_changes(
+        since: int,
+        limit: int,
+        db: AsyncSession,
+        wait: float = 0,
+) -> ChangesResponse:
+    """
+    Возвращает события после since, при необходимости ожидая их.
+
+    Long-polling: если событий нет, база опрашивается
+    раз в CHANGES_POLL_SECONDS, пока не истечёт wait.
+    Между опросами транзакция закрывается, и соединение
+    возвращается в пул.
+    :return:
+        ChangesResponse: События и курсор next_since.
+    """
+    deadline = time.monotonic() + min(wait, CHANGES_MAX_WAIT_SECONDS)
+    while True:
+        events = [
+            ChangeEventResponse.model_validate(event)
+            for event in await fetch_changes(db, since, limit)
+        ]
+        await db.rollback()
+        remaining = deadline - time.monotonic()
+        if events or remaining <= 0:
+            break
+        await asyncio.sleep(min(CHANGES_POLL_SECONDS, remaining))
+    return ChangesResponse(
+        events=events, next_since=events[-1].seq if events else since
+    )
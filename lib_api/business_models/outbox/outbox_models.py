@@ -0,0 +1,50 @@
+"""Модель журнала изменений."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP, BigInteger, Identity, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from lib_api.business_models.base_model.base_model import Base
+
+
+class ChangeEvent(Base):
+    """
+    Событие изменения книги, читателя или выдачи.
+
+    Пишется в той же транзакции, что и само изменение.
+
+    Attributes:
+        seq (int): Возрастающий номер события, курсор потребителей.
+        entity (str): Сущность: book, reader или loan.
+        entity_id (int): ID изменённой записи.
+        op (str): Операция: create, update или delete.
+        payload (dict): Краткие данные изменения или None.
+        created_at (datetime): Время записи события.
+    """
+
+    __tablename__ = "change_events"
+
+    seq: Mapped[int] = mapped_column(
+        BigInteger, Identity(), primary_key=True
+    )
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)
+    payload: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=text("clock_timestamp()"),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        """
+        Возвращает строковое представление события.
+
+        :return: Строка в формате <ChangeEvent(seq=N, entity=E, op=OP)>
+        """
+        return (f"<ChangeEvent(seq={self.seq}, entity={self.entity},"
+                f" entity_id={self.entity_id}, op={self.op})>")
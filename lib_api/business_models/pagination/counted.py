@@ -0,0 +1,160 @@
+"""Постраничный вывод с настраиваемым подсчётом total."""
+
+import time
+from os import getenv
+from typing import Optional, get_args
+
+from fastapi_pagination import Params
+from pydantic import BaseModel
+from sqlalchemy import Select, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from lib_api.logs import logger
+from lib_api.schemas.page_serialization import CountedPage, CountStrategy
+
+COUNT_CACHE_SECONDS = float(getenv("COUNT_CACHE_SECONDS") or 30)
+APPROXIMATE_MIN_ROWS = int(getenv("COUNT_APPROXIMATE_MIN_ROWS") or 10000)
+
+
+def count_strategy_from_env(name: str, default: CountStrategy) -> str:
+    """
+    Читает стратегию подсчёта эндпоинта из переменной окружения.
+
+    Неизвестное значение заменяется на default.
+    :return: str: exact, cached или approximate.
+    """
+    value = (getenv(name) or default).lower()
+    if value not in get_args(CountStrategy):
+        logger.warning(f"Unknown {name}={value!r}, using {default}")
+        return default
+    return value
+
+
+BOOKS_COUNT_STRATEGY = count_strategy_from_env(
+    "BOOKS_COUNT_STRATEGY", "cached"
+)
+READERS_COUNT_STRATEGY = count_strategy_from_env(
+    "READERS_COUNT_STRATEGY", "cached"
+)
+
+
+class CountCache:
+    """
+    Кэш числа строк таблиц в памяти процесса.
+
+    Запись сбрасывается по истечении ttl или при вставке/удалении
+    строк таблицы в этом процессе; изменения из других воркеров
+    видны не позже, чем через ttl.
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_SECONDS):
+        self.ttl = ttl
+        self._totals: dict[str, tuple[int, float]] = {}
+
+    def get(self, table: str) -> Optional[int]:
+        """
+        Возвращает число строк из кэша.
+
+        :return: Optional[int]: None, если записи нет или она устарела.
+        """
+        cached = self._totals.get(table)
+        if cached is None or cached[1] <= time.monotonic():
+            return None
+        return cached[0]
+
+    def set(self, table: str, total: int) -> None:
+        """Сохраняет число строк таблицы на ttl секунд."""
+        self._totals[table] = (total, time.monotonic() + self.ttl)
+
+    def invalidate(self, *tables: str) -> None:
+        """Сбрасывает записи таблиц."""
+        for table in tables:
+            self._totals.pop(table, None)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        self._totals.clear()
+
+
+count_cache = CountCache()
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_counts_on_flush(session: Session, _flush_context) -> None:
+    """Сбрасывает кэш таблиц, в которых появились или удалены строки."""
+    tables = {
+        obj.__table__.name
+        for obj in (*session.new, *session.deleted)
+        if hasattr(obj, "__table__")
+    }
+    if tables:
+        count_cache.invalidate(*tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def invalidate_counts_on_bulk(state: ORMExecuteState) -> None:
+    """Сбрасывает кэш таблицы при INSERT, UPDATE или DELETE через ORM."""
+    bulk = state.is_insert or state.is_update or state.is_delete
+    if bulk and state.bind_mapper is not None:
+        count_cache.invalidate(state.bind_mapper.local_table.name)
+
+
+async def count_rows(
+        db: AsyncSession, model: type, strategy: CountStrategy
+) -> int:
+    """
+    Считает строки таблицы выбранной стратегией.
+
+    approximate берёт pg_class.reltuples и переходит на точный
+    подсчёт, если таблица не анализировалась или меньше
+    APPROXIMATE_MIN_ROWS строк, — там count(*) дешёвый.
+    :return: int: Число строк таблицы.
+    """
+    table = model.__tablename__
+    if strategy == "approximate":
+        estimate = await db.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        )
+        if estimate is not None and estimate >= APPROXIMATE_MIN_ROWS:
+            return estimate
+    elif strategy == "cached":
+        total = count_cache.get(table)
+        if total is not None:
+            return total
+    total = await db.scalar(select(func.count()).select_from(model))
+    if strategy == "cached":
+        count_cache.set(table, total)
+    return total
+
+
+async def paginate_counted(
+        db: AsyncSession,
+        query: Select,
+        params: Params,
+        schema: type[BaseModel],
+        model: type,
+        strategy: CountStrategy = "exact",
+) -> CountedPage:
+    """
+    Возвращает страницу offset-пагинации с total по стратегии.
+
+    Подсчёт ведётся по всей таблице, поэтому подходит для
+    списков без фильтров.
+    :return: CountedPage: Страница со стратегией подсчёта total.
+    """
+    total = await count_rows(db, model, strategy)
+    raw = params.to_raw_params()
+    rows = (await db.scalars(
+        query.limit(raw.limit).offset(raw.offset)
+    )).all()
+    return CountedPage.create(
+        [schema.model_validate(row) for row in rows],
+        params,
+        total=total,
+        count_strategy=strategy,
+    )
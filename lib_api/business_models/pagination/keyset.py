@@ -0,0 +1,109 @@
+"""Курсорная (keyset) пагинация."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import status
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from lib_api.factories.error_factory import handle_db_error
+from lib_api.logs import logger
+from lib_api.schemas.keyset_serialization import KeysetPage, KeysetParams
+
+KeysetKey = tuple[InstrumentedAttribute, Callable[[Any], Any]]
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Кодирует значения ключей последней записи в непрозрачный курсор.
+
+    :return: str: Строка base64 без завершающих "=".
+    """
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+        cursor: str, converters: Sequence[Callable[[Any], Any]]
+) -> list:
+    """
+    Декодирует курсор и приводит значения к типам ключей.
+
+    :raise ValueError: Если курсор повреждён или не совпадает с ключами.
+    :return: list: Значения ключей в порядке сортировки.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as err:
+        raise ValueError("Invalid cursor") from err
+    if not isinstance(values, list) or len(values) != len(converters):
+        raise ValueError("Invalid cursor")
+    return [convert(value) for convert, value in zip(converters, values)]
+
+
+async def keyset_paginate(
+        db: AsyncSession,
+        stmt: Select,
+        keys: Sequence[KeysetKey],
+        params: KeysetParams,
+        schema: type[BaseModel],
+        descending: bool = True,
+) -> KeysetPage:
+    """
+    Возвращает страницу ORM-объектов по курсору без OFFSET.
+
+    Условие строится сравнением кортежей (key1, key2) < (:v1, :v2),
+    поэтому составной индекс по тем же колонкам читает ровно
+    одну страницу независимо от её глубины.
+    Последний ключ должен быть уникальным (обычно id).
+    :return:
+        KeysetPage: Записи страницы, сериализованные schema,
+        и курсор следующей.
+    """
+    columns = [column for column, _ in keys]
+    if params.cursor:
+        try:
+            values = decode_cursor(
+                params.cursor, [convert for _, convert in keys]
+            )
+        except (ValueError, TypeError) as err:
+            logger.warning(f"Invalid keyset cursor {params.cursor}")
+            await handle_db_error(
+                db=db,
+                error=err,
+                er_type="InvalidCursor",
+                message="Invalid pagination cursor",
+                st_code=status.HTTP_400_BAD_REQUEST,
+            )
+        bound = tuple_(*columns)
+        stmt = stmt.where(
+            bound < tuple_(*values) if descending else bound > tuple_(*values)
+        )
+
+    order = [col.desc() if descending else col.asc() for col in columns]
+    stmt = stmt.order_by(*order).limit(params.size + 1)
+    result = await db.execute(stmt)
+    items = list(result.scalars().all())
+
+    next_cursor: Optional[str] = None
+    if len(items) > params.size:
+        items = items[:params.size]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            *(getattr(last, column.key) for column in columns)
+        )
+    return KeysetPage[schema](
+        items=[schema.model_validate(item) for item in items],
+        size=params.size,
+        next_cursor=next_cursor,
+    )
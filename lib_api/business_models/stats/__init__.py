@@ -0,0 +1 @@
+"""Инициализация статистики для панелей библиотекарей."""
@@ -0,0 +1,72 @@
+"""Чтение предрасчитанной статистики."""
+
+from fastapi_pagination import Page, Params
+from fastapi_pagination.ext.sqlalchemy import apaginate
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lib_api.business_models.decorators.error_decorator import \
+    handle_db_exceptions
+from lib_api.business_models.stats.stats_views import (catalogue_availability,
+                                                       reader_active_loans,
+                                                       weekly_top_books)
+from lib_api.schemas.stats_serialization import (CatalogueStatsResponse,
+                                                 ReaderLoansResponse,
+                                                 TopBookResponse,
+                                                 TopBooksResponse)
+
+
+@handle_db_exceptions
+async def get_catalogue_stats(db: AsyncSession) -> CatalogueStatsResponse:
+    """
+    Возвращает сводку по каталогу из mv_catalogue_availability.
+
+    :return:
+        CatalogueStatsResponse: Число книг, книг без экземпляров,
+        доступных экземпляров и активных выдач.
+    """
+    row = (await db.execute(select(catalogue_availability))).first()
+    if row is None:
+        return CatalogueStatsResponse(
+            total_titles=0, zero_copy_titles=0,
+            available_copies=0, active_loans=0,
+        )
+    return CatalogueStatsResponse.model_validate(row)
+
+
+@handle_db_exceptions
+async def get_weekly_top_books(
+        limit: int, db: AsyncSession
+) -> TopBooksResponse:
+    """
+    Возвращает самые выдаваемые книги за 7 дней.
+
+    :return:
+        TopBooksResponse: Книги по убыванию числа выдач.
+    """
+    rows = (await db.execute(
+        select(weekly_top_books)
+        .order_by(desc(weekly_top_books.c.loans_count),
+                  weekly_top_books.c.book_id)
+        .limit(limit)
+    )).all()
+    return TopBooksResponse(
+        books=[TopBookResponse.model_validate(row) for row in rows],
+        refreshed_at=rows[0].refreshed_at if rows else None,
+    )
+
+
+async def get_reader_loans_stats(
+        params: Params, db: AsyncSession
+) -> Page[ReaderLoansResponse]:
+    """
+    Возвращает читателей с активными выдачами, больше всего — первыми.
+
+    :return:
+        Page[ReaderLoansResponse]: Страница читателей.
+    """
+    query = select(reader_active_loans).order_by(
+        desc(reader_active_loans.c.active_loans),
+        reader_active_loans.c.reader_id,
+    )
+    return await apaginate(db, query, params)
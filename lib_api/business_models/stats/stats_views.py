@@ -0,0 +1,124 @@
+"""Материализованные представления статистики каталога и выдач."""
+
+from sqlalchemy import (DDL, TIMESTAMP, Column, Integer, MetaData, String,
+                        Table, event, text)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from lib_api.business_models.base_model.base_model import Base
+
+STATS_VIEWS = {
+    "mv_catalogue_availability": (
+        """
+        SELECT 1 AS id,
+               count(*) AS total_titles,
+               count(*) FILTER (WHERE copies_count = 0) AS zero_copy_titles,
+               coalesce(sum(copies_count), 0) AS available_copies,
+               (SELECT count(*) FROM readers_books
+                 WHERE return_date IS NULL) AS active_loans,
+               now() AS refreshed_at
+          FROM books
+         WHERE deleted_at IS NULL
+        """,
+        "id",
+    ),
+    "mv_weekly_top_books": (
+        """
+        SELECT b.id AS book_id, b.title, b.author,
+               count(*) AS loans_count,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN books b ON b.id = rb.book_id
+         WHERE rb.borrow_date >= now() - interval '7 days'
+           AND b.deleted_at IS NULL
+         GROUP BY b.id, b.title, b.author
+        """,
+        "book_id",
+    ),
+    "mv_reader_active_loans": (
+        """
+        SELECT r.id AS reader_id, r.name,
+               count(*) AS active_loans,
+               count(*) FILTER (WHERE rb.due_date < now()) AS overdue_loans,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN readers r ON r.id = rb.reader_id
+         WHERE rb.return_date IS NULL
+           AND r.deleted_at IS NULL
+         GROUP BY r.id, r.name
+        """,
+        "reader_id",
+    ),
+}
+
+stats_metadata = MetaData()
+
+catalogue_availability = Table(
+    "mv_catalogue_availability", stats_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("total_titles", Integer),
+    Column("zero_copy_titles", Integer),
+    Column("available_copies", Integer),
+    Column("active_loans", Integer),
+    Column("refreshed_at", TIMESTAMP(timezone=True)),
+)
+
+weekly_top_books = Table(
+    "mv_weekly_top_books", stats_metadata,
+    Column("book_id", Integer, primary_key=True),
+    Column("title", String),
+    Column("author", String),
+    Column("loans_count", Integer),
+    Column("refreshed_at", TIMESTAMP(timezone=True)),
+)
+
+reader_active_loans = Table(
+    "mv_reader_active_loans", stats_metadata,
+    Column("reader_id", Integer, primary_key=True),
+    Column("name", String),
+    Column("active_loans", Integer),
+    Column("overdue_loans", Integer),
+    Column("refreshed_at", TIMESTAMP(timezone=True)),
+)
+
+
+def _create_views_ddl() -> list[DDL]:
+    statements = []
+    for name, (query, key) in STATS_VIEWS.items():
+        statements.append(DDL(
+            f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {query}"
+        ))
+        statements.append(DDL(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{name}_{key}"
+            f" ON {name} ({key})"
+        ))
+    return statements
+
+
+for ddl in _create_views_ddl():
+    event.listen(Base.metadata, "after_create", ddl)
+for view_name in STATS_VIEWS:
+    event.listen(
+        Base.metadata, "before_drop",
+        DDL(f"DROP MATERIALIZED VIEW IF EXISTS {view_name}"),
+    )
+
+
+async def refresh_stats_views(conn: AsyncConnection) -> bool:
+    """
+    Обновляет представления статистики без блокировки чтения.
+
+    REFRESH ... CONCURRENTLY не мешает запросам к представлениям.
+    Транзакционная advisory-блокировка не даёт нескольким
+    воркерам обновлять их одновременно.
+    :return: False, если обновление уже выполняет другой воркер.
+    """
+    locked = await conn.scalar(
+        text("SELECT pg_try_advisory_xact_lock(hashtext('stats_views'))")
+    )
+    if not locked:
+        return False
+    for name in STATS_VIEWS:
+        await conn.execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}")
+        )
+    return True
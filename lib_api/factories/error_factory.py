@@ -1,5 +1,7 @@
 """Фабрика ошибок."""
 
+from typing import NoReturn
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,6 +9,10 @@ from lib_api.logs import logger
 from lib_api.schemas.error_serialization import ErrorResponse
 
 
+class TokenValidationError(Exception):
+    """Токен доступа недействителен, повреждён или истёк."""
+
+
 async def handle_db_error(
     db: AsyncSession,
         error: Exception,
@@ -16,6 +22,18 @@ async def handle_db_error(
 ) -> None:
     """Обрабатывает исключения к запросам."""
     await db.rollback()
+    raise_http_error(
+        error=error, er_type=er_type, message=message, st_code=st_code
+    )
+
+
+def raise_http_error(
+        error: Exception,
+        er_type: str,
+        message: str,
+        st_code: int
+) -> NoReturn:
+    """Формирует HTTP-ошибку там, где нет сессии базы данных."""
     logger.error(f"{er_type}: {error}")
     if isinstance(message, dict):
         message = message.get('error_message', str(message))
@@ -0,0 +1,61 @@
+"""Маршруты проверок здоровья сервиса для оркестратора."""
+
+from fastapi import APIRouter, Depends, Response, status
+
+from lib_api.business_models.coalescing.single_flight import single_flight
+from lib_api.business_models.health.readiness import (ReadinessProbe,
+                                                      get_readiness_probe)
+from lib_api.schemas.health_serialization import (LivenessResponse,
+                                                  ReadinessResponse,
+                                                  SingleFlightResponse)
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/healthz", response_model=LivenessResponse)
+async def liveness() -> LivenessResponse:
+    """
+    Проверяет, что процесс жив.
+
+    Не обращается к базе и другим ресурсам.
+    """
+    return LivenessResponse(status="ok")
+
+
+@router.get(
+    "/readyz",
+    response_model=ReadinessResponse,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {
+        "model": ReadinessResponse}},
+)
+async def readiness(
+    response: Response,
+    probe: ReadinessProbe = Depends(get_readiness_probe),
+) -> ReadinessResponse:
+    """
+    Проверяет готовность сервиса принимать запросы.
+
+    Возвращает 503, если база недоступна или пул исчерпан.
+    """
+    result = await probe.check()
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(
+        status="ok" if result["ready"] else "unavailable",
+        database=result["database"],
+        pool=result["pool"],
+    )
+
+
+@router.get("/metrics/single-flight", response_model=SingleFlightResponse)
+async def single_flight_metrics() -> SingleFlightResponse:
+    """
+    Счётчики объединения одинаковых одновременных чтений.
+
+    ratio — доля вызовов, получивших чужой результат.
+    Не обращается к базе.
+    """
+    return SingleFlightResponse(
+        in_flight=single_flight.in_flight(),
+        groups=single_flight.snapshot(),
+    )
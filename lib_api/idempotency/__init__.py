@@ -0,0 +1 @@
+"""Инициализация идемпотентных повторов запросов."""
@@ -0,0 +1,253 @@
+"""Повтор ответа на запрос с тем же Idempotency-Key."""
+
+import asyncio
+import hashlib
+import json
+from os import getenv
+from typing import Optional
+
+from fastapi import status
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from lib_api.business_models.librarian.security import decode_access_token
+from lib_api.factories.error_factory import TokenValidationError
+from lib_api.idempotency.idempotency_store import (IN_PROGRESS, REPLAY,
+                                                   IdempotencyStore,
+                                                   StoredResponse)
+from lib_api.logs import logger
+from lib_api.schemas.error_serialization import ErrorResponse
+
+IDEMPOTENT_PATHS = frozenset({
+    "/api/librarian/borrow",
+    "/api/librarian/return",
+    "/api/book/create",
+    "/api/reader/create",
+})
+IDEMPOTENCY_HEADER = b"idempotency-key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_BODY_LIMIT = int(getenv("IDEMPOTENCY_BODY_LIMIT") or 64 * 1024)
+NOT_STORED_STATUSES = frozenset({
+    status.HTTP_401_UNAUTHORIZED,
+    status.HTTP_403_FORBIDDEN,
+    status.HTTP_429_TOO_MANY_REQUESTS,
+})
+
+
+def token_subject(headers: dict) -> Optional[str]:
+    """
+    Библиотекарь из проверенного токена Authorization.
+
+    Ключ привязывается к нему, а не к строке токена,
+    поэтому повтор с обновлённым токеном получает тот же ответ.
+    :return: sub токена или None, если токен не передан или недействителен.
+    """
+    scheme, _, token = headers.get(
+        b"authorization", b""
+    ).decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_access_token(token).get("sub")
+    except TokenValidationError:
+        return None
+
+
+class IdempotencyMiddleware:
+    """
+    Отвечает на повтор запроса сохранённым ответом.
+
+    Действует на POST к IDEMPOTENT_PATHS с заголовком
+    Idempotency-Key. Ключ привязан к библиотекарю из токена
+    и пути, поэтому разные библиотекари не видят ответов друг друга.
+    Запрос без действительного токена идёт в обработчик как есть
+    и получает от него 401.
+    Пока обработчик выполняется, блокировка ключа продлевается.
+    Повтор с тем же ключом не выполняет обработчик снова,
+    а получает первый ответ с заголовком Idempotent-Replayed.
+    Одновременные повторы в процессе ждут первый запрос,
+    повтор на другом воркере до его завершения получает 409.
+    Ответы 5xx, 401, 403 и 429 не сохраняются.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            store: IdempotencyStore,
+            paths: frozenset = IDEMPOTENT_PATHS,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if (scope["type"] != "http" or scope["method"] != "POST" or
+                scope["path"] not in self.paths):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        subject = token_subject(headers) if raw_key is not None else None
+        if subject is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            await self._send_error(
+                send, status.HTTP_400_BAD_REQUEST, "InvalidIdempotencyKey",
+                f"Idempotency-Key must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH}"
+                f" characters"
+            )
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            await self._send_error(
+                send, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                "PayloadTooLarge", "Request body is too large"
+            )
+            return
+        key = hashlib.sha256(b"\n".join((
+            subject.encode(), scope["path"].encode(), raw_key,
+        ))).hexdigest()
+        request_hash = hashlib.sha256(body).hexdigest()
+
+        while True:
+            stored = self.store.cached(key)
+            if stored is not None:
+                await self._replay(send, stored, request_hash)
+                return
+            pending = self.store.inflight.get(key)
+            if pending is None:
+                break
+            await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self.store.inflight[key] = future
+        try:
+            await self._execute(scope, body, send, key, request_hash)
+        finally:
+            self.store.inflight.pop(key, None)
+            future.set_result(None)
+
+    async def _execute(self, scope: Scope, body: bytes, send: Send,
+                       key: str, request_hash: str) -> None:
+        try:
+            state, stored = await self.store.begin(key, request_hash)
+        except (OSError, SQLAlchemyError) as err:
+            logger.warning(f"Idempotency store is unavailable: {err}")
+            await self.app(scope, self._replay_body(body), send)
+            return
+        if state == REPLAY:
+            await self._replay(send, stored, request_hash)
+            return
+        if state == IN_PROGRESS:
+            await self._send_error(
+                send, status.HTTP_409_CONFLICT, "IdempotencyKeyInProgress",
+                "A request with this Idempotency-Key is in progress"
+            )
+            return
+
+        response = {"status": 500, "content_type": None, "body": []}
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["content_type"] = dict(
+                    message.get("headers", [])
+                ).get(b"content-type", b"").decode("latin-1") or None
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        keep_alive = asyncio.create_task(self.store.keep_alive(key))
+        try:
+            await self.app(scope, self._replay_body(body), capture)
+        except BaseException:
+            keep_alive.cancel()
+            await self._release(key)
+            raise
+        keep_alive.cancel()
+        if (response["status"] >= 500 or
+                response["status"] in NOT_STORED_STATUSES):
+            await self._release(key)
+            return
+        try:
+            await self.store.complete(key, StoredResponse(
+                request_hash, response["status"],
+                response["content_type"], b"".join(response["body"]),
+            ))
+        except (OSError, SQLAlchemyError) as err:
+            logger.warning(f"Idempotent response is not stored: {err}")
+
+    async def _release(self, key: str) -> None:
+        try:
+            await self.store.release(key)
+        except (OSError, SQLAlchemyError) as err:
+            logger.warning(f"Idempotency key is not released: {err}")
+
+    @staticmethod
+    def _replay_body(body: bytes) -> Receive:
+        replayed = False
+
+        async def receive() -> Message:
+            nonlocal replayed
+            if replayed:
+                return {"type": "http.disconnect"}
+            replayed = True
+            return {"type": "http.request", "body": body,
+                    "more_body": False}
+        return receive
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> Optional[bytes]:
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > IDEMPOTENCY_BODY_LIMIT:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def _replay(self, send: Send, stored: StoredResponse,
+                      request_hash: str) -> None:
+        if stored.request_hash != request_hash:
+            await self._send_error(
+                send, status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "IdempotencyKeyReused",
+                "Idempotency-Key was used with a different request body"
+            )
+            return
+        headers = [
+            (b"content-length", str(len(stored.body)).encode()),
+            (b"idempotent-replayed", b"true"),
+        ]
+        if stored.content_type:
+            headers.append(
+                (b"content-type", stored.content_type.encode("latin-1"))
+            )
+        await send({"type": "http.response.start",
+                    "status": stored.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": stored.body})
+
+    @staticmethod
+    async def _send_error(send: Send, st_code: int, er_type: str,
+                          message: str) -> None:
+        logger.warning(f"{er_type}: {message}")
+        problem = ErrorResponse(
+            result=False, error_type=er_type, error_message=message
+        )
+        body = json.dumps({"detail": problem.model_dump()}).encode()
+        await send({"type": "http.response.start", "status": st_code,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                    ]})
+        await send({"type": "http.response.body", "body": body})
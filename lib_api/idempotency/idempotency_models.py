@@ -0,0 +1,47 @@
+"""Модель сохранённых ответов на запросы с Idempotency-Key."""
+
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from lib_api.business_models.base_model.base_model import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Ключ идемпотентности и ответ на первый запрос с ним.
+
+    Пока запрос выполняется, status_code пуст: строка служит
+    блокировкой ключа для других воркеров.
+
+    Attributes:
+        key (str): SHA-256 от токена, пути и значения заголовка.
+        request_hash (str): SHA-256 тела первого запроса.
+        status_code (int | None): Код сохранённого ответа.
+        content_type (str | None): Тип содержимого ответа.
+        body (bytes | None): Тело ответа.
+        created_at (datetime): Время первого запроса.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    content_type: Mapped[str | None] = mapped_column(
+        String(100), nullable=True
+    )
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self):
+        """
+        Возвращает строковое представление ключа.
+
+        :return: Строка в формате <IdempotencyKey(key=KEY, status=CODE)>
+        """
+        return (f"<IdempotencyKey(key={self.key},"
+                f" status={self.status_code})>")
@@ -0,0 +1,217 @@
+"""Хранилище ответов по ключам идемпотентности."""
+
+import asyncio
+from collections import OrderedDict
+from datetime import timedelta
+from os import getenv
+from typing import NamedTuple, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib_api.database import async_engine
+from lib_api.idempotency.idempotency_models import IdempotencyKey
+from lib_api.logs import logger
+
+IDEMPOTENCY_TTL_SECONDS = int(getenv("IDEMPOTENCY_TTL_SECONDS") or 86400)
+IDEMPOTENCY_LOCK_SECONDS = int(getenv("IDEMPOTENCY_LOCK_SECONDS") or 60)
+IDEMPOTENCY_CACHE_SIZE = int(getenv("IDEMPOTENCY_CACHE_SIZE") or 1000)
+IDEMPOTENCY_CLEANUP_SECONDS = int(
+    getenv("IDEMPOTENCY_CLEANUP_SECONDS") or 3600
+)
+
+OWNER = "owner"
+REPLAY = "replay"
+IN_PROGRESS = "in_progress"
+
+
+class StoredResponse(NamedTuple):
+    """Сохранённый ответ на запрос с ключом идемпотентности."""
+
+    request_hash: str
+    status_code: int
+    content_type: Optional[str]
+    body: bytes
+
+
+class IdempotencyStore:
+    """
+    Ответы по ключам идемпотентности: LRU процесса и таблица.
+
+    Недавние ответы отдаются из памяти без обращения к базе.
+    Таблица idempotency_keys делает ключ общим для воркеров:
+    первый запрос вставляет строку-блокировку и после ответа
+    дописывает в неё ответ. Одновременные повторы в одном
+    процессе ждут future выполняющегося запроса.
+    """
+
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            capacity: int = IDEMPOTENCY_CACHE_SIZE,
+            ttl: int = IDEMPOTENCY_TTL_SECONDS,
+            lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS,
+    ) -> None:
+        self.engine = engine
+        self.capacity = capacity
+        self.ttl = timedelta(seconds=ttl)
+        self.lock = timedelta(seconds=lock_seconds)
+        self.inflight: dict[str, asyncio.Future] = {}
+        self._recent: OrderedDict[str, StoredResponse] = OrderedDict()
+
+    def cached(self, key: str) -> Optional[StoredResponse]:
+        """
+        Ответ из памяти процесса.
+
+        :return: StoredResponse или None.
+        """
+        stored = self._recent.get(key)
+        if stored is not None:
+            self._recent.move_to_end(key)
+        return stored
+
+    def remember(self, key: str, stored: StoredResponse) -> None:
+        """Кладёт ответ в LRU, вытесняя самый старый."""
+        self._recent[key] = stored
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.capacity:
+            self._recent.popitem(last=False)
+
+    async def begin(
+            self, key: str, request_hash: str
+    ) -> tuple[str, Optional[StoredResponse]]:
+        """
+        Захватывает ключ или находит ответ на него.
+
+        Ключ захватывается, если строки нет, срок её хранения
+        истёк или выполнявший запрос воркер не продлевал блокировку
+        дольше IDEMPOTENCY_LOCK_SECONDS.
+        :return: (OWNER, None), (REPLAY, ответ) или (IN_PROGRESS, None).
+        """
+        table = IdempotencyKey.__table__
+        stmt = insert(table).values(key=key, request_hash=request_hash)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "status_code": None,
+                "content_type": None,
+                "body": None,
+                "created_at": func.now(),
+            },
+            where=or_(
+                table.c.created_at < func.now() - self.ttl,
+                and_(
+                    table.c.status_code.is_(None),
+                    table.c.created_at < func.now() - self.lock,
+                ),
+            ),
+        ).returning(table.c.key)
+        async with self.engine.begin() as conn:
+            if (await conn.execute(stmt)).first() is not None:
+                return OWNER, None
+            row = (await conn.execute(
+                select(
+                    table.c.request_hash, table.c.status_code,
+                    table.c.content_type, table.c.body,
+                ).where(table.c.key == key)
+            )).first()
+        if row is None or row.status_code is None:
+            return IN_PROGRESS, None
+        stored = StoredResponse(*row)
+        self.remember(key, stored)
+        return REPLAY, stored
+
+    async def complete(self, key: str, stored: StoredResponse) -> None:
+        """Сохраняет ответ захваченного ключа."""
+        self.remember(key, stored)
+        table = IdempotencyKey.__table__
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                update(table).where(table.c.key == key).values(
+                    status_code=stored.status_code,
+                    content_type=stored.content_type,
+                    body=stored.body,
+                )
+            )
+
+    async def refresh(self, key: str) -> None:
+        """Продлевает блокировку ключа, ответ на который ещё не готов."""
+        table = IdempotencyKey.__table__
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                update(table).where(
+                    table.c.key == key, table.c.status_code.is_(None)
+                ).values(created_at=func.now())
+            )
+
+    async def keep_alive(self, key: str) -> None:
+        """
+        Продлевает блокировку ключа, пока его выполняет обработчик.
+
+        Раз в треть IDEMPOTENCY_LOCK_SECONDS обновляет created_at,
+        поэтому запрос дольше срока блокировки не теряет ключ.
+        Другой воркер перехватывает ключ, только если продления
+        прекратились, то есть владелец упал.
+        :return: None
+        """
+        interval = self.lock.total_seconds() / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh(key)
+            except (OSError, SQLAlchemyError) as err:
+                logger.warning(f"Idempotency key lock is not extended: {err}")
+
+    async def release(self, key: str) -> None:
+        """Снимает блокировку ключа, ответ на который не сохраняется."""
+        table = IdempotencyKey.__table__
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                delete(table).where(
+                    table.c.key == key, table.c.status_code.is_(None)
+                )
+            )
+
+    async def purge_expired(self) -> int:
+        """
+        Удаляет ключи старше срока хранения.
+
+        :return: Число удалённых ключей.
+        """
+        table = IdempotencyKey.__table__
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                delete(table).where(table.c.created_at < func.now() - self.ttl)
+            )
+        return result.rowcount
+
+    def clear(self) -> None:
+        """Очищает память процесса."""
+        self._recent.clear()
+        self.inflight.clear()
+
+
+idempotency_store = IdempotencyStore(async_engine)
+
+
+async def run_idempotency_cleanup(
+        store: IdempotencyStore,
+        interval: float = IDEMPOTENCY_CLEANUP_SECONDS,
+) -> None:
+    """
+    Периодически удаляет ключи с истёкшим сроком хранения.
+
+    Ошибки базы логируются, следующий проход выполняется по расписанию.
+    :return: None
+    """
+    while True:
+        try:
+            purged = await store.purge_expired()
+            if purged:
+                logger.debug(f"Expired idempotency keys purged: {purged}")
+        except (OSError, SQLAlchemyError) as err:
+            logger.error(f"Idempotency keys cleanup failed: {err}")
+        await asyncio.sleep(interval)
@@ -0,0 +1 @@
+"""Инициализация промежуточных обработчиков приложения."""
@@ -0,0 +1,239 @@
+"""Сжатие ответов по Accept-Encoding."""
+
+import asyncio
+import gzip
+import hashlib
+from collections import OrderedDict
+from os import getenv
+from typing import Callable, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(getenv("COMPRESSION_MIN_SIZE") or 1024)
+COMPRESSION_THREAD_MIN_SIZE = int(
+    getenv("COMPRESSION_THREAD_MIN_SIZE") or 256 * 1024
+)
+COMPRESSION_CACHE_SIZE = int(getenv("COMPRESSION_CACHE_SIZE") or 256)
+COMPRESSION_GZIP_LEVEL = int(getenv("COMPRESSION_GZIP_LEVEL") or 6)
+COMPRESSION_BROTLI_QUALITY = int(getenv("COMPRESSION_BROTLI_QUALITY") or 5)
+COMPRESSION_ZSTD_LEVEL = int(getenv("COMPRESSION_ZSTD_LEVEL") or 3)
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+})
+NOT_COMPRESSIBLE_TYPES = frozenset({"text/event-stream"})
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=COMPRESSION_BROTLI_QUALITY)
+
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compress(
+        data
+    )
+
+
+def available_codecs() -> dict[str, Callable[[bytes], bytes]]:
+    """
+    Доступные кодеки в порядке предпочтения сервера.
+
+    brotli и zstd подключаются, если установлены пакеты
+    brotli и zstandard (extra compression), gzip есть всегда.
+    :return: {имя кодирования: функция сжатия}
+    """
+    codecs = {}
+    if brotli is not None:
+        codecs["br"] = _brotli
+    if zstandard is not None:
+        codecs["zstd"] = _zstd
+    codecs["gzip"] = _gzip
+    return codecs
+
+
+def choose_encoding(accept: str, codecs: dict) -> Optional[str]:
+    """
+    Выбирает кодирование по заголовку Accept-Encoding.
+
+    Берётся кодек с наибольшим q, при равенстве — первый
+    в порядке предпочтения сервера; q=0 запрещает кодек,
+    * задаёт q для неперечисленных.
+    :return: Имя кодирования или None, если сжимать не нужно.
+    """
+    weights = {}
+    for part in accept.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    default = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in codecs:
+        q = weights.get(name, default)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressedCache:
+    """
+    LRU уже сжатых тел ответов.
+
+    Ключ — кодирование и BLAKE2b тела: хэш на порядки дешевле
+    сжатия, поэтому горячие страницы (общие ответы single-flight,
+    повторы по Idempotency-Key, неизменные книги) сжимаются
+    один раз, а не на каждый запрос.
+    """
+
+    def __init__(self, capacity: int = COMPRESSION_CACHE_SIZE) -> None:
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        """
+        Сжатое тело по ключу.
+
+        :return: bytes или None.
+        """
+        compressed = self._entries.get(key)
+        if compressed is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return compressed
+
+    def set(self, key: tuple, compressed: bytes) -> None:
+        """Запоминает сжатое тело, вытесняя самое старое."""
+        if self.capacity < 1:
+            return
+        self._entries[key] = compressed
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очищает кэш и счётчики."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+compressed_cache = CompressedCache()
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы br, zstd или gzip по Accept-Encoding.
+
+    Сжимаются только целые (не потоковые) ответы JSON и текста
+    не меньше COMPRESSION_MIN_SIZE байт; text/event-stream
+    и уже сжатые ответы передаются как есть. Тела от
+    COMPRESSION_THREAD_MIN_SIZE байт сжимаются в потоке,
+    не блокируя цикл событий. Результат кэшируется
+    в CompressedCache.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            cache: CompressedCache = compressed_cache,
+            min_size: int = COMPRESSION_MIN_SIZE,
+            thread_min_size: int = COMPRESSION_THREAD_MIN_SIZE,
+    ) -> None:
+        self.app = app
+        self.cache = cache
+        self.min_size = min_size
+        self.thread_min_size = thread_min_size
+        self.codecs = available_codecs()
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = dict(scope["headers"]).get(b"accept-encoding", b"")
+        encoding = choose_encoding(accept.decode("latin-1"), self.codecs)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._compressible(start, headers) or \
+                    message.get("more_body", False):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.min_size:
+                compressed = await self._compress(encoding, body)
+                if len(compressed) < len(body):
+                    body = compressed
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(start: Message, headers: MutableHeaders) -> bool:
+        if start["status"] in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in NOT_COMPRESSIBLE_TYPES:
+            return False
+        return media_type.startswith("text/") or \
+            media_type in COMPRESSIBLE_TYPES
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is not None:
+            return compressed
+        codec = self.codecs[encoding]
+        if len(body) >= self.thread_min_size:
+            compressed = await asyncio.to_thread(codec, body)
+        else:
+            compressed = codec(body)
+        self.cache.set(key, compressed)
+        return compressed
@@ -0,0 +1,69 @@
+"""Промежуточный обработчик, запоминающий позицию записи клиента."""
+
+from os import getenv
+from typing import Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from lib_api.database import LSN_COOKIE, current_wal_lsn
+from lib_api.logs import logger
+
+READ_YOUR_WRITES_SECONDS = int(getenv("READ_YOUR_WRITES_SECONDS") or 30)
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    Выставляет cookie lib_lsn после успешных изменяющих запросов.
+
+    В cookie пишется позиция WAL основной БД после записи,
+    get_read_session_db по ней решает, можно ли читать с реплики.
+    Cookie живёт READ_YOUR_WRITES_SECONDS: дольше реплика
+    обычно не отстаёт, и дальше проверка не нужна.
+    Без настроенной реплики обработчик ничего не делает.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            session_factory: async_sessionmaker,
+            enabled: bool = True,
+            max_age: int = READ_YOUR_WRITES_SECONDS,
+    ) -> None:
+        self.app = app
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.max_age = max_age
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if (not self.enabled or scope["type"] != "http" or
+                scope["method"] in SAFE_METHODS):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_lsn(message: Message) -> None:
+            if (message["type"] == "http.response.start" and
+                    message["status"] < 400):
+                cookie = await self._lsn_cookie()
+                if cookie is not None:
+                    message["headers"] = [
+                        *message.get("headers", []), (b"set-cookie", cookie)
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_lsn)
+
+    async def _lsn_cookie(self) -> Optional[bytes]:
+        try:
+            async with self.session_factory() as session:
+                lsn = await current_wal_lsn(session)
+        except (OSError, SQLAlchemyError) as err:
+            logger.warning(f"WAL position is unavailable: {err}")
+            return None
+        return (
+            f"{LSN_COOKIE}={lsn}; Max-Age={self.max_age}; Path=/; "
+            f"HttpOnly; SameSite=lax"
+        ).encode("latin-1")
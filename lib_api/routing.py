@@ -1,51 +1,88 @@
 
 """Регистрация маршрутов приложения."""
 
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_pagination import Page, Params
-from fastapi_pagination.ext.sqlalchemy import apaginate
 from pydantic import SecretStr
 from sqlalchemy import asc, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from lib_api.business_models.availability.availability_hub import (
+    AvailabilityHub, get_availability_hub, open_availability_stream)
+from lib_api.business_models.coalescing.single_flight import (
+    shared_json, wants_fresh_read)
 from lib_api.business_models.librarian import librarian_model
 from lib_api.business_models.librarian.auth_librarian import \
     get_librarian_by_auth
 from lib_api.business_models.librarian.current_librarion import \
     get_current_librarian
-from lib_api.business_models.librarian.util import get_access_token_for_user
+from lib_api.business_models.librarian.refresh_tokens import (
+    issue_token_pair, logout_librarian, rotate_refresh_token)
 from lib_api.business_models.library_models.book_crud.add_book import \
     create_book
 from lib_api.business_models.library_models.book_crud.book_by_id import \
     get_book_by_id
+from lib_api.business_models.library_models.book_crud.books_by_ids import \
+    get_books_by_ids
 from lib_api.business_models.library_models.book_crud.delete_book import \
     delete_book
+from lib_api.business_models.library_models.book_crud.search_books import \
+    search_books
 from lib_api.business_models.library_models.book_crud.update_book import \
     update_book_data
 from lib_api.business_models.library_models.borrow_return_service.books_at_the_reader import \
     get_active_borrows_by_reader
 from lib_api.business_models.library_models.borrow_return_service.borrow_book import \
     borrow_book
+from lib_api.business_models.library_models.borrow_return_service.loan_history import (
+    get_book_loan_history, get_reader_loan_history)
+from lib_api.business_models.library_models.borrow_return_service.overdue_loans import \
+    get_overdue_loans
 from lib_api.business_models.library_models.borrow_return_service.return_book import \
     return_book
+from lib_api.business_models.library_models.hold_service.place_hold import \
+    place_hold
 from lib_api.business_models.library_models.models_lib import Book, Reader
 from lib_api.business_models.library_models.reader_crud.add_reader import \
     create_reader
+from lib_api.business_models.library_models.reader_crud.bulk_readers import \
+    create_readers_bulk
 from lib_api.business_models.library_models.reader_crud.delete_reader import \
     delete_reader
 from lib_api.business_models.library_models.reader_crud.reader_by_id import \
     get_reader_by_id
+from lib_api.business_models.library_models.reader_crud.readers_by_ids import \
+    get_readers_by_ids
 from lib_api.business_models.library_models.reader_crud.update_reader import \
     update_reader_data
-from lib_api.database import get_session_db
+from lib_api.business_models.outbox.change_events import (
+    CHANGES_MAX_WAIT_SECONDS, wait_for_changes)
+from lib_api.business_models.pagination.counted import (
+    BOOKS_COUNT_STRATEGY, READERS_COUNT_STRATEGY, paginate_counted)
+from lib_api.business_models.stats.stats_service import (
+    get_catalogue_stats, get_reader_loans_stats, get_weekly_top_books)
+from lib_api.database import get_read_session_db, get_session_db
 from lib_api.schemas import librarian_serialization, reader_serialization
-from lib_api.schemas.book_serialization import (BookCreate, BookResponse,
-                                                BookUpdate)
+from lib_api.schemas.batch_serialization import BatchResponse, batch_ids
+from lib_api.schemas.bulk_serialization import BulkReadersResponse, bulk_rows
+from lib_api.schemas.book_serialization import (BookCreate, BookFilters,
+                                                BookResponse, BookUpdate)
+from lib_api.schemas.change_serialization import ChangesResponse
+from lib_api.schemas.hold_serialization import HoldRequest, HoldResponse
+from lib_api.schemas.keyset_serialization import KeysetPage, KeysetParams
+from lib_api.schemas.page_serialization import CountedPage
 from lib_api.schemas.reader_book_seeialization import (
     BorrowBookRequest, BorrowedBookResponse, BorrowedBooksListResponse,
     ReturnBookRequest)
 from lib_api.schemas.reader_serialization import ReaderResponse, ReaderUpdate
+from lib_api.schemas.stats_serialization import (CatalogueStatsResponse,
+                                                 ReaderLoansResponse,
+                                                 TopBooksResponse)
 
 router = APIRouter(
     prefix="/api",
@@ -71,8 +108,7 @@ async def oauth2_login(
         password=SecretStr(form_data.password)
     )
     librarian = await get_librarian_by_auth(user_auth=user_in, db=db)
-    access_token = await get_access_token_for_user(librarian=librarian)
-    return librarian_serialization.Token(access_token=access_token)
+    return await issue_token_pair(librarian=librarian, db=db)
 
 
 @router.post(
@@ -92,8 +128,49 @@ async def create_new_user(
     """
     db_librarian = await (librarian_model.Librarian
                           .create_librarian(librarian_in=user_in, db=db))
-    access_token = await get_access_token_for_user(librarian=db_librarian)
-    return librarian_serialization.Token(access_token=access_token)
+    return await issue_token_pair(librarian=db_librarian, db=db)
+
+
+@router.post(
+    "/librarian/refresh",
+    response_model=librarian_serialization.Token,
+    tags=["Authentication"]
+)
+async def refresh_tokens(
+    refresh_in: librarian_serialization.RefreshRequest,
+    db: AsyncSession = Depends(get_session_db)
+) -> librarian_serialization.Token:
+    """
+    Обменивает refresh-токен на новую пару токенов.
+
+    :return: librarian_serialization.Token: новая пара токенов.
+    """
+    return await rotate_refresh_token(
+        refresh_token=refresh_in.refresh_token, db=db
+    )
+
+
+@router.post(
+    "/librarian/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["Authentication"]
+)
+async def logout(
+    logout_in: librarian_serialization.LogoutRequest,
+    current: librarian_serialization.TokenPayload = Depends(
+        get_current_librarian
+    ),
+    db: AsyncSession = Depends(get_session_db)
+) -> None:
+    """
+    Отзывает текущий токен доступа и refresh-токен.
+
+    :return: None: Возвращает пустой ответ с кодом 204.
+    """
+    await logout_librarian(
+        current=current, refresh_token=logout_in.refresh_token, db=db
+    )
+    return None
 
 
 @router.post(
@@ -116,6 +193,33 @@ async def create_new_reader(
     return await create_reader(reader_in=reader_in, db=db)
 
 
+@router.post(
+    "/readers/bulk",
+    response_model=BulkReadersResponse,
+    tags=["Readers"],
+    dependencies=[Depends(get_current_librarian)],
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": {
+            "type": "array",
+            "items": {"$ref": "#/components/schemas/ReaderCreate"},
+        }},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}},
+)
+async def create_readers_in_bulk(
+    rows: list = Depends(bulk_rows),
+    db: AsyncSession = Depends(get_session_db)
+) -> BulkReadersResponse:
+    """
+    Регистрирует пакет читателей из JSON-массива или NDJSON.
+
+    Для каждой строки возвращает created, duplicate или invalid.
+    :return:
+        BulkReadersResponse: Сводка и итог по каждой строке.
+    """
+    return await create_readers_bulk(rows=rows, db=db)
+
+
 @router.get(
     "/reader/{reader_id}",
     response_model=ReaderResponse,
@@ -123,7 +227,7 @@ async def create_new_reader(
     dependencies=[Depends(get_current_librarian)]
 )
 async def read_reader_by_id(
-        reader_id: int, db: AsyncSession = Depends(get_session_db)
+        reader_id: int, db: AsyncSession = Depends(get_read_session_db)
 ) -> ReaderResponse:
     """
     Получает информацию о читателе по его ID.
@@ -178,23 +282,46 @@ async def delete_existing_reader(
 
 @router.get(
     "/readers",
-    response_model=Page[ReaderResponse],
+    response_model=CountedPage[ReaderResponse],
     tags=["Readers"],
     dependencies=[Depends(get_current_librarian)]
 )
 async def list_readers(
-    db: AsyncSession = Depends(get_session_db),
+    db: AsyncSession = Depends(get_read_session_db),
     params: Params = Depends()
-) -> Page[ReaderResponse]:
+) -> CountedPage[ReaderResponse]:
     """
     Возвращает постраничный список всех читателей.
 
     Список сортирован по алфавиту.
+    total считается стратегией READERS_COUNT_STRATEGY.
     :return:
-        Page[ReaderResponse]: Страница с данными читателей.
+        CountedPage[ReaderResponse]: Страница с данными читателей.
     """
     query = select(Reader).order_by(asc(Reader.name))
-    return await apaginate(db, query, params)
+    return await paginate_counted(
+        db, query, params, ReaderResponse, Reader, READERS_COUNT_STRATEGY
+    )
+
+
+@router.get(
+    "/readers/batch",
+    response_model=BatchResponse[ReaderResponse],
+    tags=["Readers"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def read_readers_batch(
+    ids: list[int] = Depends(batch_ids),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> BatchResponse[ReaderResponse]:
+    """
+    Возвращает читателей по списку ID одним запросом.
+
+    Порядок совпадает с ids, ненайденные ID перечислены отдельно.
+    :return:
+        BatchResponse[ReaderResponse]: Читатели и ненайденные ID.
+    """
+    return await get_readers_by_ids(ids=ids, db=db)
 
 
 @router.post(
@@ -219,22 +346,105 @@ async def create_new_book(
 
 @router.get(
     "/librarian",
-    response_model=Page[BookResponse],
+    response_model=CountedPage[BookResponse],
     tags=["Books"],
 )
 async def list_books(
-    db: AsyncSession = Depends(get_session_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_session_db),
     params: Params = Depends()
-) -> Page[BookResponse]:
+) -> CountedPage[BookResponse]:
     """
     Возвращает постраничный список всех книг.
 
     Сортировка по LIFO.
+    total считается стратегией BOOKS_COUNT_STRATEGY.
+    Одновременные запросы первой страницы разделяют одну выборку,
+    кроме запросов, требующих чтения своей записи.
     :return:
-        Page[BookResponse]: Страница с данными книг.
+        CountedPage[BookResponse]: Страница с данными книг.
     """
     query = select(Book).order_by(desc(Book.id))
-    return await apaginate(db, query, params)
+
+    async def load(session: AsyncSession) -> CountedPage[BookResponse]:
+        return await paginate_counted(
+            session, query, params, BookResponse, Book, BOOKS_COUNT_STRATEGY
+        )
+
+    if params.page != 1:
+        return await load(db)
+    return await shared_json(
+        "books_first_page", params.size, db, load,
+        fresh=wants_fresh_read(request),
+    )
+
+
+@router.get(
+    "/books",
+    response_model=KeysetPage[BookResponse],
+    tags=["Books"],
+)
+async def list_books_filtered(
+    filters: BookFilters = Depends(),
+    params: KeysetParams = Depends(),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> KeysetPage[BookResponse]:
+    """
+    Возвращает книги по автору, годам издания и наличию.
+
+    sort задаёт ключ сортировки: id, title, author или year.
+    Постраничная навигация по курсору next_cursor.
+    :return:
+        KeysetPage[BookResponse]: Страница книг.
+    """
+    return await search_books(filters=filters, params=params, db=db)
+
+
+@router.get(
+    "/books/batch",
+    response_model=BatchResponse[BookResponse],
+    tags=["Books"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def read_books_batch(
+    ids: list[int] = Depends(batch_ids),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> BatchResponse[BookResponse]:
+    """
+    Возвращает книги по списку ID одним запросом.
+
+    Порядок совпадает с ids, ненайденные ID перечислены отдельно.
+    :return:
+        BatchResponse[BookResponse]: Книги и ненайденные ID.
+    """
+    return await get_books_by_ids(ids=ids, db=db)
+
+
+@router.get(
+    "/books/availability/stream",
+    response_class=StreamingResponse,
+    tags=["Books"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def stream_books_availability(
+    ids: list[int] = Depends(batch_ids),
+    db: AsyncSession = Depends(get_session_db),
+    hub: AvailabilityHub = Depends(get_availability_hub)
+) -> StreamingResponse:
+    """
+    Поток Server-Sent Events с числом доступных копий книг.
+
+    Сначала приходит текущее состояние книг из ids,
+    затем события при выдаче, возврате и изменении книги.
+    :return:
+        StreamingResponse: Поток text/event-stream.
+    """
+    events = await open_availability_stream(ids=ids, db=db, hub=hub)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get(
@@ -245,16 +455,24 @@ async def list_books(
 )
 async def read_book_by_id(
     book_id: int,
-    db: AsyncSession = Depends(get_session_db)
-) -> BookResponse:
+    request: Request,
+    db: AsyncSession = Depends(get_read_session_db)
+) -> Response:
     """
     Получает информацию о книге по её ID.
 
+    Одновременные запросы одной книги разделяют одну выборку,
+    кроме запросов, требующих чтения своей записи.
     :return:
         BookResponse: Данные книги с указанным ID.
     """
-    book = await get_book_by_id(book_id, db)
-    return BookResponse.model_validate(book)
+    async def load(session: AsyncSession) -> BookResponse:
+        book = await get_book_by_id(book_id, session)
+        return BookResponse.model_validate(book)
+
+    return await shared_json(
+        "book", book_id, db, load, fresh=wants_fresh_read(request)
+    )
 
 
 @router.put(
@@ -351,13 +569,203 @@ async def return_book_endpoint(
 )
 async def list_borrowed_books(
     reader_id: int,
-    db: AsyncSession = Depends(get_session_db)
+    expand: Optional[Literal["book"]] = None,
+    db: AsyncSession = Depends(get_read_session_db)
 ) -> BorrowedBooksListResponse:
     """
     Список активных взятых книг для указанного читателя.
 
+    С expand=book в каждую выдачу добавляются название,
+    автор и ISBN книги.
     :return:
         BorrowedBooksListResponse: Список взятых книг читателя.
     """
-    borrows = await get_active_borrows_by_reader(reader_id, db)
+    borrows = await get_active_borrows_by_reader(
+        reader_id, db, expand_book=expand == "book"
+    )
     return borrows
+
+
+@router.get(
+    "/reader/{reader_id}/history",
+    response_model=KeysetPage[BorrowedBookResponse],
+    status_code=status.HTTP_200_OK,
+    tags=["Borrow and Return"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def reader_loan_history(
+    reader_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    params: KeysetParams = Depends(),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> KeysetPage[BorrowedBookResponse]:
+    """
+    История выдач читателя от новых к старым.
+
+    Постраничная навигация по курсору next_cursor.
+    :return:
+        KeysetPage[BorrowedBookResponse]: Страница истории выдач.
+    """
+    return await get_reader_loan_history(
+        reader_id=reader_id, params=params, db=db,
+        date_from=date_from, date_to=date_to
+    )
+
+
+@router.get(
+    "/book/{book_id}/history",
+    response_model=KeysetPage[BorrowedBookResponse],
+    status_code=status.HTTP_200_OK,
+    tags=["Borrow and Return"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def book_loan_history(
+    book_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    params: KeysetParams = Depends(),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> KeysetPage[BorrowedBookResponse]:
+    """
+    История выдач книги от новых к старым.
+
+    Постраничная навигация по курсору next_cursor.
+    :return:
+        KeysetPage[BorrowedBookResponse]: Страница истории выдач.
+    """
+    return await get_book_loan_history(
+        book_id=book_id, params=params, db=db,
+        date_from=date_from, date_to=date_to
+    )
+
+
+@router.get(
+    "/loans/overdue",
+    response_model=KeysetPage[BorrowedBookResponse],
+    status_code=status.HTTP_200_OK,
+    tags=["Borrow and Return"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def list_overdue_loans(
+    params: KeysetParams = Depends(),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> KeysetPage[BorrowedBookResponse]:
+    """
+    Список невозвращённых книг с истёкшим сроком возврата.
+
+    Постраничная навигация по курсору next_cursor.
+    :return:
+        KeysetPage[BorrowedBookResponse]: Страница просроченных выдач.
+    """
+    return await get_overdue_loans(params=params, db=db)
+
+
+@router.post(
+    "/book/{book_id}/hold",
+    response_model=HoldResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Borrow and Return"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def place_book_hold(
+    book_id: int,
+    hold_req: HoldRequest,
+    db: AsyncSession = Depends(get_session_db)
+) -> HoldResponse:
+    """
+    Ставит читателя в очередь на книгу без свободных копий.
+
+    Копия закрепляется за резервом при возврате книги.
+    :return:
+        HoldResponse: Информация о резерве.
+    """
+    return await place_hold(
+        book_id=book_id, reader_id=hold_req.reader_id, db=db
+    )
+
+
+@router.get(
+    "/stats/catalogue",
+    response_model=CatalogueStatsResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["Statistics"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def catalogue_stats(
+    db: AsyncSession = Depends(get_read_session_db)
+) -> CatalogueStatsResponse:
+    """
+    Сводка по каталогу и выдачам для панели библиотекаря.
+
+    Данные берутся из материализованного представления
+    и обновляются фоновой задачей.
+    :return:
+        CatalogueStatsResponse: Сводка и время её расчёта.
+    """
+    return await get_catalogue_stats(db=db)
+
+
+@router.get(
+    "/stats/top-books",
+    response_model=TopBooksResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["Statistics"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def weekly_top_books(
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> TopBooksResponse:
+    """
+    Самые выдаваемые книги за последние 7 дней.
+
+    :return:
+        TopBooksResponse: Книги по убыванию числа выдач.
+    """
+    return await get_weekly_top_books(limit=limit, db=db)
+
+
+@router.get(
+    "/stats/reader-loans",
+    response_model=Page[ReaderLoansResponse],
+    status_code=status.HTTP_200_OK,
+    tags=["Statistics"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def reader_loans_stats(
+    params: Params = Depends(),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> Page[ReaderLoansResponse]:
+    """
+    Читатели с активными и просроченными выдачами.
+
+    :return:
+        Page[ReaderLoansResponse]: Страница читателей.
+    """
+    return await get_reader_loans_stats(params=params, db=db)
+
+
+@router.get(
+    "/changes",
+    response_model=ChangesResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["Changes"],
+    dependencies=[Depends(get_current_librarian)]
+)
+async def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    wait: float = Query(0, ge=0, le=CHANGES_MAX_WAIT_SECONDS),
+    db: AsyncSession = Depends(get_read_session_db)
+) -> ChangesResponse:
+    """
+    События изменений книг, читателей и выдач после since.
+
+    Потребители синхронизируются по курсору next_since
+    вместо повторной выгрузки всего каталога.
+    С wait > 0 запрос ждёт новых событий до wait секунд.
+    :return:
+        ChangesResponse: События и курсор следующего запроса.
+    """
+    return await wait_for_changes(since=since, limit=limit, db=db, wait=wait)
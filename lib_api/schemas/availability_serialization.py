@@ -0,0 +1,12 @@
+"""Сериализаторы потока доступности книг."""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class AvailabilityEvent(BaseModel):
+    """Текущее число доступных копий книги."""
+
+    book_id: int
+    copies_count: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,44 @@
+"""Сериализаторы пакетной выборки по списку ID."""
+
+from typing import Generic, List, TypeVar
+
+from fastapi import Query, status
+from pydantic import BaseModel
+
+from lib_api.factories.error_factory import raise_http_error
+
+T = TypeVar("T")
+
+
+class BatchResponse(BaseModel, Generic[T]):
+    """Найденные записи в порядке запроса и ненайденные ID."""
+
+    items: List[T]
+    missing_ids: List[int]
+
+
+def batch_ids(
+        ids: str = Query(..., description="ID через запятую: 1,2,3"),
+) -> list[int]:
+    """
+    Разбирает параметр ids в список целых чисел.
+
+    :return: Список ID в порядке запроса.
+    """
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError as err:
+        raise_http_error(
+            error=err,
+            er_type="InvalidIds",
+            message="ids must be comma-separated integers",
+            st_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if not parsed:
+        raise_http_error(
+            error=ValueError(ids),
+            er_type="InvalidIds",
+            message="ids must not be empty",
+            st_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return parsed
@@ -1,9 +1,11 @@
 """Сериализаторы книги."""
 
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, conint
 
+BookSort = Literal["id", "title", "author", "year"]
+
 
 class BookBase(BaseModel):
     """Базовая модель книги с основными полями."""
@@ -37,3 +39,24 @@ class BookResponse(BookBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BookFilters(BaseModel):
+    """Фильтры и сортировка списка книг."""
+
+    author: Optional[str] = Field(
+        None, max_length=255, description="Точное имя автора"
+    )
+    year_from: Optional[int] = Field(
+        None, description="Год издания не раньше (включительно)"
+    )
+    year_to: Optional[int] = Field(
+        None, description="Год издания не позже (включительно)"
+    )
+    available: Optional[bool] = Field(
+        None, description="true — есть экземпляры, false — нет"
+    )
+    sort: BookSort = Field("id", description="Ключ сортировки")
+    order: Optional[Literal["asc", "desc"]] = Field(
+        None, description="Направление; по умолчанию desc для id, иначе asc"
+    )
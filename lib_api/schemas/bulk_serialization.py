@@ -0,0 +1,100 @@
+"""Сериализаторы пакетной регистрации читателей."""
+
+import json
+from os import getenv
+from typing import Any, List, Literal, Optional
+
+from fastapi import Request, status
+from pydantic import BaseModel
+
+from lib_api.factories.error_factory import raise_http_error
+
+READERS_BULK_MAX_ROWS = int(getenv("READERS_BULK_MAX_ROWS") or 10000)
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl")
+
+BulkRowStatus = Literal["created", "duplicate", "invalid"]
+
+
+class InvalidRow:
+    """Строка NDJSON, которую не удалось разобрать как JSON."""
+
+    def __init__(self, error: str) -> None:
+        self.error = error
+
+
+class BulkRowResult(BaseModel):
+    """Итог обработки одной строки пакета."""
+
+    row: int
+    status: BulkRowStatus
+    email: Optional[str] = None
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkReadersResponse(BaseModel):
+    """Сводка пакетной регистрации и итог по каждой строке."""
+
+    created: int
+    duplicates: int
+    invalid: int
+    rows: List[BulkRowResult]
+
+
+def _too_many_rows() -> None:
+    raise_http_error(
+        error=ValueError(READERS_BULK_MAX_ROWS),
+        er_type="TooManyRows",
+        message=f"At most {READERS_BULK_MAX_ROWS} rows per request",
+        st_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    )
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as err:
+        return InvalidRow(f"Invalid JSON: {err}")
+
+
+async def bulk_rows(request: Request) -> list[Any]:
+    """
+    Читает тело пакета: JSON-массив или NDJSON-поток.
+
+    NDJSON читается по мере поступления, строка с битым JSON
+    становится InvalidRow и не прерывает разбор остальных.
+    Больше READERS_BULK_MAX_ROWS строк — ошибка 413.
+    :return: Список разобранных строк в порядке тела запроса.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() in NDJSON_TYPES:
+        rows: list[Any] = []
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            rows.extend(_parse_line(line) for line in lines if line.strip())
+            if len(rows) > READERS_BULK_MAX_ROWS:
+                _too_many_rows()
+        if buffer.strip():
+            rows.append(_parse_line(buffer))
+    else:
+        try:
+            rows = json.loads(await request.body())
+        except ValueError as err:
+            raise_http_error(
+                error=err,
+                er_type="InvalidBody",
+                message="Body must be a JSON array or NDJSON",
+                st_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if not isinstance(rows, list):
+            raise_http_error(
+                error=ValueError(type(rows).__name__),
+                er_type="InvalidBody",
+                message="Body must be a JSON array or NDJSON",
+                st_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+    if len(rows) > READERS_BULK_MAX_ROWS:
+        _too_many_rows()
+    return rows
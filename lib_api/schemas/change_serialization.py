@@ -0,0 +1,26 @@
+"""Сериализаторы журнала изменений."""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChangeEventResponse(BaseModel):
+    """Событие изменения книги, читателя или выдачи."""
+
+    seq: int
+    entity: Literal["book", "reader", "loan"]
+    entity_id: int
+    op: Literal["create", "update", "delete"]
+    payload: Optional[dict] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangesResponse(BaseModel):
+    """События после since и курсор для следующего запроса."""
+
+    events: List[ChangeEventResponse]
+    next_since: int
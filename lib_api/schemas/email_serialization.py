@@ -0,0 +1,19 @@
+"""Нормализованный email."""
+
+from typing import Annotated
+
+from pydantic import AfterValidator, EmailStr
+
+
+def normalize_email(email: str) -> str:
+    """
+    Приводит email к нижнему регистру без пробелов по краям.
+
+    В таком виде email хранится в базе и сравнивается
+    с уникальными индексами lower(email).
+    :return: str: Нормализованный email.
+    """
+    return email.strip().lower()
+
+
+NormalizedEmail = Annotated[EmailStr, AfterValidator(normalize_email)]
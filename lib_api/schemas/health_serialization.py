@@ -0,0 +1,45 @@
+"""Сериализаторы проверок здоровья сервиса."""
+
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class LivenessResponse(BaseModel):
+    """Ответ проверки живости процесса."""
+
+    status: str
+
+
+class PoolStatus(BaseModel):
+    """Состояние пула соединений с базой."""
+
+    size: int
+    checked_out: int
+    overflow: int
+    saturated: bool
+
+
+class ReadinessResponse(BaseModel):
+    """Ответ проверки готовности сервиса."""
+
+    status: str
+    database: bool
+    pool: PoolStatus
+
+
+class SingleFlightGroup(BaseModel):
+    """Счётчики объединения запросов одной группы."""
+
+    calls: int
+    executions: int
+    coalesced: int
+    timeouts: int
+    ratio: float
+
+
+class SingleFlightResponse(BaseModel):
+    """Метрики объединения одинаковых одновременных запросов."""
+
+    in_flight: int
+    groups: Dict[str, SingleFlightGroup]
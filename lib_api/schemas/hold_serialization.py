@@ -0,0 +1,25 @@
+"""Сериализаторы резервов книг."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class HoldRequest(BaseModel):
+    """Запрос на постановку читателя в очередь на книгу."""
+
+    reader_id: int = Field(..., gt=0)
+
+
+class HoldResponse(BaseModel):
+    """Ответ с информацией о резерве."""
+
+    id: int
+    book_id: int
+    reader_id: int
+    status: str
+    created_at: datetime
+    ready_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,24 @@
+"""Сериализаторы курсорной пагинации."""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class KeysetParams(BaseModel):
+    """Параметры запроса курсорной страницы."""
+
+    cursor: Optional[str] = Field(
+        None, description="Курсор из next_cursor предыдущей страницы"
+    )
+    size: int = Field(50, ge=1, le=100, description="Размер страницы")
+
+
+class KeysetPage(BaseModel, Generic[T]):
+    """Страница записей с курсором следующей страницы."""
+
+    items: List[T]
+    size: int
+    next_cursor: Optional[str] = None
@@ -1,13 +1,18 @@
 """Сериализатор библиотекаря."""
 
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, SecretStr
 
+from lib_api.schemas.email_serialization import NormalizedEmail
+
 
 class LibrarianCreate(BaseModel):
     """Модель для создания нового библиотекаря."""
 
     name: str = Field(..., max_length=100)
-    email: EmailStr
+    email: NormalizedEmail
     password: SecretStr = Field(..., min_length=8)
 
 
@@ -25,11 +30,32 @@ class Token(BaseModel):
     """Модель для передачи токена доступа."""
 
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
 
 
+class TokenPayload(BaseModel):
+    """Данные проверенного токена доступа."""
+
+    email: str
+    jti: str
+    exp: datetime
+
+
+class RefreshRequest(BaseModel):
+    """Запрос на обмен refresh-токена на новую пару."""
+
+    refresh_token: str = Field(..., min_length=1)
+
+
+class LogoutRequest(BaseModel):
+    """Запрос на выход, refresh-токен отзывается вместе с цепочкой."""
+
+    refresh_token: Optional[str] = None
+
+
 class LibrarianLogin(BaseModel):
     """Модель для аутентификации библиотекаря."""
 
-    email: EmailStr
+    email: NormalizedEmail
     password: SecretStr
@@ -0,0 +1,20 @@
+"""Сериализаторы страниц с выбранной стратегией подсчёта."""
+
+from typing import Generic, Literal, TypeVar
+
+from fastapi_pagination import Page
+
+T = TypeVar("T")
+
+CountStrategy = Literal["exact", "cached", "approximate"]
+
+
+class CountedPage(Page[T], Generic[T]):
+    """
+    Страница fastapi_pagination со стратегией подсчёта total.
+
+    exact — точный count(*), cached — count(*) из кэша с TTL,
+    approximate — оценка из статистики планировщика.
+    """
+
+    count_strategy: CountStrategy
@@ -27,11 +27,26 @@ class BorrowedBookResponse(BaseModel):
     reader_id: int
     borrow_date: datetime
     return_date: Optional[datetime] = None
+    due_date: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class BorrowedBookDetails(BaseModel):
+    """Краткие данные книги внутри выдачи."""
+
+    title: str
+    author: str
+    isbn: Optional[str] = None
+
+
+class ActiveBorrowResponse(BorrowedBookResponse):
+    """Активная выдача, данные книги заполняются при expand=book."""
+
+    book: Optional[BorrowedBookDetails] = None
+
+
 class BorrowedBooksListResponse(BaseModel):
     """Ответ со списком активных взятых книг."""
 
-    borrowed_books: List[BorrowedBookResponse]
+    borrowed_books: List[ActiveBorrowResponse]
@@ -2,14 +2,16 @@
 
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from lib_api.schemas.email_serialization import NormalizedEmail
 
 
 class ReaderBase(BaseModel):
     """Базовая модель читателя с основными полями."""
 
     name: str = Field(..., max_length=255)
-    email: EmailStr
+    email: NormalizedEmail
     note: Optional[str] = Field(None, max_length=500)
 
 
@@ -21,7 +23,7 @@ class ReaderUpdate(BaseModel):
     """Модель для обновления данных читателя."""
 
     name: Optional[str] = Field(None, max_length=255)
-    email: Optional[EmailStr] = None
+    email: Optional[NormalizedEmail] = None
     note: Optional[str] = Field(None, max_length=500)
 
 
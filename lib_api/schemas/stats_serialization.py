@@ -0,0 +1,47 @@
+"""Сериализаторы статистики для панелей библиотекарей."""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class CatalogueStatsResponse(BaseModel):
+    """Сводка по каталогу и выдачам."""
+
+    total_titles: int
+    zero_copy_titles: int
+    available_copies: int
+    active_loans: int
+    refreshed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TopBookResponse(BaseModel):
+    """Книга с числом выдач за последние 7 дней."""
+
+    book_id: int
+    title: str
+    author: str
+    loans_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TopBooksResponse(BaseModel):
+    """Самые востребованные книги недели."""
+
+    books: List[TopBookResponse]
+    refreshed_at: Optional[datetime] = None
+
+
+class ReaderLoansResponse(BaseModel):
+    """Активные и просроченные выдачи читателя."""
+
+    reader_id: int
+    name: str
+    active_loans: int
+    overdue_loans: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1 @@
+"""Инициализация ограничения частоты запросов."""
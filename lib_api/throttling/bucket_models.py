@@ -0,0 +1,42 @@
+"""Модель общих корзин токенов для нескольких воркеров."""
+
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, Boolean, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from lib_api.business_models.base_model.base_model import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Корзина токенов, разделяемая воркерами через PostgreSQL.
+
+    Таблица нежурналируемая: после сбоя сервера корзины
+    просто начинаются заново.
+
+    Attributes:
+        key (str): Ключ корзины, например ip:127.0.0.1.
+        tokens (float): Остаток токенов на момент updated_at.
+        allowed (bool): Хватило ли токенов при последнем списании.
+        updated_at (datetime): Время последнего обращения.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String(320), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    allowed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+
+    def __repr__(self):
+        """
+        Возвращает строковое представление корзины.
+
+        :return: Строка в формате <RateLimitBucket(key=KEY, tokens=N)>
+        """
+        return (f"<RateLimitBucket(key={self.key},"
+                f" tokens={self.tokens})>")
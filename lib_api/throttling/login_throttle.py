@@ -0,0 +1,183 @@
+"""Ограничение частоты попыток входа до проверки пароля."""
+
+import hashlib
+import json
+import math
+from os import getenv
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi import status
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from lib_api.database import async_engine
+from lib_api.logs import logger
+from lib_api.schemas.error_serialization import ErrorResponse
+from lib_api.throttling.stores import (BucketStore, InProcessBucketStore,
+                                       PostgresBucketStore)
+
+LOGIN_PATH = "/api/librarian/oauth2-login"
+LOGIN_IP_PER_MINUTE = float(getenv("LOGIN_IP_PER_MINUTE") or 30)
+LOGIN_IP_BURST = float(getenv("LOGIN_IP_BURST") or 10)
+LOGIN_EMAIL_PER_MINUTE = float(getenv("LOGIN_EMAIL_PER_MINUTE") or 5)
+LOGIN_EMAIL_BURST = float(getenv("LOGIN_EMAIL_BURST") or 5)
+LOGIN_BODY_LIMIT = 16 * 1024
+RATE_LIMIT_STORE = getenv("RATE_LIMIT_STORE") or "memory"
+RATE_LIMIT_CAPACITY = int(getenv("RATE_LIMIT_CAPACITY") or 100_000)
+# Время полного пополнения самой медленной корзины входа:
+# корзину, простоявшую дольше, можно удалить.
+LOGIN_BUCKET_IDLE_SECONDS = max(
+    LOGIN_IP_BURST / LOGIN_IP_PER_MINUTE * 60,
+    LOGIN_EMAIL_BURST / LOGIN_EMAIL_PER_MINUTE * 60,
+)
+
+
+def build_bucket_store() -> BucketStore:
+    """
+    Создаёт хранилище корзин по настройке RATE_LIMIT_STORE.
+
+    memory — корзины в памяти процесса, postgres — общие
+    для всех воркеров корзины в таблице rate_limit_buckets.
+    :return: Хранилище корзин токенов.
+    """
+    if RATE_LIMIT_STORE == "postgres":
+        return PostgresBucketStore(async_engine)
+    return InProcessBucketStore(RATE_LIMIT_CAPACITY)
+
+
+login_bucket_store = build_bucket_store()
+
+
+def email_bucket_key(email: str) -> str:
+    """
+    Ключ корзины email фиксированной длины.
+
+    Имя пользователя приходит из формы и может быть длиной
+    до LOGIN_BODY_LIMIT, поэтому в ключ идёт его SHA-256.
+    :return: str: email:<sha256 hex>.
+    """
+    return "email:" + hashlib.sha256(email.encode()).hexdigest()
+
+
+class LoginThrottleMiddleware:
+    """
+    Отклоняет лишние попытки входа с кодом 429.
+
+    Сначала списывается токен из корзины IP клиента, затем,
+    после чтения формы, из корзины email. Отказ происходит
+    до обращения к базе и проверки bcrypt.
+    Если хранилище корзин недоступно, вход не ограничивается.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            store: BucketStore,
+            path: str = LOGIN_PATH,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if (scope["type"] != "http" or scope["method"] != "POST" or
+                scope["path"] != self.path):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        retry_after = await self._take(
+            f"ip:{ip}", LOGIN_IP_PER_MINUTE / 60, LOGIN_IP_BURST
+        )
+        if retry_after:
+            await self._reject(send, retry_after, f"ip {ip}")
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            await self._send_error(
+                send, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                "PayloadTooLarge", "Login form is too large"
+            )
+            return
+        email = self._username(body)
+        if email:
+            retry_after = await self._take(
+                email_bucket_key(email), LOGIN_EMAIL_PER_MINUTE / 60,
+                LOGIN_EMAIL_BURST
+            )
+            if retry_after:
+                await self._reject(send, retry_after, f"email {email[:255]}")
+                return
+
+        replayed = False
+
+        async def replay_body() -> Message:
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body,
+                    "more_body": False}
+
+        await self.app(scope, replay_body, send)
+
+    async def _take(self, key: str, rate: float, burst: float) -> float:
+        try:
+            return await self.store.take(key, rate, burst)
+        except (OSError, SQLAlchemyError) as err:
+            logger.warning(f"Rate limit store unavailable, login"
+                           f" not throttled: {err}")
+            return 0.0
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> Optional[bytes]:
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > LOGIN_BODY_LIMIT:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _username(body: bytes) -> str:
+        form = parse_qs(body.decode("latin-1"), max_num_fields=10)
+        username = form.get("username", [""])[0]
+        return username.strip().lower()
+
+    async def _reject(self, send: Send, retry_after: float,
+                      subject: str) -> None:
+        logger.warning(f"Login attempts throttled for {subject}")
+        await self._send_error(
+            send, status.HTTP_429_TOO_MANY_REQUESTS,
+            "TooManyRequests", "Too many login attempts",
+            {"retry-after": str(math.ceil(retry_after))},
+        )
+
+    @staticmethod
+    async def _send_error(send: Send, st_code: int, er_type: str,
+                          message: str,
+                          headers: Optional[dict] = None) -> None:
+        problem = ErrorResponse(
+            result=False, error_type=er_type, error_message=message
+        )
+        body = json.dumps({"detail": problem.model_dump()}).encode()
+        raw_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *((k.encode(), v.encode()) for k, v in (headers or {}).items()),
+        ]
+        await send({"type": "http.response.start", "status": st_code,
+                    "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,171 @@
+"""Хранилища корзин токенов: в процессе и общее в PostgreSQL."""
+
+import asyncio
+import time
+from datetime import timedelta
+from os import getenv
+from typing import Protocol
+
+from sqlalchemy import case, func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib_api.logs import logger
+from lib_api.throttling.bucket_models import RateLimitBucket
+from lib_api.throttling.token_bucket import TokenBucketTable
+
+RATE_LIMIT_CLEANUP_SECONDS = int(getenv("RATE_LIMIT_CLEANUP_SECONDS") or 300)
+
+
+class BucketStore(Protocol):
+    """Интерфейс хранилища корзин токенов."""
+
+    async def take(
+            self, key: str, rate: float, burst: float, cost: float = 1.0
+    ) -> float:
+        """
+        Списывает токены из корзины key.
+
+        :return: 0.0 при успехе, иначе секунды до повторной попытки.
+        """
+
+    async def reset(self) -> None:
+        """Сбрасывает все корзины."""
+
+    async def purge_idle(self, idle_seconds: float) -> int:
+        """
+        Удаляет корзины без обращений дольше idle_seconds.
+
+        :return: Число удалённых корзин.
+        """
+
+
+class InProcessBucketStore:
+    """
+    Корзины в памяти процесса.
+
+    Лимит действует на каждый воркер отдельно.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.table = TokenBucketTable(capacity)
+
+    async def take(
+            self, key: str, rate: float, burst: float, cost: float = 1.0
+    ) -> float:
+        """
+        Списывает токены из корзины key.
+
+        :return: 0.0 при успехе, иначе секунды до повторной попытки.
+        """
+        return self.table.take(key, rate, burst, time.monotonic(), cost)
+
+    async def reset(self) -> None:
+        """Сбрасывает все корзины."""
+        self.table.clear()
+
+    async def purge_idle(self, idle_seconds: float) -> int:
+        """
+        Ничего не удаляет: таблица ограничена capacity и вытесняет
+        самые старые корзины сама.
+
+        :return: 0
+        """
+        return 0
+
+
+class PostgresBucketStore:
+    """
+    Корзины в общей таблице rate_limit_buckets.
+
+    Пополнение и списание выполняются одним
+    INSERT ... ON CONFLICT DO UPDATE, поэтому лимит общий
+    для всех воркеров и не требует отдельных блокировок.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+
+    async def take(
+            self, key: str, rate: float, burst: float, cost: float = 1.0
+    ) -> float:
+        """
+        Списывает токены из корзины key.
+
+        :return: 0.0 при успехе, иначе секунды до повторной попытки.
+        """
+        table = RateLimitBucket.__table__
+        stored = literal_column("rate_limit_buckets.tokens")
+        elapsed = func.greatest(
+            func.extract(
+                "epoch",
+                func.now() - literal_column("rate_limit_buckets.updated_at")
+            ),
+            0,
+        )
+        refilled = func.least(burst, stored + elapsed * rate)
+        stmt = insert(table).values(
+            key=key,
+            tokens=burst - cost if burst >= cost else burst,
+            allowed=burst >= cost,
+            updated_at=func.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "tokens": case(
+                    (refilled >= cost, refilled - cost), else_=refilled
+                ),
+                "allowed": refilled >= cost,
+                "updated_at": func.now(),
+            },
+        ).returning(table.c.tokens, table.c.allowed)
+        async with self.engine.begin() as conn:
+            tokens, allowed = (await conn.execute(stmt)).one()
+        if allowed:
+            return 0.0
+        return (cost - tokens) / rate
+
+    async def reset(self) -> None:
+        """Сбрасывает все корзины."""
+        async with self.engine.begin() as conn:
+            await conn.execute(RateLimitBucket.__table__.delete())
+
+    async def purge_idle(self, idle_seconds: float) -> int:
+        """
+        Удаляет корзины без обращений дольше idle_seconds.
+
+        Корзина, простоявшая время полного пополнения, полна,
+        и её удаление неотличимо от новой корзины, а таблица
+        не растёт от перебора email.
+        :return: Число удалённых корзин.
+        """
+        table = RateLimitBucket.__table__
+        async with self.engine.begin() as conn:
+            result = await conn.execute(table.delete().where(
+                table.c.updated_at
+                < func.now() - timedelta(seconds=idle_seconds)
+            ))
+        return result.rowcount
+
+
+async def run_bucket_cleanup(
+        store: BucketStore,
+        idle_seconds: float,
+        interval: float = RATE_LIMIT_CLEANUP_SECONDS,
+) -> None:
+    """
+    Периодически удаляет простаивающие корзины.
+
+    Ошибки базы логируются, следующий проход выполняется по расписанию.
+    :return: None
+    """
+    while True:
+        try:
+            purged = await store.purge_idle(idle_seconds)
+            if purged:
+                logger.debug(f"Idle rate limit buckets purged: {purged}")
+        except (OSError, SQLAlchemyError) as err:
+            logger.error(f"Rate limit buckets cleanup failed: {err}")
+        await asyncio.sleep(interval)
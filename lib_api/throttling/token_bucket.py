@@ -0,0 +1,110 @@
+"""Компактная таблица корзин токенов с вытеснением по LRU."""
+
+from array import array
+from typing import Optional
+
+
+class TokenBucketTable:
+    """
+    Корзины токенов фиксированной ёмкости в плоских массивах.
+
+    Состояние корзины (токены, время обновления) и ссылки
+    двусвязного списка LRU хранятся в массивах по номеру слота,
+    словарь отображает ключ в слот. Каждый вызов take — O(1),
+    память ограничена capacity: при заполнении вытесняется
+    давно не использовавшийся ключ. Вытесненная корзина
+    при следующем обращении начинается полной.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._slots: dict[str, int] = {}
+        self._keys: list[Optional[str]] = [None] * capacity
+        self._tokens = array("d", [0.0]) * capacity
+        self._updated = array("d", [0.0]) * capacity
+        self._prev = array("l", [-1]) * capacity
+        self._next = array("l", [-1]) * capacity
+        self._head = -1
+        self._tail = -1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    def take(
+            self,
+            key: str,
+            rate: float,
+            burst: float,
+            now: float,
+            cost: float = 1.0,
+    ) -> float:
+        """
+        Списывает cost токенов из корзины key.
+
+        Корзина пополняется со скоростью rate токенов в секунду
+        и вмещает не больше burst токенов.
+        :return: 0.0, если токенов хватило, иначе число секунд
+            до момента, когда их станет достаточно.
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+            tokens = burst
+        else:
+            self._unlink(slot)
+            elapsed = max(now - self._updated[slot], 0.0)
+            tokens = min(burst, self._tokens[slot] + elapsed * rate)
+        self._push_front(slot)
+        self._updated[slot] = now
+        if tokens >= cost:
+            self._tokens[slot] = tokens - cost
+            return 0.0
+        self._tokens[slot] = tokens
+        return (cost - tokens) / rate
+
+    def clear(self) -> None:
+        """Удаляет все корзины."""
+        self._slots.clear()
+        self._keys = [None] * self.capacity
+        self._head = -1
+        self._tail = -1
+        self._size = 0
+
+    def _allocate(self, key: str) -> int:
+        if self._size < self.capacity:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = self._tail
+            self._unlink(slot)
+            del self._slots[self._keys[slot]]
+        self._keys[slot] = key
+        self._slots[key] = slot
+        return slot
+
+    def _unlink(self, slot: int) -> None:
+        prev_slot, next_slot = self._prev[slot], self._next[slot]
+        if prev_slot == -1:
+            self._head = next_slot
+        else:
+            self._next[prev_slot] = next_slot
+        if next_slot == -1:
+            self._tail = prev_slot
+        else:
+            self._prev[next_slot] = prev_slot
+        self._prev[slot] = self._next[slot] = -1
+
+    def _push_front(self, slot: int) -> None:
+        self._prev[slot] = -1
+        self._next[slot] = self._head
+        if self._head != -1:
+            self._prev[self._head] = slot
+        self._head = slot
+        if self._tail == -1:
+            self._tail = slot
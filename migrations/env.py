@@ -10,8 +10,13 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from lib_api.business_models.base_model.base_model import BaseModel # noqa
+from lib_api.business_models.jobs.job_models import JobWatermark # noqa
 from lib_api.business_models.librarian.librarian_model import Librarian # noqa
-from lib_api.business_models.library_models.models_lib import Book, Reader, ReaderBook # noqa
+from lib_api.business_models.librarian.token_models import RefreshToken, RevokedToken # noqa
+from lib_api.business_models.library_models.models_lib import Book, Hold, Reader, ReaderBook # noqa
+from lib_api.business_models.outbox.outbox_models import ChangeEvent # noqa
+from lib_api.idempotency.idempotency_models import IdempotencyKey # noqa
+from lib_api.throttling.bucket_models import RateLimitBucket # noqa
 
 from lib_api.business_models.base_model.base_model import Base
 
@@ -0,0 +1,117 @@
+"""partition readers_books by borrow_date
+
+Revision ID: 5f2a9c1d7e34
+Revises: c243d627c590
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2a9c1d7e34"
+down_revision: Union[str, None] = "c243d627c590"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FIRST_YEAR = 2025
+LAST_YEAR = 2027
+
+INDEXES = (
+    "CREATE INDEX ix_readers_books_reader_history"
+    " ON readers_books (reader_id, borrow_date, id)",
+    "CREATE INDEX ix_readers_books_book_history"
+    " ON readers_books (book_id, borrow_date, id)",
+    "CREATE INDEX ix_readers_books_active_reader"
+    " ON readers_books (reader_id) WHERE return_date IS NULL",
+    "CREATE INDEX ix_readers_books_active_book"
+    " ON readers_books (book_id) WHERE return_date IS NULL",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE readers_books RENAME TO readers_books_legacy")
+    op.execute(
+        "ALTER TABLE readers_books_legacy"
+        " RENAME CONSTRAINT readers_books_pkey TO readers_books_legacy_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE readers_books (
+            id INTEGER NOT NULL
+                DEFAULT nextval('readers_books_id_seq'::regclass),
+            reader_id INTEGER NOT NULL,
+            book_id INTEGER NOT NULL,
+            borrow_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            return_date TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT readers_books_reader_id_fkey FOREIGN KEY (reader_id)
+                REFERENCES readers (id) ON DELETE CASCADE,
+            CONSTRAINT readers_books_book_id_fkey FOREIGN KEY (book_id)
+                REFERENCES books (id) ON DELETE CASCADE,
+            CONSTRAINT readers_books_pkey PRIMARY KEY (id, borrow_date)
+        ) PARTITION BY RANGE (borrow_date)
+        """
+    )
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        op.execute(
+            f"CREATE TABLE readers_books_y{year}"
+            f" PARTITION OF readers_books"
+            f" FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute(
+        "CREATE TABLE readers_books_default"
+        " PARTITION OF readers_books DEFAULT"
+    )
+    op.execute(
+        "INSERT INTO readers_books"
+        " (id, reader_id, book_id, borrow_date, return_date)"
+        " SELECT id, reader_id, book_id, borrow_date, return_date"
+        " FROM readers_books_legacy"
+    )
+    op.execute(
+        "ALTER SEQUENCE readers_books_id_seq OWNED BY readers_books.id"
+    )
+    op.execute("DROP TABLE readers_books_legacy")
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE readers_books RENAME TO readers_books_partitioned")
+    op.execute(
+        "ALTER TABLE readers_books_partitioned"
+        " RENAME CONSTRAINT readers_books_pkey"
+        " TO readers_books_partitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE readers_books (
+            id INTEGER NOT NULL
+                DEFAULT nextval('readers_books_id_seq'::regclass),
+            reader_id INTEGER NOT NULL,
+            book_id INTEGER NOT NULL,
+            borrow_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            return_date TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT readers_books_reader_id_fkey FOREIGN KEY (reader_id)
+                REFERENCES readers (id) ON DELETE CASCADE,
+            CONSTRAINT readers_books_book_id_fkey FOREIGN KEY (book_id)
+                REFERENCES books (id) ON DELETE CASCADE,
+            CONSTRAINT readers_books_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO readers_books"
+        " (id, reader_id, book_id, borrow_date, return_date)"
+        " SELECT id, reader_id, book_id, borrow_date, return_date"
+        " FROM readers_books_partitioned"
+    )
+    op.execute(
+        "ALTER SEQUENCE readers_books_id_seq OWNED BY readers_books.id"
+    )
+    op.execute("DROP TABLE readers_books_partitioned")
@@ -0,0 +1,58 @@
+"""add due_date to readers_books and job_watermarks
+
+Revision ID: 8b41d0e6a2f7
+Revises: 5f2a9c1d7e34
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b41d0e6a2f7"
+down_revision: Union[str, None] = "5f2a9c1d7e34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "readers_books",
+        sa.Column("due_date", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.execute(
+        "UPDATE readers_books"
+        " SET due_date = borrow_date + interval '14 days'"
+    )
+    op.alter_column(
+        "readers_books",
+        "due_date",
+        nullable=False,
+        server_default=sa.text("now() + interval '14 days'"),
+    )
+    op.create_index(
+        "ix_readers_books_open_due",
+        "readers_books",
+        ["due_date", "id"],
+        postgresql_where=sa.text("return_date IS NULL"),
+    )
+    op.create_table(
+        "job_watermarks",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column(
+            "watermark", sa.TIMESTAMP(timezone=True), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("job_watermarks")
+    op.drop_index("ix_readers_books_open_due", table_name="readers_books")
+    op.drop_column("readers_books", "due_date")
@@ -0,0 +1,71 @@
+"""add holds
+
+Revision ID: c7e93a5b1f08
+Revises: 8b41d0e6a2f7
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e93a5b1f08"
+down_revision: Union[str, None] = "8b41d0e6a2f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "holds",
+        sa.Column("reader_id", sa.Integer(), nullable=False),
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            sa.String(length=16),
+            server_default=sa.text("'waiting'"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("ready_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.CheckConstraint(
+            "status IN ('waiting', 'ready', 'fulfilled')",
+            name="check_hold_status",
+        ),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["reader_id"], ["readers.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_holds_queue",
+        "holds",
+        ["book_id", "created_at", "id"],
+        postgresql_where=sa.text("status = 'waiting'"),
+    )
+    op.create_index(
+        "uq_holds_active_reader_book",
+        "holds",
+        ["reader_id", "book_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('waiting', 'ready')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_holds_active_reader_book", table_name="holds")
+    op.drop_index("ix_holds_queue", table_name="holds")
+    op.drop_table("holds")
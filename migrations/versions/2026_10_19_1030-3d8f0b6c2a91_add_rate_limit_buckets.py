@@ -0,0 +1,39 @@
+"""add rate limit buckets
+
+Revision ID: 3d8f0b6c2a91
+Revises: c7e93a5b1f08
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d8f0b6c2a91"
+down_revision: Union[str, None] = "c7e93a5b1f08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=320), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("allowed", sa.Boolean(), nullable=False),
+        sa.Column(
+            "updated_at", sa.TIMESTAMP(timezone=True), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        prefixes=["UNLOGGED"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("rate_limit_buckets")
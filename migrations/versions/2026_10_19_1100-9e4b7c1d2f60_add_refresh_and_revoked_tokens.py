@@ -0,0 +1,77 @@
+"""add refresh and revoked tokens
+
+Revision ID: 9e4b7c1d2f60
+Revises: 3d8f0b6c2a91
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b7c1d2f60"
+down_revision: Union[str, None] = "3d8f0b6c2a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("librarian_id", sa.Integer(), nullable=False),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("family_id", sa.String(length=32), nullable=False),
+        sa.Column("access_jti", sa.String(length=32), nullable=False),
+        sa.Column(
+            "access_expires_at", sa.TIMESTAMP(timezone=True), nullable=False
+        ),
+        sa.Column("expires_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("revoked_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(
+            ["librarian_id"], ["librarian.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token_hash"),
+    )
+    op.create_index(
+        "ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"]
+    )
+    op.create_index(
+        "ix_refresh_tokens_librarian_id", "refresh_tokens", ["librarian_id"]
+    )
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(length=32), nullable=False),
+        sa.Column("expires_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "revoked_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("clock_timestamp()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(
+        "ix_revoked_tokens_revoked_at", "revoked_tokens", ["revoked_at"]
+    )
+    op.create_index(
+        "ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_revoked_tokens_expires_at", table_name="revoked_tokens")
+    op.drop_index("ix_revoked_tokens_revoked_at", table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
+    op.drop_index(
+        "ix_refresh_tokens_librarian_id", table_name="refresh_tokens"
+    )
+    op.drop_index("ix_refresh_tokens_family_id", table_name="refresh_tokens")
+    op.drop_table("refresh_tokens")
@@ -0,0 +1,74 @@
+"""add stats materialized views
+
+Revision ID: 5a2e8c4f7b13
+Revises: 9e4b7c1d2f60
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a2e8c4f7b13"
+down_revision: Union[str, None] = "9e4b7c1d2f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VIEWS = {
+    "mv_catalogue_availability": (
+        """
+        SELECT 1 AS id,
+               count(*) AS total_titles,
+               count(*) FILTER (WHERE copies_count = 0) AS zero_copy_titles,
+               coalesce(sum(copies_count), 0) AS available_copies,
+               (SELECT count(*) FROM readers_books
+                 WHERE return_date IS NULL) AS active_loans,
+               now() AS refreshed_at
+          FROM books
+        """,
+        "id",
+    ),
+    "mv_weekly_top_books": (
+        """
+        SELECT b.id AS book_id, b.title, b.author,
+               count(*) AS loans_count,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN books b ON b.id = rb.book_id
+         WHERE rb.borrow_date >= now() - interval '7 days'
+         GROUP BY b.id, b.title, b.author
+        """,
+        "book_id",
+    ),
+    "mv_reader_active_loans": (
+        """
+        SELECT r.id AS reader_id, r.name,
+               count(*) AS active_loans,
+               count(*) FILTER (WHERE rb.due_date < now()) AS overdue_loans,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN readers r ON r.id = rb.reader_id
+         WHERE rb.return_date IS NULL
+         GROUP BY r.id, r.name
+        """,
+        "reader_id",
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, (query, key) in VIEWS.items():
+        op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query}")
+        op.execute(
+            f"CREATE UNIQUE INDEX uq_{name}_{key} ON {name} ({key})"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(list(VIEWS)):
+        op.execute(f"DROP MATERIALIZED VIEW {name}")
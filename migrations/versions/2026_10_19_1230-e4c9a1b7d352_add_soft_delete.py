@@ -0,0 +1,146 @@
+"""add soft delete to books and readers
+
+Revision ID: e4c9a1b7d352
+Revises: b81f3d6e9a24
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4c9a1b7d352"
+down_revision: Union[str, None] = "b81f3d6e9a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OLD_VIEWS = {
+    "mv_catalogue_availability": (
+        """
+        SELECT 1 AS id,
+               count(*) AS total_titles,
+               count(*) FILTER (WHERE copies_count = 0) AS zero_copy_titles,
+               coalesce(sum(copies_count), 0) AS available_copies,
+               (SELECT count(*) FROM readers_books
+                 WHERE return_date IS NULL) AS active_loans,
+               now() AS refreshed_at
+          FROM books
+        """,
+        "id",
+    ),
+    "mv_weekly_top_books": (
+        """
+        SELECT b.id AS book_id, b.title, b.author,
+               count(*) AS loans_count,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN books b ON b.id = rb.book_id
+         WHERE rb.borrow_date >= now() - interval '7 days'
+         GROUP BY b.id, b.title, b.author
+        """,
+        "book_id",
+    ),
+    "mv_reader_active_loans": (
+        """
+        SELECT r.id AS reader_id, r.name,
+               count(*) AS active_loans,
+               count(*) FILTER (WHERE rb.due_date < now()) AS overdue_loans,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN readers r ON r.id = rb.reader_id
+         WHERE rb.return_date IS NULL
+         GROUP BY r.id, r.name
+        """,
+        "reader_id",
+    ),
+}
+
+NEW_VIEWS = {
+    "mv_catalogue_availability": (
+        """
+        SELECT 1 AS id,
+               count(*) AS total_titles,
+               count(*) FILTER (WHERE copies_count = 0) AS zero_copy_titles,
+               coalesce(sum(copies_count), 0) AS available_copies,
+               (SELECT count(*) FROM readers_books
+                 WHERE return_date IS NULL) AS active_loans,
+               now() AS refreshed_at
+          FROM books
+         WHERE deleted_at IS NULL
+        """,
+        "id",
+    ),
+    "mv_weekly_top_books": (
+        """
+        SELECT b.id AS book_id, b.title, b.author,
+               count(*) AS loans_count,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN books b ON b.id = rb.book_id
+         WHERE rb.borrow_date >= now() - interval '7 days'
+           AND b.deleted_at IS NULL
+         GROUP BY b.id, b.title, b.author
+        """,
+        "book_id",
+    ),
+    "mv_reader_active_loans": (
+        """
+        SELECT r.id AS reader_id, r.name,
+               count(*) AS active_loans,
+               count(*) FILTER (WHERE rb.due_date < now()) AS overdue_loans,
+               now() AS refreshed_at
+          FROM readers_books rb
+          JOIN readers r ON r.id = rb.reader_id
+         WHERE rb.return_date IS NULL
+           AND r.deleted_at IS NULL
+         GROUP BY r.id, r.name
+        """,
+        "reader_id",
+    ),
+}
+
+
+def replace_views(views: dict) -> None:
+    """Пересоздаёт представления статистики."""
+    for name, (query, key) in views.items():
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name}")
+        op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query}")
+        op.execute(
+            f"CREATE UNIQUE INDEX uq_{name}_{key} ON {name} ({key})"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in (("books", "isbn"), ("readers", "email")):
+        op.add_column(
+            table,
+            sa.Column("deleted_at", sa.TIMESTAMP(timezone=True),
+                      nullable=True),
+        )
+        op.drop_constraint(f"{table}_{column}_key", table, type_="unique")
+        op.create_index(
+            f"uq_{table}_{column}_live", table, [column],
+            unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+        op.create_index(
+            f"ix_{table}_deleted", table, ["deleted_at", "id"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+        )
+    replace_views(NEW_VIEWS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    replace_views(OLD_VIEWS)
+    for table, column in (("books", "isbn"), ("readers", "email")):
+        op.execute(f"DELETE FROM {table} WHERE deleted_at IS NOT NULL")
+        op.drop_index(f"ix_{table}_deleted", table_name=table)
+        op.drop_index(f"uq_{table}_{column}_live", table_name=table)
+        op.create_unique_constraint(f"{table}_{column}_key", table, [column])
+        op.drop_column(table, "deleted_at")
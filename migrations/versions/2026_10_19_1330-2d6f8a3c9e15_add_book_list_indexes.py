@@ -0,0 +1,44 @@
+"""add composite indexes for book list sorting and filters
+
+Revision ID: 2d6f8a3c9e15
+Revises: 7c3e5a9d1b48
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d6f8a3c9e15"
+down_revision: Union[str, None] = "7c3e5a9d1b48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_books_title_id": (["title", "id"], "deleted_at IS NULL"),
+    "ix_books_author_title_id": (
+        ["author", "title", "id"], "deleted_at IS NULL"
+    ),
+    "ix_books_year_id": (["publication_year", "id"], "deleted_at IS NULL"),
+    "ix_books_available_id": (
+        ["id"], "deleted_at IS NULL AND copies_count > 0"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, (columns, where) in INDEXES.items():
+        op.create_index(
+            name, "books", columns, postgresql_where=sa.text(where)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in INDEXES:
+        op.drop_index(name, table_name="books")
@@ -0,0 +1,101 @@
+"""make reader and librarian emails unique case-insensitively
+
+Revision ID: f1b7d4e2c6a9
+Revises: 2d6f8a3c9e15
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b7d4e2c6a9"
+down_revision: Union[str, None] = "2d6f8a3c9e15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Замороженная копия запросов lib_api/business_models/jobs/email_dedup.py
+# на момент этой ревизии: миграция не зависит от кода приложения.
+DEDUP = (
+    "LOCK TABLE readers, librarian, holds, readers_books"
+    " IN SHARE ROW EXCLUSIVE MODE",
+    """
+    CREATE TEMP TABLE reader_email_merge ON COMMIT DROP AS
+    SELECT id, min(id) OVER (PARTITION BY lower(email)) AS keeper
+      FROM readers
+     WHERE deleted_at IS NULL
+    """,
+    """
+    DELETE FROM holds h
+     USING (
+           SELECT h.id,
+                  row_number() OVER (
+                      PARTITION BY m.keeper, h.book_id
+                      ORDER BY h.status = 'ready' DESC, h.created_at, h.id
+                  ) AS rn
+             FROM holds h
+             JOIN reader_email_merge m ON m.id = h.reader_id
+            WHERE h.status IN ('waiting', 'ready')
+           ) ranked
+     WHERE h.id = ranked.id AND ranked.rn > 1
+    """,
+    """
+    UPDATE holds t SET reader_id = m.keeper
+      FROM reader_email_merge m
+     WHERE t.reader_id = m.id AND m.id <> m.keeper
+    """,
+    """
+    UPDATE readers_books t SET reader_id = m.keeper
+      FROM reader_email_merge m
+     WHERE t.reader_id = m.id AND m.id <> m.keeper
+    """,
+    """
+    UPDATE readers r SET deleted_at = now()
+      FROM reader_email_merge m
+     WHERE r.id = m.id AND m.id <> m.keeper
+    """,
+    """
+    DELETE FROM librarian l
+     USING (
+           SELECT id, min(id) OVER (PARTITION BY lower(email)) AS keeper
+             FROM librarian
+           ) d
+     WHERE l.id = d.id AND d.id <> d.keeper
+    """,
+    "UPDATE readers SET email = lower(email) WHERE email <> lower(email)",
+    "UPDATE librarian SET email = lower(email) WHERE email <> lower(email)",
+    "DROP TABLE reader_email_merge",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in DEDUP:
+        op.execute(statement)
+    op.drop_index("uq_readers_email_live", table_name="readers")
+    op.create_index(
+        "uq_readers_email_lower_live", "readers", [sa.text("lower(email)")],
+        unique=True,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.drop_constraint("librarian_email_key", "librarian", type_="unique")
+    op.create_index(
+        "uq_librarian_email_lower", "librarian", [sa.text("lower(email)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_librarian_email_lower", table_name="librarian")
+    op.create_unique_constraint("librarian_email_key", "librarian", ["email"])
+    op.drop_index("uq_readers_email_lower_live", table_name="readers")
+    op.create_index(
+        "uq_readers_email_live", "readers", ["email"],
+        unique=True,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
@@ -0,0 +1,33 @@
+"""drop fixed 14 days server default of readers_books.due_date
+
+Revision ID: a9c2e5f7b310
+Revises: f1b7d4e2c6a9
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9c2e5f7b310"
+down_revision: Union[str, None] = "f1b7d4e2c6a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column("readers_books", "due_date", server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "readers_books",
+        "due_date",
+        server_default=sa.text("now() + interval '14 days'"),
+    )
@@ -0,0 +1,43 @@
+"""add expired hold status and ready_at index
+
+Revision ID: 6e8b1d3f5a27
+Revises: a9c2e5f7b310
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e8b1d3f5a27"
+down_revision: Union[str, None] = "a9c2e5f7b310"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint("check_hold_status", "holds", type_="check")
+    op.create_check_constraint(
+        "check_hold_status", "holds",
+        "status IN ('waiting', 'ready', 'fulfilled', 'expired')",
+    )
+    op.create_index(
+        "ix_holds_ready_at", "holds", ["ready_at", "id"],
+        postgresql_where=sa.text("status = 'ready'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_holds_ready_at", table_name="holds")
+    op.execute("DELETE FROM holds WHERE status = 'expired'")
+    op.drop_constraint("check_hold_status", "holds", type_="check")
+    op.create_check_constraint(
+        "check_hold_status", "holds",
+        "status IN ('waiting', 'ready', 'fulfilled')",
+    )
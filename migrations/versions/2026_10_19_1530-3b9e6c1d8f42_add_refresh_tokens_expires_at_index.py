@@ -0,0 +1,30 @@
+"""add refresh_tokens expires_at index for purging expired tokens
+
+Revision ID: 3b9e6c1d8f42
+Revises: 6e8b1d3f5a27
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e6c1d8f42"
+down_revision: Union[str, None] = "6e8b1d3f5a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
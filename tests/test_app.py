@@ -19,6 +19,7 @@ test_routes = [
      {"title": "Test Book", "author": "Author", "publication_year": 2020,
       "isbn": "123", "copies_count": 1}),
     ("get", "/api/librarian", None),
+    ("get", "/api/books?sort=title", None),
     ("get", "/api/book/1", None),
     ("put", "/api/book/update/1",
      {"title": "Updated Book", "author": "Author", "publication_year": 2021,
@@ -27,6 +28,24 @@ test_routes = [
     ("post", "/api/librarian/borrow", {"reader_id": 1, "book_id": 1}),
     ("post", "/api/librarian/return", {"borrow_id": 1}),
     ("get", "/api/reader/1/borrowed", None),
+    ("get", "/api/reader/1/history", None),
+    ("get", "/api/book/1/history", None),
+    ("get", "/api/loans/overdue", None),
+    ("post", "/api/book/1/hold", {"reader_id": 1}),
+    ("post", "/api/librarian/refresh", {"refresh_token": "x"}),
+    ("post", "/api/librarian/logout", {"refresh_token": "x"}),
+    ("get", "/api/books/batch?ids=1,2", None),
+    ("get", "/api/readers/batch?ids=1,2", None),
+    ("post", "/api/readers/bulk",
+     [{"name": "Bulk Reader", "email": "bulk@example.com"}]),
+    ("get", "/api/stats/catalogue", None),
+    ("get", "/api/stats/top-books", None),
+    ("get", "/api/stats/reader-loans", None),
+    ("get", "/api/changes?since=0", None),
+    ("get", "/api/books/availability/stream?ids=1,2", None),
+    ("get", "/healthz", None),
+    ("get", "/readyz", None),
+    ("get", "/metrics/single-flight", None),
 ]
 
 
@@ -60,3 +79,21 @@ async def test_endpoint_access(client, method, path, json_data):
             f"Unexpected status code {response.status_code} for "
             f"{method.upper()} {path}"
         )
+
+
+@pytest.mark.asyncio
+@pytest.mark.app
+@pytest.mark.parametrize("header", ["X-Consistency", "Idempotency-Key"])
+async def test_cors_preflight_allows_header(client, header):
+    """Проверяет, что браузер может отправить заголовок с другого origin."""
+    response = await client.options(
+        "/api/librarian/borrow",
+        headers={
+            "Origin": "http://localhost:8000",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": header,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    allowed = response.headers["access-control-allow-headers"].lower()
+    assert header.lower() in allowed
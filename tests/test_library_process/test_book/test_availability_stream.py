@@ -0,0 +1,251 @@
+"""Тесты для потока доступности книг (SSE, LISTEN/NOTIFY)."""
+
+import asyncio
+
+import asyncpg
+import pytest
+from fastapi import status
+from lib_api.app import app
+from lib_api.business_models.availability.availability_hub import (
+    AvailabilityHub, open_availability_stream)
+from lib_api.business_models.library_models.batch_loader import \
+    BATCH_MAX_IDS
+from lib_api.business_models.library_models.book_crud.update_book import \
+    update_book_data
+from lib_api.business_models.library_models.borrow_return_service import \
+    borrow_book as borrow_service
+from lib_api.business_models.library_models.models_lib import Book, Reader
+from lib_api.database import get_read_session_db, get_session_db
+from lib_api.schemas.availability_serialization import AvailabilityEvent
+from lib_api.schemas.book_serialization import BookUpdate
+from sqlalchemy import text, update
+
+
+async def create_book_and_reader(session_factory, copies=1):
+    """Создаёт книгу и читателя."""
+    async with session_factory() as db:
+        book = Book(title="Live", author="Author L", copies_count=copies)
+        reader = Reader(name="Live Reader", email="live@example.com")
+        db.add_all([book, reader])
+        await db.commit()
+        return book.id, reader.id
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_hub_fans_out_and_drops_slow_subscriber():
+    """
+    Проверяет раздачу событий и отключение медленного подписчика.
+
+    Подписчик другой книги событий не получает.
+    """
+    hub = AvailabilityHub(queue_size=2)
+    fast = hub.subscribe([1])
+    slow = hub.subscribe([1, 2])
+    other = hub.subscribe([3])
+
+    for count in range(3):
+        hub.publish(AvailabilityEvent(book_id=1, copies_count=count))
+        await fast.queue.get()
+
+    assert slow.dropped is True
+    assert slow.queue.get_nowait() is None
+    assert fast.dropped is False
+    assert other.queue.empty()
+    assert hub.subscriber_count() == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_borrow_notifies_listener(engine, session_factory):
+    """
+    Проверяет доставку NOTIFY от выдачи через одно соединение LISTEN.
+
+    Неудачная выдача (нет копий) уведомления не отправляет.
+    """
+    book_id, reader_id = await create_book_and_reader(session_factory)
+    hub = AvailabilityHub()
+    ready = asyncio.Event()
+    listener = asyncio.create_task(hub.listen(engine, ready))
+    try:
+        await asyncio.wait_for(ready.wait(), 5)
+        subscriber = hub.subscribe([book_id])
+        async with session_factory() as db:
+            await borrow_service.borrow_book(book_id, reader_id, db)
+        event = await asyncio.wait_for(subscriber.queue.get(), 5)
+        assert event == AvailabilityEvent(book_id=book_id, copies_count=0)
+
+        async with session_factory() as db:
+            with pytest.raises(Exception):
+                await borrow_service.borrow_book(book_id, reader_id, db)
+        await asyncio.sleep(0.2)
+        assert subscriber.queue.empty()
+    finally:
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_book_update_notifies_new_copies_count(engine, session_factory):
+    """Проверяет, что правка числа копий уведомляет о новом значении."""
+    book_id, _ = await create_book_and_reader(session_factory, copies=2)
+    hub = AvailabilityHub()
+    ready = asyncio.Event()
+    listener = asyncio.create_task(hub.listen(engine, ready))
+    try:
+        await asyncio.wait_for(ready.wait(), 5)
+        subscriber = hub.subscribe([book_id])
+        async with session_factory() as db:
+            await update_book_data(
+                book_id=book_id, book_in=BookUpdate(copies_count=5), db=db
+            )
+        event = await asyncio.wait_for(subscriber.queue.get(), 5)
+        assert event == AvailabilityEvent(book_id=book_id, copies_count=5)
+    finally:
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_stream_sends_snapshot_then_updates(db_session):
+    """
+    Проверяет поток SSE: текущее состояние, изменение, отключение.
+
+    После отключения подписка снимается.
+    """
+    book = Book(title="Stream", author="Author S", copies_count=4)
+    db_session.add(book)
+    await db_session.commit()
+    book_id = book.id
+    hub = AvailabilityHub(queue_size=1)
+
+    stream = await open_availability_stream(
+        [book_id, book_id], db_session, hub
+    )
+    assert await anext(stream) == (
+        "event: availability\n"
+        f'data: {{"book_id":{book_id},"copies_count":4}}\n\n'
+    )
+    hub.publish(AvailabilityEvent(book_id=book_id, copies_count=3))
+    assert '"copies_count":3' in await anext(stream)
+
+    hub.publish(AvailabilityEvent(book_id=book_id, copies_count=2))
+    hub.publish(AvailabilityEvent(book_id=book_id, copies_count=1))
+    assert await anext(stream) == "event: dropped\ndata: {}\n\n"
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert hub.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_stream_rejects_too_many_ids(
+        client, create_and_authenticate_librarian
+):
+    """Проверяет ошибку 400 при подписке на слишком много книг."""
+    librarian, token = create_and_authenticate_librarian
+    ids = ",".join(str(i) for i in range(1, BATCH_MAX_IDS + 2))
+    response = await client.get(
+        "/api/books/availability/stream", params={"ids": ids},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.book
+def test_stream_snapshot_reads_primary():
+    """Проверяет, что снимок потока читается с основной базы."""
+    route = next(
+        route for route in app.routes
+        if getattr(route, "path", "") == "/api/books/availability/stream"
+    )
+    calls = {dep.call for dep in route.dependant.dependencies}
+    assert get_session_db in calls
+    assert get_read_session_db not in calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_listener_reconnects_and_resyncs(engine, session_factory):
+    """
+    Проверяет переподключение LISTEN после обрыва соединения.
+
+    Изменение, сделанное во время обрыва, приходит подписчику
+    после переподключения, новые NOTIFY снова доставляются.
+    """
+    book_id, reader_id = await create_book_and_reader(
+        session_factory, copies=3
+    )
+    hub = AvailabilityHub()
+    ready = asyncio.Event()
+    listener = asyncio.create_task(
+        hub.listen(engine, ready, ping_seconds=0.2, reconnect_seconds=0.05)
+    )
+    try:
+        await asyncio.wait_for(ready.wait(), 5)
+        subscriber = hub.subscribe([book_id])
+        ready.clear()
+        async with session_factory() as db:
+            await db.execute(text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity"
+                " WHERE query LIKE 'LISTEN%' AND pid <> pg_backend_pid()"
+            ))
+            await db.execute(
+                update(Book).where(Book.id == book_id).values(copies_count=7)
+            )
+            await db.commit()
+
+        await asyncio.wait_for(ready.wait(), 5)
+        event = await asyncio.wait_for(subscriber.queue.get(), 5)
+        assert event == AvailabilityEvent(book_id=book_id, copies_count=7)
+
+        async with session_factory() as db:
+            await borrow_service.borrow_book(book_id, reader_id, db)
+        event = await asyncio.wait_for(subscriber.queue.get(), 5)
+        assert event == AvailabilityEvent(book_id=book_id, copies_count=6)
+    finally:
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_listener_survives_driver_error(
+        engine, session_factory, monkeypatch
+):
+    """Проверяет переподключение после ошибки вызова драйвера asyncpg."""
+    book_id, reader_id = await create_book_and_reader(session_factory)
+    add_listener = asyncpg.Connection.add_listener
+    failures = []
+
+    async def flaky_add_listener(self, *args):
+        if not failures:
+            failures.append(1)
+            raise asyncpg.InterfaceError("connection is closed")
+        return await add_listener(self, *args)
+
+    monkeypatch.setattr(
+        asyncpg.Connection, "add_listener", flaky_add_listener
+    )
+    hub = AvailabilityHub()
+    ready = asyncio.Event()
+    listener = asyncio.create_task(
+        hub.listen(engine, ready, reconnect_seconds=0.05)
+    )
+    try:
+        await asyncio.wait_for(ready.wait(), 5)
+        subscriber = hub.subscribe([book_id])
+        async with session_factory() as db:
+            await borrow_service.borrow_book(book_id, reader_id, db)
+        event = await asyncio.wait_for(subscriber.queue.get(), 5)
+        assert event == AvailabilityEvent(book_id=book_id, copies_count=0)
+        assert failures == [1]
+    finally:
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
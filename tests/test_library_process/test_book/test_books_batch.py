@@ -0,0 +1,175 @@
+"""Тесты пакетной выборки книг по списку ID."""
+
+import asyncio
+
+import pytest
+from fastapi import status
+from lib_api.business_models.library_models import batch_loader
+from lib_api.business_models.library_models.batch_loader import BATCH_MAX_IDS
+from lib_api.business_models.library_models.book_crud.book_by_id import \
+    get_book_by_id
+from lib_api.business_models.library_models.models_lib import Book, Reader
+from lib_api.business_models.library_models.reader_crud.reader_by_id import \
+    get_reader_by_id
+from sqlalchemy import event
+
+
+async def create_books(db_session, count):
+    """Создаёт заданное число книг."""
+    books = [
+        Book(title=f"Book {i}", author="Author", publication_year=2020,
+             isbn=f"batch{i}", copies_count=1)
+        for i in range(count)
+    ]
+    db_session.add_all(books)
+    await db_session.commit()
+    return books
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_books_batch_preserves_order_and_reports_missing(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Проверяет порядок книг и список ненайденных ID."""
+    _, token = create_and_authenticate_librarian
+    books = await create_books(db_session, 3)
+    missing = books[-1].id + 100
+    ids = [books[2].id, missing, books[0].id, books[2].id]
+
+    response = await client.get(
+        f"/api/books/batch?ids={','.join(map(str, ids))}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [
+        books[2].id, books[0].id
+    ]
+    assert data["missing_ids"] == [missing]
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_books_batch_single_query(
+        client, db_session, engine, create_and_authenticate_librarian
+):
+    """Проверяет, что пачка загружается одним запросом с ANY."""
+    _, token = create_and_authenticate_librarian
+    books = await create_books(db_session, 20)
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = await client.get(
+            f"/api/books/batch?ids={','.join(str(b.id) for b in books)}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["items"]) == 20
+    selects = [s for s in statements if s.lstrip().startswith("SELECT")]
+    assert len(selects) == 1
+    assert "= ANY (" in selects[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+@pytest.mark.parametrize("ids, st_code", [
+    ("1,x", status.HTTP_422_UNPROCESSABLE_ENTITY),
+    (",", status.HTTP_422_UNPROCESSABLE_ENTITY),
+    (",".join(str(i) for i in range(BATCH_MAX_IDS + 1)),
+     status.HTTP_400_BAD_REQUEST),
+])
+async def test_books_batch_rejects_bad_ids(
+        client, create_and_authenticate_librarian, ids, st_code
+):
+    """Проверяет отказ для нечисловых, пустых и слишком длинных списков."""
+    _, token = create_and_authenticate_librarian
+
+    response = await client.get(
+        f"/api/books/batch?ids={ids}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == st_code
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_concurrent_get_book_by_id_coalesced(db_session, engine):
+    """Проверяет объединение одновременных get_book_by_id в один запрос."""
+    books = await create_books(db_session, 3)
+    book_ids = [book.id for book in books]
+    # Иначе книги возьмутся из identity map сессии без запроса.
+    db_session.expunge_all()
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        loaded = await asyncio.gather(
+            *(get_book_by_id(book_id, db_session) for book_id in book_ids)
+        )
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    assert [book.id for book in loaded] == book_ids
+    book_selects = [
+        s for s in statements if s.lstrip().startswith("SELECT books.")
+    ]
+    assert len(book_selects) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_concurrent_book_and_reader_loads_share_session(
+        db_session, monkeypatch
+):
+    """
+    Проверяет одновременную загрузку книг и читателей в одной сессии.
+
+    Отправки загрузчиков двух моделей не выполняются параллельно.
+    """
+    books = await create_books(db_session, 2)
+    readers = [
+        Reader(name=f"Reader {i}", email=f"batch{i}@example.com")
+        for i in range(2)
+    ]
+    db_session.add_all(readers)
+    await db_session.commit()
+    db_session.expunge_all()
+    active, overlaps = [], []
+    fetch = batch_loader.fetch_by_ids
+
+    async def tracked_fetch(*args, **kwargs):
+        active.append(1)
+        overlaps.append(len(active))
+        await asyncio.sleep(0.01)
+        try:
+            return await fetch(*args, **kwargs)
+        finally:
+            active.pop()
+
+    monkeypatch.setattr(batch_loader, "fetch_by_ids", tracked_fetch)
+    loaded = await asyncio.gather(
+        *(get_book_by_id(book.id, db_session) for book in books),
+        *(get_reader_by_id(reader.id, db_session) for reader in readers),
+    )
+
+    assert [row.id for row in loaded] == [
+        *(book.id for book in books), *(reader.id for reader in readers)
+    ]
+    assert overlaps == [1, 1]
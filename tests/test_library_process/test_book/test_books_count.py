@@ -0,0 +1,123 @@
+"""Тесты для стратегий подсчёта total в списке книг."""
+
+import pytest
+from fastapi import status
+from fastapi_pagination import Params
+from lib_api.business_models.library_models.models_lib import Book
+from lib_api.business_models.pagination import counted
+from lib_api.business_models.pagination.counted import (count_cache,
+                                                        paginate_counted)
+from lib_api.schemas.book_serialization import BookResponse
+from sqlalchemy import event, select, text
+
+
+async def add_books(db_session, count, prefix="Count"):
+    """Создаёт count книг."""
+    db_session.add_all([
+        Book(title=f"{prefix} {i}", author="Author C", copies_count=1)
+        for i in range(count)
+    ])
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_cached_count_skips_count_query(client, db_session, engine):
+    """
+    Проверяет, что повторный запрос берёт total из кэша.
+
+    Второй запрос страницы не выполняет count(*).
+    """
+    await add_books(db_session, 3)
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        first = await client.get("/api/librarian")
+        second = await client.get("/api/librarian", params={"page": 2,
+                                                            "size": 2})
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    assert first.status_code == status.HTTP_200_OK
+    assert first.json()["total"] == 3
+    assert first.json()["count_strategy"] == "cached"
+    assert second.json()["total"] == 3
+    assert len(second.json()["items"]) == 1
+    assert sum("count(" in statement for statement in statements) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_cached_count_invalidated_on_write(client, db_session):
+    """
+    Проверяет сброс кэша при добавлении и удалении книг.
+
+    total сразу отражает новые и удалённые строки.
+    """
+    await add_books(db_session, 2)
+    response = await client.get("/api/librarian")
+    assert response.json()["total"] == 2
+
+    await add_books(db_session, 1, prefix="New")
+    response = await client.get("/api/librarian")
+    assert response.json()["total"] == 3
+
+    book = await db_session.scalar(select(Book).limit(1))
+    await db_session.delete(book)
+    await db_session.commit()
+    response = await client.get("/api/librarian")
+    assert response.json()["total"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_approximate_count_uses_reltuples(
+        db_session, engine, monkeypatch
+):
+    """
+    Проверяет approximate подсчёт по pg_class.reltuples.
+
+    Оценка берётся из статистики после ANALYZE,
+    на маленькой таблице используется точный count(*).
+    """
+    await add_books(db_session, 4)
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE books"))
+        await conn.commit()
+    await add_books(db_session, 1, prefix="Unanalyzed")
+    params = Params(page=1, size=2)
+    query = select(Book).order_by(Book.id)
+
+    monkeypatch.setattr(counted, "APPROXIMATE_MIN_ROWS", 1)
+    page = await paginate_counted(
+        db_session, query, params, BookResponse, Book, "approximate"
+    )
+    assert page.count_strategy == "approximate"
+    assert page.total == 4
+    assert page.pages == 2
+    assert len(page.items) == 2
+
+    monkeypatch.setattr(counted, "APPROXIMATE_MIN_ROWS", 10000)
+    page = await paginate_counted(
+        db_session, query, params, BookResponse, Book, "approximate"
+    )
+    assert page.total == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_exact_count_ignores_cache(db_session):
+    """Проверяет, что exact всегда считает строки заново."""
+    await add_books(db_session, 2)
+    count_cache.set(Book.__tablename__, 100)
+    page = await paginate_counted(
+        db_session, select(Book), Params(), BookResponse, Book, "exact"
+    )
+    assert page.total == 2
+    assert page.count_strategy == "exact"
@@ -0,0 +1,96 @@
+"""Тесты удаления книг и читателей каскадом базы."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from lib_api.business_models.jobs.soft_delete_purge import purge_batch
+from lib_api.business_models.library_models.models_lib import (Book, Reader,
+                                                               ReaderBook)
+from sqlalchemy import event, func, select, update
+
+
+async def add_history(db_session, loans):
+    """Создаёт книгу и читателя с loans закрытыми выдачами."""
+    book = Book(title="Cascade", author="Author C", copies_count=1)
+    reader = Reader(name="Cascade Reader", email="cascade@example.com")
+    db_session.add_all([book, reader])
+    await db_session.flush()
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    db_session.add_all([
+        ReaderBook(
+            reader_id=reader.id, book_id=book.id,
+            borrow_date=start + timedelta(seconds=i),
+            return_date=start + timedelta(seconds=i + 1),
+        )
+        for i in range(loans)
+    ])
+    await db_session.commit()
+    db_session.expunge_all()
+    return book.id, reader.id
+
+
+class StatementLog:
+    """Собирает SQL-выражения движка внутри блока with."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = []
+
+    def collect(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.collect)
+        return self.statements
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.collect)
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+@pytest.mark.parametrize("loans", [1, 200])
+async def test_orm_delete_is_single_statement(db_session, engine, loans):
+    """
+    Удаление загруженной книги — один DELETE при любой истории.
+
+    История выдач не загружается и не удаляется построчно,
+    её строки удаляет ON DELETE CASCADE базы.
+    """
+    book_id, _ = await add_history(db_session, loans)
+    book = await db_session.get(Book, book_id)
+
+    with StatementLog(engine) as statements:
+        await db_session.delete(book)
+        await db_session.commit()
+
+    assert len(statements) == 1
+    assert statements[0].startswith("DELETE FROM books")
+    history = await db_session.scalar(
+        select(func.count()).select_from(ReaderBook)
+    )
+    assert history == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+@pytest.mark.parametrize("loans", [1, 200])
+async def test_purge_batch_is_single_statement(db_session, engine, loans):
+    """Пачка очистки — один DELETE независимо от истории читателя."""
+    _, reader_id = await add_history(db_session, loans)
+    await db_session.execute(
+        update(Reader)
+        .where(Reader.id == reader_id)
+        .values(deleted_at=func.now())
+    )
+    await db_session.commit()
+
+    with StatementLog(engine) as statements:
+        assert await purge_batch(db_session, Reader) == 1
+
+    assert len(statements) == 1
+    assert statements[0].startswith("DELETE FROM readers")
+    history = await db_session.scalar(
+        select(func.count()).select_from(ReaderBook)
+    )
+    assert history == 0
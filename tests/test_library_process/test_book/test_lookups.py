@@ -0,0 +1,133 @@
+"""Тесты для заранее построенных запросов выборки по ключу."""
+
+import pytest
+from lib_api.app import WARM_UP_STATEMENTS
+from lib_api.business_models.librarian.librarian_model import (
+    LIBRARIAN_BY_EMAIL, Librarian)
+from lib_api.business_models.library_models.book_crud.check_isbn import \
+    get_book_by_isbn
+from lib_api.business_models.library_models.lookups import (
+    BOOK_BY_ISBN, BOOK_ID_EXISTS, READER_BY_EMAIL, READER_ID_EXISTS,
+    by_ids_statement)
+from lib_api.business_models.library_models.models_lib import Book, Reader
+from lib_api.business_models.library_models.reader_crud.reader_by_mail import \
+    get_reader_by_email
+from lib_api.database import warm_up_pool
+from sqlalchemy import event, func
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_lookups_find_and_miss(
+        db_session, create_and_authenticate_librarian
+):
+    """Проверяет выборки по isbn и email через готовые запросы."""
+    book = Book(title="Lookup", author="Author L", isbn="lookup-isbn")
+    reader = Reader(name="Lookup", email="lookup@example.com", note="")
+    db_session.add_all([book, reader])
+    await db_session.commit()
+
+    assert (await get_book_by_isbn("lookup-isbn", db_session)).id == book.id
+    assert await get_book_by_isbn("missing", db_session) is None
+    found = await get_reader_by_email("lookup@example.com", db_session)
+    assert found.id == reader.id
+    assert await get_reader_by_email("no@example.com", db_session) is None
+    librarian = await Librarian.get_librarian_by_email(
+        db=db_session, email="test@example.com"
+    )
+    assert librarian.email == "test@example.com"
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_prebuilt_statement_hits_compiled_cache(db_session):
+    """
+    Проверяет, что готовый запрос компилируется один раз.
+
+    Повторные выполнения с другими параметрами берут SQL из кэша.
+    """
+    conn = await db_session.connection()
+    await conn.execute(BOOK_BY_ISBN, {"isbn": "first"})
+    result = await conn.execute(BOOK_BY_ISBN, {"isbn": "second"})
+    assert result.context.cache_hit == CACHE_HIT
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+@pytest.mark.parametrize("stmt, params", [
+    (BOOK_BY_ISBN, {"isbn": "x"}),
+    (READER_BY_EMAIL, {"email": "x@example.com"}),
+    (BOOK_ID_EXISTS, {"book_id": 1}),
+    (READER_ID_EXISTS, {"reader_id": 1}),
+    (LIBRARIAN_BY_EMAIL, {"email": "x@example.com"}),
+    (by_ids_statement(Book), {"ids": [1]}),
+    (by_ids_statement(Reader, True), {"ids": [1]}),
+])
+async def test_prebuilt_statement_keeps_cache_key(db_session, stmt, params):
+    """
+    Проверяет, что хуки сессии не перестраивают готовый запрос.
+
+    Выполняется тот же объект, поэтому ключ кэша SQLAlchemy
+    вычисляется один раз, а не на каждом вызове.
+    """
+    executed = []
+
+    def capture(state):
+        executed.append(state.statement)
+
+    event.listen(Session, "do_orm_execute", capture)
+    try:
+        await db_session.execute(stmt, params)
+    finally:
+        event.remove(Session, "do_orm_execute", capture)
+    assert executed == [stmt]
+    assert stmt._generate_cache_key() is stmt._generate_cache_key()
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_prebuilt_lookups_skip_soft_deleted(db_session):
+    """Проверяет, что готовые запросы не находят удалённые записи."""
+    book = Book(title="Gone", author="Author G", isbn="gone-isbn")
+    reader = Reader(name="Gone", email="gone@example.com", note="")
+    db_session.add_all([book, reader])
+    await db_session.commit()
+    book.deleted_at = reader.deleted_at = func.now()
+    await db_session.commit()
+
+    assert await get_book_by_isbn("gone-isbn", db_session) is None
+    assert await get_reader_by_email("gone@example.com", db_session) is None
+    result = await db_session.execute(
+        by_ids_statement(Book), {"ids": [book.id]}
+    )
+    assert result.scalars().all() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_warm_up_compiles_prebuilt_lookups(engine):
+    """
+    Проверяет, что прогрев пула компилирует готовые запросы.
+
+    Первое выполнение после прогрева берёт SQL из кэша
+    нового движка.
+    """
+    fresh = create_async_engine(engine.url)
+    try:
+        await warm_up_pool(fresh, 1, WARM_UP_STATEMENTS)
+        async with fresh.connect() as conn:
+            for stmt, params in WARM_UP_STATEMENTS:
+                result = await conn.execute(stmt, params)
+                assert result.context.cache_hit == CACHE_HIT
+    finally:
+        await fresh.dispose()
+
+
+@pytest.mark.book
+def test_by_ids_statement_built_once():
+    """Проверяет, что запрос по списку ID строится один раз на модель."""
+    assert by_ids_statement(Book) is by_ids_statement(Book)
+    assert by_ids_statement(Book, True) is not by_ids_statement(Book)
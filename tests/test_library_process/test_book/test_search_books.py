@@ -0,0 +1,134 @@
+"""Тесты списка книг с фильтрами и сортировкой."""
+
+import pytest
+from fastapi import status
+from lib_api.business_models.library_models.models_lib import Book
+from sqlalchemy import event
+
+BOOKS = [
+    ("Dune", "Herbert", 1965, 2),
+    ("Children of Dune", "Herbert", 1976, 0),
+    ("Solaris", "Lem", 1961, 1),
+    ("Eden", "Lem", 1959, 3),
+    ("Anathem", "Stephenson", None, 1),
+]
+
+
+@pytest.fixture
+async def catalogue(db_session):
+    """Создаёт каталог книг разных авторов и лет."""
+    books = [
+        Book(title=title, author=author, publication_year=year,
+             copies_count=copies)
+        for title, author, year, copies in BOOKS
+    ]
+    db_session.add_all(books)
+    await db_session.commit()
+    return books
+
+
+class PlanLog:
+    """Записывает EXPLAIN выборок книг при enable_seqscan = off."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.plans = []
+
+    def explain(self, conn, cursor, statement, parameters, *args):
+        if not statement.startswith("SELECT books."):
+            return
+        cursor.execute("SET enable_seqscan = off")
+        cursor.execute("EXPLAIN " + statement, parameters)
+        self.plans.append("\n".join(row[0] for row in cursor.fetchall()))
+        cursor.execute("RESET enable_seqscan")
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.explain)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.explain)
+
+
+async def fetch_all(client, query: str, size: int = 2) -> list[str]:
+    """Обходит все страницы по next_cursor и собирает названия."""
+    titles, cursor = [], None
+    while True:
+        url = f"/api/books?{query}&size={size}"
+        if cursor:
+            url += f"&cursor={cursor}"
+        response = await client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        titles += [book["title"] for book in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return titles
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+@pytest.mark.parametrize("query, expected", [
+    ("sort=id", ["Anathem", "Eden", "Solaris", "Children of Dune", "Dune"]),
+    ("sort=title",
+     ["Anathem", "Children of Dune", "Dune", "Eden", "Solaris"]),
+    ("sort=title&order=desc",
+     ["Solaris", "Eden", "Dune", "Children of Dune", "Anathem"]),
+    ("sort=author",
+     ["Children of Dune", "Dune", "Eden", "Solaris", "Anathem"]),
+    ("sort=year", ["Eden", "Solaris", "Dune", "Children of Dune"]),
+    ("author=Lem&sort=title", ["Eden", "Solaris"]),
+    ("year_from=1960&year_to=1970&sort=year", ["Solaris", "Dune"]),
+    ("available=true&sort=title",
+     ["Anathem", "Dune", "Eden", "Solaris"]),
+    ("available=false", ["Children of Dune"]),
+])
+async def test_filters_and_keyset_pages(client, catalogue, query, expected):
+    """Проверяет фильтры, порядок и обход страниц по курсору."""
+    assert await fetch_all(client, query) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+@pytest.mark.parametrize("query", [
+    "sort=isbn", "sort=title;drop", "order=up", "year_from=abc",
+])
+async def test_params_outside_whitelist_rejected(client, query):
+    """Проверяет отказ 422 для параметров вне белого списка."""
+    response = await client.get(f"/api/books?{query}")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_invalid_cursor(client, catalogue):
+    """Проверяет отказ 400 для курсора другой сортировки."""
+    page = (await client.get("/api/books?sort=title&size=1")).json()
+
+    response = await client.get(
+        f"/api/books?sort=year&cursor={page['next_cursor']}"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"]["error_type"] == "InvalidCursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+@pytest.mark.parametrize("query, index", [
+    ("sort=title", "ix_books_title_id"),
+    ("sort=author", "ix_books_author_title_id"),
+    ("author=Lem&sort=title", "ix_books_author_title_id"),
+    ("sort=year&year_from=1960", "ix_books_year_id"),
+    ("available=true", "ix_books_available_id"),
+])
+async def test_sort_reads_index(client, engine, catalogue, query, index):
+    """Проверяет по EXPLAIN, что страницы читаются из индекса без Sort."""
+    first = (await client.get(f"/api/books?{query}&size=1")).json()
+    with PlanLog(engine) as log:
+        response = await client.get(
+            f"/api/books?{query}&size=1&cursor={first['next_cursor']}"
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(log.plans) == 1
+    assert index in log.plans[0]
+    assert "Sort" not in log.plans[0]
@@ -0,0 +1,253 @@
+"""Тесты объединения одинаковых одновременных чтений книг."""
+
+import asyncio
+
+import pytest
+from fastapi import status
+from lib_api.business_models.coalescing.single_flight import (
+    SingleFlight, shared_json, single_flight, wants_fresh_read)
+from lib_api.business_models.library_models.book_crud.book_by_id import \
+    get_book_by_id
+from lib_api.business_models.library_models.models_lib import Book
+from lib_api.schemas.book_serialization import BookResponse
+from sqlalchemy import event, update
+from starlette.requests import Request
+
+
+class SelectLog:
+    """Считает выборки строк books внутри блока with."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.count = 0
+
+    def collect(self, conn, cursor, statement, *args):
+        if statement.startswith("SELECT books."):
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.collect)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.collect)
+
+
+@pytest.fixture
+def slow_books_select(engine):
+    """Замедляет выборку книг, чтобы запросы пересеклись."""
+    def slow(conn, cursor, statement, *args):
+        if statement.startswith("SELECT books."):
+            cursor.execute("SELECT pg_sleep(0.1)")
+
+    event.listen(engine.sync_engine, "before_cursor_execute", slow)
+    yield
+    event.remove(engine.sync_engine, "before_cursor_execute", slow)
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_concurrent_book_reads_share_one_select(
+        client, db_session, engine, slow_books_select,
+        create_and_authenticate_librarian
+):
+    """
+    Одновременные GET одной книги выполняют одну выборку.
+
+    Все ответы одинаковы, метрики показывают долю объединённых.
+    """
+    book = Book(title="Popular", author="Author P", copies_count=3)
+    db_session.add(book)
+    await db_session.commit()
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    single_flight.reset()
+
+    with SelectLog(engine) as log:
+        responses = await asyncio.gather(*(
+            client.get(f"/api/book/{book.id}", headers=headers)
+            for _ in range(10)
+        ))
+
+    assert {r.status_code for r in responses} == {status.HTTP_200_OK}
+    assert {r.text for r in responses} == {responses[0].text}
+    assert responses[0].json()["title"] == "Popular"
+    assert log.count == 1
+
+    metrics = (await client.get("/metrics/single-flight")).json()
+    assert metrics["in_flight"] == 0
+    assert metrics["groups"]["book"] == {
+        "calls": 10, "executions": 1, "coalesced": 9, "timeouts": 0,
+        "ratio": 0.9,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_concurrent_missing_book_shares_error(
+        client, slow_books_select, create_and_authenticate_librarian
+):
+    """Ошибка общей выборки получают все участники."""
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    responses = await asyncio.gather(*(
+        client.get("/api/book/999", headers=headers) for _ in range(3)
+    ))
+
+    assert {r.status_code for r in responses} == {
+        status.HTTP_404_NOT_FOUND
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_first_page_is_shared(
+        client, db_session, engine, slow_books_select
+):
+    """
+    Первая страница списка книг выбирается один раз.
+
+    Остальные страницы не объединяются.
+    """
+    db_session.add_all([
+        Book(title=f"Page {i}", author="Author P", copies_count=1)
+        for i in range(3)
+    ])
+    await db_session.commit()
+
+    with SelectLog(engine) as log:
+        first = await asyncio.gather(*(
+            client.get("/api/librarian") for _ in range(5)
+        ))
+    assert log.count == 1
+    assert {r.text for r in first} == {first[0].text}
+    assert first[0].json()["total"] == 3
+
+    with SelectLog(engine) as log:
+        await asyncio.gather(*(
+            client.get("/api/librarian?page=2&size=1") for _ in range(3)
+        ))
+    assert log.count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_followers_survive_cancelled_leader(
+        db_session, session_factory, slow_books_select
+):
+    """
+    Отключение лидера не ломает ответ остальным участникам.
+
+    Общая выборка идёт в своей сессии, поэтому закрытие
+    сессии отменённого лидера её не затрагивает.
+    """
+    book = Book(title="Leader", author="Author L", copies_count=2)
+    db_session.add(book)
+    await db_session.commit()
+
+    async def load(session):
+        return BookResponse.model_validate(
+            await get_book_by_id(book.id, session)
+        )
+
+    async def read(db):
+        return await shared_json("leader", book.id, db, load)
+
+    leader_db = session_factory()
+    leader = asyncio.create_task(read(leader_db))
+    await asyncio.sleep(0.02)
+    async with session_factory() as first, session_factory() as second:
+        followers = asyncio.gather(read(first), read(second))
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        await leader_db.close()
+        responses = await followers
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert {r.body for r in responses} == {responses[0].body}
+    assert b'"title":"Leader"' in responses[0].body
+    assert single_flight.snapshot()["leader"]["executions"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_fresh_read_skips_flight_started_before_write(
+        db_session, session_factory
+):
+    """
+    Чтение своей записи не получает ответ выборки, начатой до неё.
+
+    Обычный участник той же выборки получает старые данные.
+    """
+    book = Book(title="Before", author="Author F", copies_count=1)
+    db_session.add(book)
+    await db_session.commit()
+    read_done = asyncio.Event()
+
+    async def slow_load(session):
+        loaded = BookResponse.model_validate(
+            await get_book_by_id(book.id, session)
+        )
+        read_done.set()
+        await asyncio.sleep(0.2)
+        return loaded
+
+    async def load(session):
+        return BookResponse.model_validate(
+            await get_book_by_id(book.id, session)
+        )
+
+    async def read(fresh):
+        async with session_factory() as db:
+            return await shared_json("fresh", book.id, db, load, fresh)
+
+    async with session_factory() as leader_db:
+        leader = asyncio.create_task(
+            shared_json("fresh", book.id, leader_db, slow_load)
+        )
+        await read_done.wait()
+        await db_session.execute(
+            update(Book).where(Book.id == book.id).values(title="After")
+        )
+        await db_session.commit()
+        joined, fresh = await asyncio.gather(read(False), read(True))
+        await leader
+
+    assert b'"title":"Before"' in joined.body
+    assert b'"title":"After"' in fresh.body
+
+
+@pytest.mark.book
+@pytest.mark.parametrize("headers, expected", [
+    ([], False),
+    ([(b"x-consistency", b"primary")], True),
+    ([(b"cookie", b"lib_lsn=0/16B3748")], True),
+])
+def test_wants_fresh_read(headers, expected):
+    """Проверяет признаки запроса, требующего чтения своей записи."""
+    request = Request({"type": "http", "headers": headers})
+    assert wants_fresh_read(request) is expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_waiter_runs_alone_after_timeout():
+    """Дольше timeout участник не ждёт и выполняет вызов сам."""
+    flight = SingleFlight(timeout=0.05)
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        number = len(calls)
+        await asyncio.sleep(0.2 if number == 1 else 0)
+        return number
+
+    results = await asyncio.gather(
+        flight.do("slow", 1, produce), flight.do("slow", 1, produce)
+    )
+
+    assert sorted(results) == [1, 2]
+    assert flight.snapshot()["slow"]["timeouts"] == 1
+    assert flight.snapshot()["slow"]["executions"] == 2
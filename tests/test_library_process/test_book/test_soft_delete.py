@@ -0,0 +1,161 @@
+"""Тесты мягкого удаления и фоновой очистки книг и читателей."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from lib_api.business_models.jobs.soft_delete_purge import \
+    purge_soft_deleted
+from lib_api.business_models.library_models.models_lib import (Book, Reader,
+                                                               ReaderBook)
+from sqlalchemy import event, func, select
+
+
+async def add_book_with_history(db_session, loans=3, isbn="soft-1"):
+    """Создаёт книгу, читателя и закрытые выдачи."""
+    book = Book(title="Soft", author="Author S", isbn=isbn, copies_count=1)
+    reader = Reader(name="Soft Reader", email=f"{isbn}@example.com")
+    db_session.add_all([book, reader])
+    await db_session.flush()
+    start = datetime.now(timezone.utc) - timedelta(days=loans + 1)
+    db_session.add_all([
+        ReaderBook(
+            reader_id=reader.id, book_id=book.id,
+            borrow_date=start + timedelta(days=i),
+            return_date=start + timedelta(days=i, hours=1),
+        )
+        for i in range(loans)
+    ])
+    await db_session.commit()
+    return book.id, reader.id
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_deleted_book_is_hidden(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Удалённая книга пропадает из выборок, но строка остаётся.
+
+    GET по ID отвечает 404, список её не содержит,
+    история выдач сохраняется до очистки.
+    """
+    book_id, _ = await add_book_with_history(db_session)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get("/api/librarian")
+    assert response.json()["total"] == 1
+
+    response = await client.delete(
+        f"/api/book/delete/{book_id}", headers=headers
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.get(f"/api/book/{book_id}", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = await client.get("/api/librarian")
+    assert response.json()["items"] == []
+    assert response.json()["total"] == 0
+
+    db_session.expunge_all()
+    assert await db_session.get(Book, book_id) is None
+    row = (await db_session.execute(
+        select(Book.deleted_at).where(Book.id == book_id),
+        execution_options={"include_deleted": True},
+    )).scalar_one()
+    assert row is not None
+    history = await db_session.scalar(
+        select(func.count()).select_from(ReaderBook)
+    )
+    assert history == 3
+
+    response = await client.delete(
+        f"/api/book/delete/{book_id}", headers=headers
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_deleted_book_isbn_can_be_reused(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Уникальность ISBN действует только среди неудалённых книг."""
+    book_id, _ = await add_book_with_history(db_session, loans=0)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await client.delete(f"/api/book/delete/{book_id}", headers=headers)
+    response = await client.post(
+        "/api/book/create",
+        json={"title": "Soft", "author": "Author S", "isbn": "soft-1"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["id"] != book_id
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_soft_delete_does_not_touch_history(
+        client, db_session, engine, create_and_authenticate_librarian
+):
+    """
+    Удаление не читает и не удаляет историю выдач.
+
+    Число SQL-выражений не зависит от длины истории.
+    """
+    book_id, _ = await add_book_with_history(db_session, loans=40)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    statements = []
+
+    def collect(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", collect)
+    try:
+        response = await client.delete(
+            f"/api/book/delete/{book_id}", headers=headers
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", collect)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    history_reads = [
+        s for s in statements
+        if "FROM readers_books" in s and "count(" not in s
+    ]
+    assert history_reads == []
+    assert not any(s.startswith("DELETE") for s in statements)
+
+
+@pytest.mark.asyncio
+@pytest.mark.book
+async def test_purge_removes_rows_with_history(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Очистка удаляет строки пачками, история уходит каскадом базы.
+
+    Неудалённые строки и строки моложе срока хранения остаются.
+    """
+    book_id, reader_id = await add_book_with_history(db_session, loans=5)
+    kept_id, _ = await add_book_with_history(db_session, isbn="soft-2")
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.delete(f"/api/book/delete/{book_id}", headers=headers)
+    await client.delete(f"/api/reader/{reader_id}", headers=headers)
+
+    assert await purge_soft_deleted(db_session, retention=3600) == 0
+    assert await purge_soft_deleted(db_session, batch_size=1) == 2
+
+    remaining = (await db_session.execute(
+        select(Book.id), execution_options={"include_deleted": True}
+    )).scalars().all()
+    assert remaining == [kept_id]
+    history = await db_session.scalar(
+        select(func.count()).select_from(ReaderBook)
+    )
+    assert history == 3
@@ -6,6 +6,25 @@ import pytest
 from fastapi import status
 from lib_api.business_models.library_models.models_lib import (Book, Reader,
                                                                ReaderBook)
+from sqlalchemy import event
+
+
+async def create_reader_with_loans(db_session, loans_count):
+    """Создаёт читателя с заданным числом активных выдач."""
+    reader = Reader(name="Reader Expand", email="expand@example.com")
+    books = [
+        Book(title=f"Expand {i}", author=f"Author {i}",
+             publication_year=2020, isbn=f"exp{i}", copies_count=1)
+        for i in range(loans_count)
+    ]
+    db_session.add(reader)
+    db_session.add_all(books)
+    await db_session.commit()
+    db_session.add_all(
+        ReaderBook(reader_id=reader.id, book_id=book.id) for book in books
+    )
+    await db_session.commit()
+    return reader, books
 
 
 @pytest.mark.asyncio
@@ -101,3 +120,84 @@ async def test_list_borrowed_books_unauthorized(client):
     reader_id = 1
     response = await client.get(f"/api/reader/{reader_id}/borrowed")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_list_borrowed_books_expand_book(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Проверяет данные книги в выдачах при expand=book."""
+    reader, books = await create_reader_with_loans(db_session, 2)
+    _, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    expanded = await client.get(
+        f"/api/reader/{reader.id}/borrowed?expand=book", headers=headers
+    )
+    plain = await client.get(
+        f"/api/reader/{reader.id}/borrowed", headers=headers
+    )
+
+    assert expanded.status_code == status.HTTP_200_OK
+    details = {
+        b["book_id"]: b["book"] for b in expanded.json()["borrowed_books"]
+    }
+    assert details == {
+        book.id: {"title": book.title, "author": book.author,
+                  "isbn": book.isbn}
+        for book in books
+    }
+    assert all(b["book"] is None for b in plain.json()["borrowed_books"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_list_borrowed_books_expand_query_count(
+        client, db_session, engine, create_and_authenticate_librarian
+):
+    """
+    Проверяет число запросов при expand=book.
+
+    Проверка читателя и один JOIN независимо от числа выдач,
+    без догрузки связей книг и читателей.
+    """
+    reader, _ = await create_reader_with_loans(db_session, 10)
+    _, token = create_and_authenticate_librarian
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = await client.get(
+            f"/api/reader/{reader.id}/borrowed?expand=book",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["borrowed_books"]) == 10
+    selects = [s for s in statements if s.lstrip().startswith("SELECT")]
+    assert len(selects) == 2
+    assert "JOIN books" in selects[1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_list_borrowed_books_invalid_expand(
+        client, create_and_authenticate_librarian
+):
+    """Проверяет отказ для неизвестного значения expand."""
+    _, token = create_and_authenticate_librarian
+
+    response = await client.get(
+        "/api/reader/1/borrowed?expand=reader",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -1,10 +1,16 @@
 """Тесты для процесса взятия книги читателем через API."""
 
+import asyncio
+
 import pytest
-from fastapi import status
+from fastapi import HTTPException, status
+from lib_api.business_models.library_models.borrow_return_service import \
+    borrow_book as borrow_service
+from lib_api.business_models.library_models.borrow_return_service import \
+    return_book as return_service
 from lib_api.business_models.library_models.models_lib import (Book, Reader,
                                                                ReaderBook)
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
 
 
 @pytest.mark.asyncio
@@ -179,3 +185,64 @@ async def test_borrow_book_unauthorized(client):
         "/api/librarian/borrow", json=payload
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_concurrent_borrows_and_returns_keep_copies(
+        db_session, session_factory
+):
+    """
+    Проверяет одновременные выдачи и возвраты одной книги.
+
+    Каждая операция идёт в своей сессии. Ни одно изменение
+    числа копий не теряется: копии в фонде и на руках
+    в сумме дают исходный тираж, последняя копия не выдаётся дважды.
+    """
+    lent, borrowers_count, copies = 6, 10, 2
+    book = Book(title="Contended", author="Author C", copies_count=copies)
+    readers = [
+        Reader(name=f"Reader {i}", email=f"contended{i}@example.com")
+        for i in range(lent + borrowers_count)
+    ]
+    db_session.add(book)
+    db_session.add_all(readers)
+    await db_session.flush()
+    loans = [
+        ReaderBook(reader_id=reader.id, book_id=book.id)
+        for reader in readers[:lent]
+    ]
+    db_session.add_all(loans)
+    await db_session.commit()
+
+    async def borrow(reader_id: int):
+        async with session_factory() as session:
+            return await borrow_service.borrow_book(
+                book.id, reader_id, session
+            )
+
+    async def give_back(borrow_id: int):
+        async with session_factory() as session:
+            return await return_service.return_book(borrow_id, session)
+
+    results = await asyncio.gather(
+        *(borrow(reader.id) for reader in readers[lent:]),
+        *(give_back(loan.id) for loan in loans),
+        return_exceptions=True,
+    )
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    assert all(
+        isinstance(err, HTTPException)
+        and err.detail["error_type"] == "NoCopiesBook"
+        for err in errors
+    )
+    active = await db_session.scalar(
+        select(func.count()).select_from(ReaderBook).where(
+            ReaderBook.book_id == book.id, ReaderBook.return_date.is_(None)
+        )
+    )
+    await db_session.refresh(book)
+    assert book.copies_count >= 0
+    assert book.copies_count + active == lent + copies
+    assert active == borrowers_count - len(errors)
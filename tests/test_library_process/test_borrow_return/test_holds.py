@@ -0,0 +1,318 @@
+"""Тесты для очереди резервов на книги."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException, status
+from lib_api.business_models.jobs.hold_expiry import expire_ready_holds
+from lib_api.business_models.library_models.hold_service.allocate_hold import \
+    allocate_returned_copy
+from lib_api.business_models.library_models.hold_service.place_hold import \
+    place_hold
+from lib_api.business_models.library_models.borrow_return_service import \
+    return_book as return_service
+from lib_api.business_models.library_models.models_lib import (HOLD_EXPIRED,
+                                                               HOLD_READY,
+                                                               HOLD_WAITING,
+                                                               Book, Hold,
+                                                               Reader,
+                                                               ReaderBook)
+from sqlalchemy import func, select, text
+
+
+async def create_book_and_readers(db_session, readers_count, copies=0):
+    """Создаёт книгу и заданное число читателей."""
+    book = Book(
+        title="Popular Book",
+        author="Author P",
+        publication_year=2024,
+        isbn="isbnP",
+        copies_count=copies
+    )
+    readers = [
+        Reader(name=f"Reader {i}", email=f"reader{i}@example.com")
+        for i in range(readers_count)
+    ]
+    db_session.add(book)
+    db_session.add_all(readers)
+    await db_session.commit()
+    return book, readers
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_place_hold_success(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет постановку в очередь на книгу без копий.
+
+    Ожидается статус 201 и резерв в статусе waiting.
+    """
+    book, readers = await create_book_and_readers(db_session, 1)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post(
+        f"/api/book/{book.id}/hold",
+        json={"reader_id": readers[0].id},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    data = response.json()
+    assert data["book_id"] == book.id
+    assert data["reader_id"] == readers[0].id
+    assert data["status"] == HOLD_WAITING
+    assert data["ready_at"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_place_hold_copies_available(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет отказ в резерве при наличии копий.
+
+    Ожидается статус 400 Bad Request.
+    """
+    book, readers = await create_book_and_readers(db_session, 1, copies=2)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post(
+        f"/api/book/{book.id}/hold",
+        json={"reader_id": readers[0].id},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"]["error_message"] == (
+        "Book has available copies to borrow"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_place_hold_duplicate(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет, что повторный активный резерв отклоняется.
+
+    Ожидается статус 409 Conflict.
+    """
+    book, readers = await create_book_and_readers(db_session, 1)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    payload = {"reader_id": readers[0].id}
+
+    first = await client.post(
+        f"/api/book/{book.id}/hold", json=payload, headers=headers
+    )
+    assert first.status_code == status.HTTP_201_CREATED
+
+    second = await client.post(
+        f"/api/book/{book.id}/hold", json=payload, headers=headers
+    )
+    assert second.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_return_assigns_copy_to_hold(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет закрепление возвращённой копии за резервом.
+
+    Возврат переводит резерв в ready, фонд копий не растёт.
+    Выдача читателю с готовым резервом не уменьшает фонд.
+    """
+    book, readers = await create_book_and_readers(db_session, 2)
+    loan = ReaderBook(reader_id=readers[0].id, book_id=book.id)
+    hold = Hold(reader_id=readers[1].id, book_id=book.id)
+    db_session.add_all([loan, hold])
+    await db_session.commit()
+
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post(
+        "/api/librarian/return", json={"borrow_id": loan.id}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    await db_session.refresh(hold)
+    await db_session.refresh(book)
+    assert hold.status == HOLD_READY
+    assert hold.ready_at is not None
+    assert book.copies_count == 0
+
+    response = await client.post(
+        "/api/librarian/borrow",
+        json={"reader_id": readers[1].id, "book_id": book.id},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    await db_session.refresh(book)
+    assert book.copies_count == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_concurrent_returns_allocate_each_hold_once(
+        db_session, session_factory
+):
+    """
+    Проверяет параллельные возвраты одной книги под нагрузкой.
+
+    Каждый возврат идёт в своей сессии и транзакции.
+    Ни один резерв не получает копию дважды,
+    остаток копий вернулся в фонд.
+    """
+    loans_count, holds_count = 20, 12
+    book, readers = await create_book_and_readers(
+        db_session, loans_count + holds_count
+    )
+    loans = [
+        ReaderBook(reader_id=reader.id, book_id=book.id)
+        for reader in readers[:loans_count]
+    ]
+    holds = [
+        Hold(reader_id=reader.id, book_id=book.id)
+        for reader in readers[loans_count:]
+    ]
+    db_session.add_all(loans + holds)
+    await db_session.commit()
+
+    async def return_in_own_session(borrow_id: int):
+        async with session_factory() as session:
+            return await return_service.return_book(borrow_id, session)
+
+    await asyncio.gather(
+        *(return_in_own_session(loan.id) for loan in loans)
+    )
+
+    ready = await db_session.execute(
+        select(func.count()).select_from(Hold).where(
+            Hold.status == HOLD_READY
+        )
+    )
+    await db_session.refresh(book)
+    assert ready.scalar_one() == holds_count
+    assert book.copies_count == loans_count - holds_count
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_hold_waits_for_concurrent_return(db_session, session_factory):
+    """
+    Проверяет резерв, поставленный во время незавершённого возврата.
+
+    Резерв ждёт фиксации возврата и видит вернувшуюся копию.
+    """
+    book, readers = await create_book_and_readers(db_session, 1)
+    async with session_factory() as returning:
+        await allocate_returned_copy(book.id, returning)
+
+        async def hold_in_own_session():
+            async with session_factory() as session:
+                return await place_hold(
+                    book_id=book.id, reader_id=readers[0].id, db=session
+                )
+
+        hold = asyncio.create_task(hold_in_own_session())
+        await asyncio.sleep(0.2)
+        assert not hold.done()
+        await returning.commit()
+
+    with pytest.raises(HTTPException) as refused:
+        await hold
+    assert refused.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert await db_session.scalar(
+        select(func.count()).select_from(Hold)
+    ) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_return_sees_hold_placed_concurrently(
+        db_session, session_factory
+):
+    """
+    Проверяет возврат во время незафиксированной постановки резерва.
+
+    Возврат ждёт резерв и отдаёт копию ему, а не в фонд.
+    """
+    book, readers = await create_book_and_readers(db_session, 1)
+    async with session_factory() as holding:
+        await holding.execute(
+            select(Book.id).where(Book.id == book.id)
+            .with_for_update(key_share=True)
+        )
+        holding.add(Hold(reader_id=readers[0].id, book_id=book.id))
+        await holding.flush()
+
+        async def allocate_in_own_session():
+            async with session_factory() as session:
+                allocated = await allocate_returned_copy(book.id, session)
+                await session.commit()
+                return allocated
+
+        allocation = asyncio.create_task(allocate_in_own_session())
+        await asyncio.sleep(0.2)
+        assert not allocation.done()
+        await holding.commit()
+
+    assert (await allocation).status == HOLD_READY
+    await db_session.refresh(book)
+    assert book.copies_count == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_stale_ready_hold_passes_copy_to_next(db_session):
+    """
+    Проверяет истечение невостребованного готового резерва.
+
+    Копия первого резерва переходит следующему в очереди,
+    свежий готовый резерв не трогается.
+    """
+    book, readers = await create_book_and_readers(db_session, 3)
+    stale = Hold(reader_id=readers[0].id, book_id=book.id,
+                 status=HOLD_READY,
+                 ready_at=func.now() - text("interval '4 days'"))
+    fresh = Hold(reader_id=readers[1].id, book_id=book.id,
+                 status=HOLD_READY, ready_at=func.now())
+    waiting = Hold(reader_id=readers[2].id, book_id=book.id)
+    db_session.add_all([stale, fresh, waiting])
+    await db_session.commit()
+
+    expired = await expire_ready_holds(db_session, ready_days=3)
+
+    assert expired == [stale.id]
+    for hold in (stale, fresh, waiting):
+        await db_session.refresh(hold)
+    await db_session.refresh(book)
+    assert stale.status == HOLD_EXPIRED
+    assert fresh.status == HOLD_READY
+    assert waiting.status == HOLD_READY
+    assert book.copies_count == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_stale_ready_hold_returns_copy_to_fund(db_session):
+    """Без очереди копия истёкшего резерва возвращается в фонд."""
+    book, readers = await create_book_and_readers(db_session, 1)
+    hold = Hold(reader_id=readers[0].id, book_id=book.id,
+                status=HOLD_READY,
+                ready_at=func.now() - text("interval '4 days'"))
+    db_session.add(hold)
+    await db_session.commit()
+
+    assert await expire_ready_holds(db_session, ready_days=3) == [hold.id]
+    await db_session.refresh(book)
+    assert book.copies_count == 1
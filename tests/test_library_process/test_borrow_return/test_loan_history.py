@@ -0,0 +1,167 @@
+"""Тесты для истории выдач читателя и книги через API."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from lib_api.business_models.library_models.models_lib import (Book, Reader,
+                                                               ReaderBook)
+
+
+async def create_history(db_session, loans_count: int):
+    """Создаёт читателя, книгу и историю выдач по дням."""
+    reader = Reader(
+        name="Reader History", email="history@example.com", note=""
+    )
+    book = Book(
+        title="History Book",
+        author="Author H",
+        publication_year=2020,
+        isbn="isbnH",
+        copies_count=3
+    )
+    db_session.add_all([reader, book])
+    await db_session.commit()
+    await db_session.refresh(reader)
+    await db_session.refresh(book)
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    loans = []
+    for day in range(loans_count):
+        borrow_date = start + timedelta(days=day)
+        loans.append(ReaderBook(
+            reader_id=reader.id,
+            book_id=book.id,
+            borrow_date=borrow_date,
+            return_date=(
+                borrow_date + timedelta(hours=1)
+                if day < loans_count - 1 else None
+            ),
+        ))
+    db_session.add_all(loans)
+    await db_session.commit()
+    return reader, book, loans
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_reader_history_keyset_pages(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет постраничный обход истории читателя по курсору.
+
+    История включает возвращённые и активную выдачи.
+    Страницы идут от новых к старым без пропусков и повторов.
+    """
+    reader, book, loans = await create_history(db_session, 5)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(
+            f"/api/reader/{reader.id}/history",
+            params=params, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [loan.id for loan in reversed(loans)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_book_history_date_range(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет фильтр истории книги по дате выдачи.
+
+    Ожидаются только выдачи внутри диапазона [date_from, date_to).
+    """
+    reader, book, loans = await create_history(db_session, 5)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get(
+        f"/api/book/{book.id}/history",
+        params={
+            "date_from": "2025-01-02T00:00:00+00:00",
+            "date_to": "2025-01-04T00:00:00+00:00",
+        },
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    page = response.json()
+    assert [item["id"] for item in page["items"]] == [
+        loans[2].id, loans[1].id
+    ]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_reader_history_not_found(
+        client, create_and_authenticate_librarian
+):
+    """
+    Проверяет историю несуществующего читателя.
+
+    Ожидается статус 404 Not Found.
+    """
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get("/api/reader/777/history", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    data = response.json()
+    assert data["detail"]["error_type"] == "NotFoundReaderID"
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_book_history_invalid_cursor(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет ответ на повреждённый курсор.
+
+    Ожидается статус 400 Bad Request.
+    """
+    reader, book, loans = await create_history(db_session, 1)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get(
+        f"/api/book/{book.id}/history",
+        params={"cursor": "not-a-cursor"},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    data = response.json()
+    assert data["detail"]["error_type"] == "InvalidCursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_history_unauthorized(client):
+    """
+    Проверяет, что история выдач без авторизации недоступна.
+
+    Ожидается статус 401 Unauthorized.
+    """
+    response = await client.get("/api/reader/1/history")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
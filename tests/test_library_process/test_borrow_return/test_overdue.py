@@ -0,0 +1,151 @@
+"""Тесты для сроков возврата и поиска просроченных выдач."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from lib_api.business_models.jobs.job_models import JobWatermark
+from lib_api.business_models.jobs.overdue_loans import (JOB_NAME,
+                                                        scan_newly_overdue)
+from lib_api.business_models.library_models.models_lib import (
+    LOAN_PERIOD_DAYS, Book, Reader, ReaderBook)
+
+
+async def create_loans(db_session, due_offsets_days, returned=()):
+    """Создаёт выдачи со сроками возврата now + offset дней."""
+    reader = Reader(
+        name="Reader Overdue", email="overdue@example.com", note=""
+    )
+    book = Book(
+        title="Overdue Book",
+        author="Author O",
+        publication_year=2020,
+        isbn="isbnO",
+        copies_count=5
+    )
+    db_session.add_all([reader, book])
+    await db_session.commit()
+    await db_session.refresh(reader)
+    await db_session.refresh(book)
+
+    now = datetime.now(timezone.utc)
+    loans = [
+        ReaderBook(
+            reader_id=reader.id,
+            book_id=book.id,
+            borrow_date=now - timedelta(days=30),
+            due_date=now + timedelta(days=offset),
+            return_date=now if index in returned else None,
+        )
+        for index, offset in enumerate(due_offsets_days)
+    ]
+    db_session.add_all(loans)
+    await db_session.commit()
+    return reader, book, loans
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_borrow_sets_due_date(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет, что выдача получает срок возврата.
+
+    Срок равен дате выдачи плюс LOAN_PERIOD_DAYS.
+    """
+    reader = Reader(name="Reader Due", email="due@example.com", note="")
+    book = Book(title="Due Book", author="Author D", copies_count=1)
+    db_session.add_all([reader, book])
+    await db_session.commit()
+
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post(
+        "/api/librarian/borrow",
+        json={"reader_id": reader.id, "book_id": book.id},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    data = response.json()
+    borrow_date = datetime.fromisoformat(data["borrow_date"])
+    due_date = datetime.fromisoformat(data["due_date"])
+    assert due_date - borrow_date == timedelta(days=LOAN_PERIOD_DAYS)
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_list_overdue_loans(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Проверяет список просроченных выдач.
+
+    Возвращённые и не просроченные выдачи в список не попадают.
+    Порядок от самой давней просрочки, обход по курсору.
+    """
+    reader, book, loans = await create_loans(
+        db_session, [-1, -5, 3, -3, -2], returned={4}
+    )
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get(
+        "/api/loans/overdue", params={"size": 2}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    first = response.json()
+
+    response = await client.get(
+        "/api/loans/overdue",
+        params={"size": 2, "cursor": first["next_cursor"]},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    second = response.json()
+
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert ids == [loans[1].id, loans[3].id, loans[0].id]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_scan_newly_overdue_is_incremental(db_session):
+    """
+    Проверяет инкрементальный проход по отметке.
+
+    Первый проход находит выдачи, просроченные после отметки.
+    Повторный проход ничего не находит, отметка сдвигается.
+    """
+    reader, book, loans = await create_loans(
+        db_session, [-1, -3, -20, 2, -2], returned={4}
+    )
+    db_session.add(JobWatermark(
+        name=JOB_NAME,
+        watermark=datetime.now(timezone.utc) - timedelta(days=10),
+    ))
+    await db_session.commit()
+
+    found = await scan_newly_overdue(db_session)
+    assert sorted(found) == sorted([loans[0].id, loans[1].id])
+
+    assert await scan_newly_overdue(db_session) == []
+
+    mark = await db_session.get(JobWatermark, JOB_NAME)
+    await db_session.refresh(mark)
+    assert mark.watermark > datetime.now(timezone.utc) - timedelta(minutes=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_overdue_unauthorized(client):
+    """
+    Проверяет, что список просрочек без авторизации недоступен.
+
+    Ожидается статус 401 Unauthorized.
+    """
+    response = await client.get("/api/loans/overdue")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,81 @@
+"""Тесты для единицы работы запроса и бюджета SQL-выражений."""
+
+import pytest
+from lib_api.business_models.library_models.book_crud.book_by_id import \
+    get_book_by_id
+from lib_api.business_models.library_models.borrow_return_service import \
+    borrow_book as borrow_service
+from lib_api.business_models.library_models.borrow_return_service import \
+    return_book as return_service
+from lib_api.business_models.library_models.models_lib import Book, Reader
+from lib_api.business_models.library_models.unit_of_work import (
+    StatementBudgetExceeded, get_unit_of_work, statement_budget,
+    statements_executed)
+
+
+async def create_reader_and_book(session_factory):
+    """Создаёт читателя и книгу в отдельной сессии."""
+    async with session_factory() as db:
+        reader = Reader(name="Reader UoW", email="uow@example.com", note="")
+        book = Book(title="UoW Book", author="Author U", copies_count=2)
+        db.add_all([reader, book])
+        await db.commit()
+        return reader.id, book.id
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_unit_of_work_uses_identity_map(session_factory):
+    """
+    Проверяет, что повторная загрузка не выполняет SQL.
+
+    Книга, уже загруженная в сессию, берётся из identity map,
+    проверка существования тоже не обращается к базе.
+    """
+    reader_id, book_id = await create_reader_and_book(session_factory)
+    async with session_factory() as db:
+        uow = get_unit_of_work(db)
+        assert get_unit_of_work(db) is uow
+        book = await get_book_by_id(book_id, db)
+        executed = statements_executed(db)
+
+        assert await get_book_by_id(book_id, db) is book
+        assert await uow.exists(Book, book_id) is True
+        assert statements_executed(db) == executed
+
+        assert await uow.exists(Reader, reader_id) is True
+        assert await uow.exists(Reader, reader_id + 1000) is False
+        assert statements_executed(db) == executed + 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_borrow_and_return_within_statement_budget(session_factory):
+    """
+    Проверяет число ORM-выражений выдачи и возврата.
+
+    Выдача: проверка читателя, книга со связями, резерв,
+    счётчик выдач, журнал изменений, NOTIFY и дочитывание дат.
+    Возврат: выдача без связей, резерв, возврат копии в фонд,
+    журнал изменений, NOTIFY и дочитывание даты возврата.
+    """
+    reader_id, book_id = await create_reader_and_book(session_factory)
+    async with session_factory() as db:
+        with statement_budget(db, 9):
+            borrow = await borrow_service.borrow_book(book_id, reader_id, db)
+    async with session_factory() as db:
+        with statement_budget(db, 6):
+            returned = await return_service.return_book(borrow.id, db)
+    assert returned.return_date is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.br
+async def test_statement_budget_exceeded(session_factory):
+    """Проверяет, что строгий бюджет ловит лишние выражения."""
+    reader_id, book_id = await create_reader_and_book(session_factory)
+    async with session_factory() as db:
+        with pytest.raises(StatementBudgetExceeded):
+            with statement_budget(db, 1):
+                await get_book_by_id(book_id, db)
+        assert db.info["statement_budget_strict"] is None
@@ -0,0 +1 @@
+"""Инициализация тестов журнала изменений."""
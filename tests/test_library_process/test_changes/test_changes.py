@@ -0,0 +1,141 @@
+"""Тесты для журнала изменений и эндпоинта /api/changes."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import status
+from lib_api.business_models.outbox.change_events import (ENTITY_BOOK,
+                                                          OP_UPDATE, change,
+                                                          record_changes)
+from lib_api.business_models.outbox.outbox_models import ChangeEvent
+from sqlalchemy import select
+
+
+@pytest.mark.asyncio
+@pytest.mark.changes
+async def test_writes_append_change_events(
+        client, create_and_authenticate_librarian
+):
+    """
+    Проверяет события записи книг, читателей и выдач.
+
+    События идут в порядке seq, курсор next_since
+    указывает на последнее, повторный запрос с ним пуст.
+    """
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    book = (await client.post(
+        "/api/book/create", headers=headers,
+        json={"title": "Outbox", "author": "Author O", "copies_count": 2},
+    )).json()
+    reader = (await client.post(
+        "/api/reader/create", headers=headers,
+        json={"name": "Outbox Reader", "email": "outbox@example.com"},
+    )).json()
+    borrow = (await client.post(
+        "/api/librarian/borrow", headers=headers,
+        json={"reader_id": reader["id"], "book_id": book["id"]},
+    )).json()
+    await client.post(
+        "/api/librarian/return", headers=headers,
+        json={"borrow_id": borrow["id"]},
+    )
+
+    response = await client.get("/api/changes", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    events = [
+        (e["entity"], e["entity_id"], e["op"]) for e in data["events"]
+    ]
+    assert events == [
+        ("book", book["id"], "create"),
+        ("reader", reader["id"], "create"),
+        ("loan", borrow["id"], "create"),
+        ("book", book["id"], "update"),
+        ("loan", borrow["id"], "update"),
+        ("book", book["id"], "update"),
+    ]
+    seqs = [e["seq"] for e in data["events"]]
+    assert seqs == sorted(seqs)
+    assert data["next_since"] == seqs[-1]
+    assert data["events"][3]["payload"] == {"copies_count": 1}
+
+    response = await client.get(
+        "/api/changes", params={"since": data["next_since"]},
+        headers=headers,
+    )
+    assert response.json() == {
+        "events": [], "next_since": data["next_since"]
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.changes
+async def test_failed_write_has_no_event(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Проверяет, что отклонённая запись не попадает в журнал."""
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    payload = {"title": "Dup", "author": "Author D", "isbn": "dup-isbn"}
+    await client.post("/api/book/create", json=payload, headers=headers)
+    response = await client.post(
+        "/api/book/create", json=payload, headers=headers
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    events = (await db_session.scalars(select(ChangeEvent))).all()
+    assert [(e.entity, e.op) for e in events] == [("book", "create")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.changes
+async def test_changes_long_poll_wakes_on_new_event(
+        client, session_factory, create_and_authenticate_librarian
+):
+    """
+    Проверяет long-polling: запрос ждёт и отдаёт новое событие.
+
+    Ответ приходит раньше истечения wait.
+    """
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    started = time.monotonic()
+    poll = asyncio.create_task(client.get(
+        "/api/changes", params={"since": 0, "wait": 5}, headers=headers
+    ))
+    await asyncio.sleep(0.2)
+    assert not poll.done()
+    async with session_factory() as db:
+        await record_changes(db, change(ENTITY_BOOK, 1, OP_UPDATE))
+        await db.commit()
+
+    response = await poll
+    assert time.monotonic() - started < 5
+    assert [e["entity_id"] for e in response.json()["events"]] == [1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.changes
+async def test_change_numbers_follow_commit_order(session_factory):
+    """
+    Проверяет, что seq выдаются в порядке фиксации транзакций.
+
+    Вторая транзакция ждёт фиксации первой перед записью события.
+    """
+    async with session_factory() as first, session_factory() as second:
+        await record_changes(first, change(ENTITY_BOOK, 1, OP_UPDATE))
+        blocked = asyncio.create_task(
+            record_changes(second, change(ENTITY_BOOK, 2, OP_UPDATE))
+        )
+        await asyncio.sleep(0.2)
+        assert not blocked.done()
+        await first.commit()
+        await blocked
+        await second.commit()
+
+        events = (await first.scalars(
+            select(ChangeEvent).order_by(ChangeEvent.seq)
+        )).all()
+    assert [event.entity_id for event in events] == [1, 2]
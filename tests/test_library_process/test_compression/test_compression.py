@@ -0,0 +1,167 @@
+"""Тесты сжатия ответов."""
+
+import gzip
+import json
+
+import pytest
+from fastapi import status
+from lib_api.business_models.library_models.models_lib import Book
+from lib_api.middlewares import compression
+from lib_api.middlewares.compression import (CompressedCache,
+                                             CompressionMiddleware,
+                                             choose_encoding)
+
+CODECS = {"br": None, "zstd": None, "gzip": None}
+LARGE_BODY = json.dumps([{"title": "Книга", "id": i} for i in range(200)])
+
+
+def make_app(body: bytes, content_type: str, more_body: bool = False):
+    """Возвращает ASGI-приложение с одним ответом."""
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type.encode()),
+                        (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body,
+                    "more_body": more_body})
+        if more_body:
+            await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+async def call(app, accept: str = "gzip"):
+    """Вызывает приложение и собирает отправленные сообщения."""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/",
+             "headers": [(b"accept-encoding", accept.encode())]}
+    await app(scope, None, send)
+    headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return headers, body
+
+
+@pytest.mark.compression
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("zstd;q=0.9, br;q=0.9, gzip;q=0.1", "br"),
+    ("*", "br"),
+    ("*, br;q=0", "zstd"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("", None),
+])
+def test_choose_encoding(accept, expected):
+    """Проверяет выбор кодирования по q и порядку сервера."""
+    assert choose_encoding(accept, CODECS) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.compression
+async def test_large_json_compressed_small_passed():
+    """Проверяет порог: большое тело сжимается, малое — нет."""
+    middleware = CompressionMiddleware(
+        make_app(LARGE_BODY.encode(), "application/json"),
+        cache=CompressedCache(), min_size=1024,
+    )
+    headers, body = await call(middleware)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(body))
+    assert headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(body).decode() == LARGE_BODY
+
+    small = CompressionMiddleware(
+        make_app(b'{"result": true}', "application/json"),
+        cache=CompressedCache(), min_size=1024,
+    )
+    headers, body = await call(small)
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert body == b'{"result": true}'
+
+
+@pytest.mark.asyncio
+@pytest.mark.compression
+@pytest.mark.parametrize("content_type, more_body", [
+    ("text/event-stream", False),
+    ("application/json", True),
+    ("image/png", False),
+])
+async def test_streams_and_binary_not_compressed(content_type, more_body):
+    """Проверяет, что SSE, потоковые и бинарные ответы не сжимаются."""
+    middleware = CompressionMiddleware(
+        make_app(LARGE_BODY.encode(), content_type, more_body),
+        cache=CompressedCache(), min_size=16,
+    )
+    headers, body = await call(middleware)
+    assert "content-encoding" not in headers
+    assert body == LARGE_BODY.encode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.compression
+async def test_compressed_body_cached():
+    """Проверяет, что одинаковое тело сжимается один раз."""
+    calls = []
+    cache = CompressedCache()
+    middleware = CompressionMiddleware(
+        make_app(LARGE_BODY.encode(), "application/json"),
+        cache=cache, min_size=16,
+    )
+    codec = middleware.codecs["gzip"]
+    middleware.codecs["gzip"] = lambda data: calls.append(data) or codec(data)
+
+    first = await call(middleware)
+    second = await call(middleware)
+
+    assert first == second
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.compression
+async def test_large_body_compressed_in_thread(monkeypatch):
+    """Проверяет, что большие тела сжимаются вне цикла событий."""
+    offloaded = []
+    to_thread = compression.asyncio.to_thread
+
+    async def spy(func, *args):
+        offloaded.append(len(args[0]))
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(compression.asyncio, "to_thread", spy)
+    middleware = CompressionMiddleware(
+        make_app(LARGE_BODY.encode(), "application/json"),
+        cache=CompressedCache(), min_size=16, thread_min_size=1024,
+    )
+    headers, body = await call(middleware)
+
+    assert offloaded == [len(LARGE_BODY.encode())]
+    assert gzip.decompress(body).decode() == LARGE_BODY
+
+
+@pytest.mark.asyncio
+@pytest.mark.compression
+async def test_books_list_compressed(client, db_session):
+    """Проверяет сжатие списка книг через приложение."""
+    db_session.add_all([
+        Book(title=f"Compressed {i}", author="Author C", copies_count=1)
+        for i in range(50)
+    ])
+    await db_session.commit()
+
+    response = await client.get(
+        "/api/librarian?size=50", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.json()["items"]) == 50
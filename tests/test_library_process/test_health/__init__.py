@@ -0,0 +1 @@
+"""Инициализация тестов проверок здоровья сервиса."""
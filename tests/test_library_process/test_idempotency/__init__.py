@@ -0,0 +1 @@
+"""Инициализация тестов ключей идемпотентности."""
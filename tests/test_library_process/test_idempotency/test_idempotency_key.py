@@ -0,0 +1,204 @@
+"""Тесты повторов запросов с заголовком Idempotency-Key."""
+
+import asyncio
+
+import pytest
+from fastapi import status
+from lib_api.business_models.librarian.util import \
+    get_access_token_for_user
+from lib_api.business_models.library_models.models_lib import (Book, Reader,
+                                                               ReaderBook)
+from lib_api.idempotency.idempotency_models import IdempotencyKey
+from lib_api.idempotency.idempotency_store import (IN_PROGRESS, OWNER,
+                                                   IdempotencyStore,
+                                                   idempotency_store)
+from lib_api.routing import borrow_book as borrow_service
+from sqlalchemy import func, select
+
+BOOK = {"title": "Idempotent", "author": "Author I", "copies_count": 2}
+
+
+async def count(db_session, model):
+    """Число строк модели."""
+    return await db_session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+@pytest.mark.idempotency
+async def test_create_book_replay(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Повтор создания книги с тем же ключом не создаёт дубль.
+
+    Второй ответ совпадает с первым и помечен Idempotent-Replayed,
+    тот же ключ с другим телом — ошибка 422.
+    """
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "b-1"}
+
+    first = await client.post("/api/book/create", headers=headers, json=BOOK)
+    second = await client.post("/api/book/create", headers=headers, json=BOOK)
+
+    assert first.status_code == second.status_code == status.HTTP_201_CREATED
+    assert second.json() == first.json()
+    assert "idempotent-replayed" not in first.headers
+    assert second.headers["idempotent-replayed"] == "true"
+    assert await count(db_session, Book) == 1
+
+    other = await client.post(
+        "/api/book/create", headers=headers, json={**BOOK, "title": "Other"}
+    )
+    assert other.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert other.json()["detail"]["error_type"] == "IdempotencyKeyReused"
+
+
+@pytest.mark.asyncio
+@pytest.mark.idempotency
+async def test_replay_from_table_after_restart(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Ответ берётся из таблицы, если его нет в памяти процесса."""
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "b-2"}
+    first = await client.post("/api/book/create", headers=headers, json=BOOK)
+    idempotency_store.clear()
+
+    second = await client.post("/api/book/create", headers=headers, json=BOOK)
+
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert await count(db_session, Book) == 1
+    assert await count(db_session, IdempotencyKey) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.idempotency
+async def test_concurrent_borrow_retries_coalesce(
+        client, db_session, monkeypatch, create_and_authenticate_librarian
+):
+    """
+    Одновременные повторы выдачи выполняют borrow_book один раз.
+
+    Все повторы получают ответ первого запроса.
+    """
+    reader = Reader(name="Retry Reader", email="retry@example.com")
+    book = Book(title="Retry", author="Author R", copies_count=3)
+    db_session.add_all([reader, book])
+    await db_session.commit()
+    calls = []
+
+    async def slow_borrow(*args, **kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.05)
+        return await borrow_service(*args, **kwargs)
+
+    monkeypatch.setattr("lib_api.routing.borrow_book", slow_borrow)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "l-1"}
+    payload = {"reader_id": reader.id, "book_id": book.id}
+
+    responses = await asyncio.gather(*(
+        client.post("/api/librarian/borrow", headers=headers, json=payload)
+        for _ in range(3)
+    ))
+
+    assert len(calls) == 1
+    assert len({r.text for r in responses}) == 1
+    assert {r.status_code for r in responses} == {status.HTTP_201_CREATED}
+    assert await count(db_session, ReaderBook) == 1
+    await db_session.refresh(book)
+    assert book.copies_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.idempotency
+async def test_key_in_progress_on_other_worker(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Ключ, который выполняет другой воркер, даёт 409.
+
+    Без ключа и на других путях запросы выполняются как обычно.
+    """
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "b-3"}
+    first = await client.post("/api/book/create", headers=headers, json=BOOK)
+    await db_session.execute(
+        IdempotencyKey.__table__.update().values(
+            status_code=None, body=None
+        )
+    )
+    await db_session.commit()
+    idempotency_store.clear()
+
+    response = await client.post(
+        "/api/book/create", headers=headers, json=BOOK
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["detail"]["error_type"] == (
+        "IdempotencyKeyInProgress"
+    )
+
+    plain = {"Authorization": f"Bearer {token}"}
+    response = await client.post("/api/book/create", headers=plain, json=BOOK)
+    assert response.json()["id"] != first.json()["id"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.idempotency
+async def test_replay_with_refreshed_token(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Повтор с обновлённым токеном того же библиотекаря — тот же ответ.
+
+    Без действительного токена ключ не учитывается, и запрос
+    получает 401 от обработчика.
+    """
+    librarian, token = create_and_authenticate_librarian
+    first = await client.post(
+        "/api/book/create", json=BOOK,
+        headers={"Authorization": f"Bearer {token}",
+                 "Idempotency-Key": "b-4"},
+    )
+    refreshed = await get_access_token_for_user(librarian, jti="refreshed")
+    second = await client.post(
+        "/api/book/create", json=BOOK,
+        headers={"Authorization": f"Bearer {refreshed}",
+                 "Idempotency-Key": "b-4"},
+    )
+
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert await count(db_session, Book) == 1
+
+    anonymous = await client.post(
+        "/api/book/create", json=BOOK,
+        headers={"Authorization": "Bearer bad", "Idempotency-Key": "b-4"},
+    )
+    assert anonymous.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.idempotency
+async def test_keep_alive_holds_lock_past_lock_window(engine):
+    """
+    Владелец ключа продлевает блокировку, пока выполняется.
+
+    Другой воркер не перехватывает ключ после IDEMPOTENCY_LOCK_SECONDS,
+    а после остановки продлений — перехватывает.
+    """
+    owner = IdempotencyStore(engine, lock_seconds=1)
+    other = IdempotencyStore(engine, lock_seconds=1)
+    assert await owner.begin("slow", "hash") == (OWNER, None)
+
+    keep_alive = asyncio.create_task(owner.keep_alive("slow"))
+    try:
+        await asyncio.sleep(1.5)
+        assert await other.begin("slow", "hash") == (IN_PROGRESS, None)
+    finally:
+        keep_alive.cancel()
+
+    await asyncio.sleep(1.2)
+    assert await other.begin("slow", "hash") == (OWNER, None)
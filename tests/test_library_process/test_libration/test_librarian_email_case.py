@@ -0,0 +1,40 @@
+"""Тесты email библиотекаря без учёта регистра."""
+
+import pytest
+from fastapi import status
+from lib_api.business_models.librarian.librarian_model import Librarian
+from lib_api.schemas import librarian_serialization
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_login_and_registration_ignore_email_case(client, db_session):
+    """
+    Email библиотекаря хранится в нижнем регистре.
+
+    Вход принимает email в любом регистре, повторная регистрация
+    в другом регистре отклоняется с 409.
+    """
+    librarian = await Librarian.create_librarian(
+        librarian_in=librarian_serialization.LibrarianCreate(
+            name="Case User",
+            email="Case.User@Example.com",
+            password="secret123?"
+        ),
+        db=db_session,
+    )
+    assert librarian.email == "case.user@example.com"
+
+    response = await client.post(
+        "/api/librarian/oauth2-login",
+        data={"username": "CASE.USER@example.com",
+              "password": "secret123?"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    duplicate = await client.post(
+        "/api/librarian/registration",
+        json={"name": "Case User", "email": "case.user@EXAMPLE.com",
+              "password": "secret123?"},
+    )
+    assert duplicate.status_code == status.HTTP_409_CONFLICT
@@ -0,0 +1,233 @@
+"""Тесты refresh-токенов, ротации и отзыва токенов доступа."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, status
+from lib_api.business_models.librarian.current_librarion import \
+    get_current_librarian
+from lib_api.business_models.librarian.revocation import (
+    RevocationList, purge_expired_revocations)
+from lib_api.business_models.librarian.security import create_access_token
+from lib_api.business_models.librarian.token_models import (RefreshToken,
+                                                            RevokedToken)
+from sqlalchemy import event, func, select, update
+
+
+def auth(token):
+    """Возвращает заголовок авторизации."""
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def login(client, librarian):
+    """Выполняет вход и возвращает пару токенов."""
+    response = await client.post(
+        "/api/librarian/oauth2-login",
+        data={"username": librarian.email, "password": "secret123?"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_login_returns_refresh_token_stored_hashed(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Проверяет выдачу refresh-токена и хранение только его хэша."""
+    librarian, _ = create_and_authenticate_librarian
+
+    tokens = await login(client, librarian)
+
+    assert tokens["refresh_token"]
+    stored = (await db_session.execute(select(RefreshToken))).scalars().all()
+    assert len(stored) == 2
+    assert all(row.token_hash != tokens["refresh_token"] for row in stored)
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_refresh_rotates_tokens(
+        client, create_and_authenticate_librarian
+):
+    """Проверяет обмен refresh-токена на новую рабочую пару."""
+    librarian, _ = create_and_authenticate_librarian
+    tokens = await login(client, librarian)
+
+    response = await client.post(
+        "/api/librarian/refresh",
+        json={"refresh_token": tokens["refresh_token"]}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    check = await client.get(
+        "/api/readers", headers=auth(rotated["access_token"])
+    )
+    assert check.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_refresh_token_reuse_revokes_family(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Проверяет, что повторное использование отзывает всю цепочку."""
+    librarian, _ = create_and_authenticate_librarian
+    tokens = await login(client, librarian)
+    rotated = (await client.post(
+        "/api/librarian/refresh",
+        json={"refresh_token": tokens["refresh_token"]}
+    )).json()
+
+    reuse = await client.post(
+        "/api/librarian/refresh",
+        json={"refresh_token": tokens["refresh_token"]}
+    )
+
+    assert reuse.status_code == status.HTTP_401_UNAUTHORIZED
+    assert reuse.json()["detail"]["error_message"] == "Invalid refresh token"
+    after_reuse = await client.post(
+        "/api/librarian/refresh",
+        json={"refresh_token": rotated["refresh_token"]}
+    )
+    assert after_reuse.status_code == status.HTTP_401_UNAUTHORIZED
+    for token in (tokens["access_token"], rotated["access_token"]):
+        check = await client.get("/api/readers", headers=auth(token))
+        assert check.status_code == status.HTTP_401_UNAUTHORIZED
+    revoked = await db_session.scalar(
+        select(func.count()).select_from(RevokedToken)
+    )
+    assert revoked == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_unknown_refresh_token_rejected(client):
+    """Проверяет отказ для неизвестного refresh-токена."""
+    response = await client.post(
+        "/api/librarian/refresh", json={"refresh_token": "unknown"}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_logout_revokes_access_and_refresh(
+        client, create_and_authenticate_librarian
+):
+    """Проверяет немедленный отзыв токенов при выходе."""
+    librarian, _ = create_and_authenticate_librarian
+    tokens = await login(client, librarian)
+
+    response = await client.post(
+        "/api/librarian/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=auth(tokens["access_token"])
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    check = await client.get(
+        "/api/readers", headers=auth(tokens["access_token"])
+    )
+    assert check.status_code == status.HTTP_401_UNAUTHORIZED
+    assert check.json()["detail"]["error_type"] == "JWTError"
+    refresh = await client.post(
+        "/api/librarian/refresh",
+        json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert refresh.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_current_librarian_does_not_query_database(
+        engine, create_and_authenticate_librarian
+):
+    """Проверяет, что проверка токена не обращается к базе."""
+    _, token = create_and_authenticate_librarian
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        current = await get_current_librarian(token)
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    assert current.email == "test@example.com"
+    assert statements == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_revocation_list_syncs_incrementally(db_session):
+    """Проверяет подгрузку отзывов другого воркера из базы."""
+    revocations = RevocationList()
+    expires = datetime.now(timezone.utc) + timedelta(minutes=5)
+    db_session.add(RevokedToken(jti="a" * 32, expires_at=expires))
+    db_session.add(RevokedToken(
+        jti="old", expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+    ))
+    await db_session.commit()
+
+    assert await revocations.sync(db_session) == 1
+    assert "a" * 32 in revocations
+    assert "old" not in revocations
+
+    db_session.add(RevokedToken(jti="b" * 32, expires_at=expires))
+    await db_session.commit()
+    await revocations.sync(db_session)
+
+    assert "b" * 32 in revocations
+    assert len(revocations) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_purge_removes_expired_refresh_tokens(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Проверяет удаление истёкших refresh-токенов при очистке."""
+    librarian, _ = create_and_authenticate_librarian
+    await login(client, librarian)
+    live = (await login(client, librarian))["refresh_token"]
+    total = await db_session.scalar(
+        select(func.count()).select_from(RefreshToken)
+    )
+    oldest = await db_session.scalar(select(func.min(RefreshToken.id)))
+    await db_session.execute(
+        update(RefreshToken).where(RefreshToken.id == oldest).values(
+            expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+        )
+    )
+    await db_session.commit()
+
+    await purge_expired_revocations(db_session)
+
+    remaining = await db_session.scalars(select(RefreshToken.id))
+    assert oldest not in remaining.all()
+    assert await db_session.scalar(
+        select(func.count()).select_from(RefreshToken)
+    ) == total - 1
+    response = await client.post(
+        "/api/librarian/refresh", json={"refresh_token": live}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+@pytest.mark.lib
+async def test_token_without_jti_rejected():
+    """Проверяет отказ для токена без jti."""
+    token = create_access_token({"sub": "a@b.c"}, timedelta(minutes=5))
+
+    with pytest.raises(HTTPException) as exc:
+        await get_current_librarian(token)
+    assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
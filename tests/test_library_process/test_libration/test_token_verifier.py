@@ -0,0 +1,137 @@
+"""Тесты подключаемых верификаторов JWT токенов."""
+
+import time
+from datetime import timedelta
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import \
+    Ed25519PrivateKey
+from lib_api.business_models.librarian.security import (create_access_token,
+                                                        decode_access_token)
+from lib_api.business_models.librarian.token_verifier import (
+    CachingTokenVerifier, JoseTokenVerifier, PyJWTTokenVerifier)
+from lib_api.factories.error_factory import TokenValidationError
+
+SECRET = "test-secret-of-at-least-32-bytes-long"
+
+
+class CountingVerifier:
+    """Верификатор-заглушка, считающий проверки подписи."""
+
+    def __init__(self, claims: dict) -> None:
+        self.claims = claims
+        self.calls = 0
+
+    def encode(self, claims: dict) -> str:
+        return "token"
+
+    def decode(self, token: str) -> dict:
+        self.calls += 1
+        return dict(self.claims)
+
+
+@pytest.mark.lib
+def test_pyjwt_and_jose_tokens_are_interchangeable():
+    """Проверяет, что токены PyJWT и python-jose совместимы."""
+    pyjwt = PyJWTTokenVerifier("HS256", secret=SECRET)
+    jose = JoseTokenVerifier(SECRET, "HS256")
+    claims = {"sub": "a@b.c", "exp": int(time.time()) + 60}
+
+    assert jose.decode(pyjwt.encode(claims))["sub"] == "a@b.c"
+    assert pyjwt.decode(jose.encode(claims))["sub"] == "a@b.c"
+
+
+@pytest.mark.lib
+@pytest.mark.parametrize("verifier", [
+    PyJWTTokenVerifier("HS256", secret=SECRET),
+    JoseTokenVerifier(SECRET, "HS256"),
+])
+def test_invalid_and_expired_tokens_rejected(verifier):
+    """Проверяет отказ для чужой подписи и истёкшего токена."""
+    foreign = PyJWTTokenVerifier(
+        "HS256", secret="other-secret-of-at-least-32-bytes-long"
+    )
+    expired = verifier.encode({"sub": "a", "exp": int(time.time()) - 10})
+
+    with pytest.raises(TokenValidationError):
+        verifier.decode(foreign.encode({"sub": "a",
+                                        "exp": int(time.time()) + 60}))
+    with pytest.raises(TokenValidationError):
+        verifier.decode(expired)
+
+
+@pytest.mark.lib
+def test_eddsa_roundtrip():
+    """Проверяет подпись и проверку токена ключами Ed25519."""
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    signer = PyJWTTokenVerifier("EdDSA", private_key_pem=private_pem)
+    checker = PyJWTTokenVerifier("EdDSA", public_key_pem=public_pem)
+
+    token = signer.encode({"sub": "a@b.c", "exp": int(time.time()) + 60})
+
+    assert checker.decode(token)["sub"] == "a@b.c"
+    with pytest.raises(TokenValidationError):
+        checker.encode({"sub": "a@b.c"})
+
+
+@pytest.mark.lib
+def test_cache_skips_repeated_verification():
+    """Проверяет, что повторный токен берётся из кэша."""
+    inner = CountingVerifier({"sub": "a", "exp": time.time() + 60})
+    verifier = CachingTokenVerifier(inner)
+
+    for _ in range(5):
+        assert verifier.decode("token")["sub"] == "a"
+
+    assert inner.calls == 1
+
+
+@pytest.mark.lib
+def test_cache_respects_expiry(monkeypatch):
+    """Проверяет, что истёкший токен из кэша отклоняется."""
+    now = time.time()
+    inner = CountingVerifier({"sub": "a", "exp": now + 60})
+    verifier = CachingTokenVerifier(inner)
+    verifier.decode("token")
+
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    with pytest.raises(TokenValidationError):
+        verifier.decode("token")
+
+
+@pytest.mark.lib
+def test_cache_is_bounded():
+    """Проверяет, что кэш не растёт больше maxsize."""
+    verifier = CachingTokenVerifier(
+        PyJWTTokenVerifier("HS256", secret=SECRET), maxsize=3
+    )
+    tokens = [
+        verifier.encode({"sub": str(i), "exp": int(time.time()) + 60})
+        for i in range(5)
+    ]
+
+    for token in tokens:
+        verifier.decode(token)
+
+    assert list(verifier._claims) == tokens[2:]
+
+
+@pytest.mark.lib
+def test_access_token_expiry_is_utc():
+    """Проверяет, что exp отсчитывается от текущего времени UTC."""
+    token = create_access_token({"sub": "a@b.c"}, timedelta(minutes=30))
+
+    exp = decode_access_token(token)["exp"]
+
+    assert abs(exp - (time.time() + 30 * 60)) < 5
@@ -94,3 +94,38 @@ async def test_delete_reader_unauthorized(client):
 
     response = await client.delete(f"/api/reader/{reader_id}")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_deleted_reader_is_hidden_and_email_reusable(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Удалённый читатель не находится по ID и не занимает email.
+
+    Повторная регистрация с тем же email создаёт нового читателя.
+    """
+    reader = Reader(name="Soft Reader", email="soft@example.com", note="")
+    db_session.add(reader)
+    await db_session.commit()
+    reader_id = reader.id
+
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.delete(f"/api/reader/{reader_id}", headers=headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.get(f"/api/reader/{reader_id}", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = await client.get("/api/readers", headers=headers)
+    assert response.json()["items"] == []
+
+    response = await client.post(
+        "/api/reader/create",
+        json={"name": "Soft Reader", "email": "soft@example.com"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["id"] != reader_id
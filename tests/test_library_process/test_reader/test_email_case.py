@@ -0,0 +1,159 @@
+"""Тесты уникальности email читателя без учёта регистра."""
+
+import pytest
+from fastapi import status
+from lib_api.business_models.jobs.email_dedup import dedup_emails
+from lib_api.business_models.library_models.models_lib import (Book, Hold,
+                                                               Reader,
+                                                               ReaderBook)
+from lib_api.business_models.library_models.reader_crud.reader_by_mail import \
+    get_reader_by_email
+from sqlalchemy import event, select, text
+
+
+class PlanLog:
+    """Записывает EXPLAIN выборок читателей при enable_seqscan = off."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.plans = []
+
+    def explain(self, conn, cursor, statement, parameters, *args):
+        if not statement.startswith("SELECT readers."):
+            return
+        cursor.execute("SET enable_seqscan = off")
+        cursor.execute("EXPLAIN " + statement, parameters)
+        self.plans.append("\n".join(row[0] for row in cursor.fetchall()))
+        cursor.execute("RESET enable_seqscan")
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.explain)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.explain)
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_email_stored_lowercase_and_conflicts_by_case(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Email сохраняется в нижнем регистре, повтор в другом регистре — 409."""
+    _, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    created = await client.post(
+        "/api/reader/create",
+        json={"name": "Mixed", "email": " Mixed.Case@Example.com "},
+        headers=headers,
+    )
+    assert created.status_code == status.HTTP_201_CREATED
+    assert created.json()["email"] == "mixed.case@example.com"
+
+    duplicate = await client.post(
+        "/api/reader/create",
+        json={"name": "Upper", "email": "MIXED.CASE@EXAMPLE.COM"},
+        headers=headers,
+    )
+    assert duplicate.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_bulk_skips_existing_email_in_other_case(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Пакетная регистрация считает email в другом регистре повтором."""
+    _, token = create_and_authenticate_librarian
+    db_session.add(Reader(name="Old", email="old@example.com"))
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/readers/bulk",
+        json=[{"name": "Old", "email": "OLD@example.com"},
+              {"name": "New", "email": "New@example.com"},
+              {"name": "New", "email": "new@EXAMPLE.com"}],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["created"], data["duplicates"]) == (1, 2)
+    assert [row["status"] for row in data["rows"]] == [
+        "duplicate", "created", "duplicate"
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_lookup_by_email_uses_lower_index(db_session, engine):
+    """Поиск по email в любом регистре читает индекс lower(email)."""
+    db_session.add(Reader(name="Lookup", email="lookup@example.com"))
+    await db_session.commit()
+
+    with PlanLog(engine) as log:
+        reader = await get_reader_by_email("LookUp@Example.com", db_session)
+
+    assert reader.email == "lookup@example.com"
+    assert len(log.plans) == 1
+    assert "uq_readers_email_lower_live" in log.plans[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_dedup_merges_readers_differing_by_case(db_session):
+    """Слияние переносит выдачи и резервы к первому читателю."""
+    await db_session.execute(text("DROP INDEX uq_readers_email_lower_live"))
+    await db_session.commit()
+    keeper = Reader(name="Keeper", email="Twin@example.com")
+    twin = Reader(name="Twin", email="twin@EXAMPLE.com")
+    other = Reader(name="Other", email="Other@example.com")
+    book = Book(title="Shared", author="Author", copies_count=1)
+    db_session.add_all([keeper, twin, other, book])
+    await db_session.flush()
+    db_session.add_all([
+        ReaderBook(reader_id=twin.id, book_id=book.id),
+        Hold(reader_id=keeper.id, book_id=book.id),
+        Hold(reader_id=twin.id, book_id=book.id),
+    ])
+    await db_session.commit()
+
+    counts = await dedup_emails(db_session)
+
+    assert counts == {
+        "readers_merged": 1,
+        "librarians_removed": 0,
+        "emails_normalized": 3,
+    }
+    live = (await db_session.execute(
+        select(Reader.id, Reader.email).order_by(Reader.id)
+    )).all()
+    assert live == [(keeper.id, "twin@example.com"),
+                    (other.id, "other@example.com")]
+    loans = await db_session.scalars(select(ReaderBook.reader_id))
+    assert loans.all() == [keeper.id]
+    holds = await db_session.scalars(select(Hold.reader_id))
+    assert holds.all() == [keeper.id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_dedup_locks_every_rewritten_table(db_session, monkeypatch):
+    """Слияние блокирует от записи и резервы с выдачами, которые меняет."""
+    locked = []
+    commit = db_session.commit
+
+    async def inspect_locks_then_commit():
+        rows = await db_session.scalars(text(
+            "SELECT c.relname FROM pg_locks l"
+            " JOIN pg_class c ON c.oid = l.relation"
+            " WHERE l.pid = pg_backend_pid()"
+            " AND l.mode = 'ShareRowExclusiveLock'"
+        ))
+        locked.extend(rows)
+        await commit()
+
+    monkeypatch.setattr(db_session, "commit", inspect_locks_then_commit)
+    await dedup_emails(db_session)
+
+    assert {"readers", "librarian", "holds", "readers_books"} <= set(locked)
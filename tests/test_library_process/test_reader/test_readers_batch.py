@@ -0,0 +1,43 @@
+"""Тесты пакетной выборки читателей по списку ID."""
+
+import pytest
+from fastapi import status
+from lib_api.business_models.library_models.models_lib import Reader
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_readers_batch_preserves_order_and_reports_missing(
+        client, db_session, create_and_authenticate_librarian
+):
+    """Проверяет порядок читателей и список ненайденных ID."""
+    _, token = create_and_authenticate_librarian
+    readers = [
+        Reader(name=f"Reader {i}", email=f"batch{i}@example.com")
+        for i in range(3)
+    ]
+    db_session.add_all(readers)
+    await db_session.commit()
+    missing = readers[-1].id + 100
+    ids = [readers[1].id, readers[0].id, missing]
+
+    response = await client.get(
+        f"/api/readers/batch?ids={','.join(map(str, ids))}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [
+        readers[1].id, readers[0].id
+    ]
+    assert data["missing_ids"] == [missing]
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_readers_batch_requires_auth(client):
+    """Проверяет, что маршрут закрыт авторизацией."""
+    response = await client.get("/api/readers/batch?ids=1")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,131 @@
+"""Тесты пакетной регистрации читателей через API."""
+
+import json
+
+import pytest
+from fastapi import status
+from lib_api.business_models.library_models.models_lib import Reader
+from lib_api.business_models.library_models.reader_crud import bulk_readers
+from lib_api.schemas import bulk_serialization
+from sqlalchemy import event, func, select
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_bulk_reports_each_row(
+        client, db_session, create_and_authenticate_librarian
+):
+    """
+    Каждая строка получает свой итог.
+
+    Новые читатели создаются, существующий email и повтор
+    внутри пакета — duplicate, невалидные строки — invalid.
+    """
+    db_session.add(Reader(name="Existing", email="existing@example.com"))
+    await db_session.commit()
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/api/readers/bulk", headers=headers, json=[
+        {"name": "First", "email": "first@example.com"},
+        {"name": "Existing", "email": "existing@example.com"},
+        {"name": "Broken", "email": "not-an-email"},
+        {"name": "First again", "email": "first@example.com"},
+        "not an object",
+        {"name": "Second", "email": "second@example.com", "note": "5A"},
+    ])
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["created"], data["duplicates"], data["invalid"]) == (2, 2, 2)
+    assert [row["status"] for row in data["rows"]] == [
+        "created", "duplicate", "invalid", "duplicate", "invalid", "created"
+    ]
+    assert data["rows"][2]["email"] == "not-an-email"
+    assert "email" in data["rows"][2]["error"]
+
+    total = await db_session.scalar(select(func.count()).select_from(Reader))
+    assert total == 3
+    created = await db_session.get(Reader, data["rows"][5]["id"])
+    assert created.note == "5A"
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_bulk_accepts_ndjson(
+        client, create_and_authenticate_librarian
+):
+    """NDJSON разбирается построчно, битая строка не мешает остальным."""
+    librarian, token = create_and_authenticate_librarian
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/x-ndjson",
+    }
+    body = "\n".join([
+        json.dumps({"name": "One", "email": "one@example.com"}),
+        "{broken",
+        "",
+        json.dumps({"name": "Two", "email": "two@example.com"}),
+    ])
+
+    response = await client.post(
+        "/api/readers/bulk", headers=headers, content=body
+    )
+    assert response.status_code == status.HTTP_200_OK
+    rows = response.json()["rows"]
+    assert [row["status"] for row in rows] == [
+        "created", "invalid", "created"
+    ]
+    assert rows[1]["error"].startswith("Invalid JSON")
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_bulk_inserts_in_chunks(
+        client, engine, monkeypatch, create_and_authenticate_librarian
+):
+    """
+    Пачка — один INSERT без предварительных выборок по email.
+
+    Число INSERT в readers равно числу пачек, а не строк.
+    """
+    monkeypatch.setattr(bulk_readers, "READERS_BULK_CHUNK_SIZE", 10)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+    payload = [
+        {"name": f"Student {i}", "email": f"student{i}@school.example.com"}
+        for i in range(25)
+    ]
+    statements = []
+
+    def collect(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", collect)
+    try:
+        response = await client.post(
+            "/api/readers/bulk", headers=headers, json=payload
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", collect)
+
+    assert response.json()["created"] == 25
+    inserts = [s for s in statements if s.startswith("INSERT INTO readers")]
+    assert len(inserts) == 3
+    assert not any("FROM readers" in s for s in statements)
+
+
+@pytest.mark.asyncio
+@pytest.mark.red
+async def test_bulk_rejects_too_many_rows(
+        client, monkeypatch, create_and_authenticate_librarian
+):
+    """Больше READERS_BULK_MAX_ROWS строк — ошибка 413."""
+    monkeypatch.setattr(bulk_serialization, "READERS_BULK_MAX_ROWS", 2)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/api/readers/bulk", headers=headers, json=[
+        {"name": f"R{i}", "email": f"r{i}@example.com"} for i in range(3)
+    ])
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert response.json()["detail"]["error_type"] == "TooManyRows"
@@ -0,0 +1 @@
+"""Инициализация тестов маршрутизации чтения на реплику."""
@@ -0,0 +1,114 @@
+"""Тесты маршрутизации чтения между основной БД и репликой."""
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, status
+from httpx import ASGITransport, AsyncClient
+from lib_api.database import (CONSISTENCY_HEADER, LSN_COOKIE,
+                              make_read_session_dependency)
+from lib_api.middlewares.read_your_writes import ReadYourWritesMiddleware
+from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                    create_async_engine)
+
+
+@pytest.fixture
+async def routing_client(engine, session_factory):
+    """
+    Клиент приложения, где одна тестовая база играет обе роли.
+
+    Реплика подключается отдельным движком к той же базе,
+    маршрут /which сообщает, какой движок выдал сессию.
+    """
+    replica_engine = create_async_engine(engine.url)
+    replica = async_sessionmaker(bind=replica_engine, expire_on_commit=False)
+    read_session = make_read_session_dependency(session_factory, replica)
+
+    routing_app = FastAPI()
+    routing_app.add_middleware(
+        ReadYourWritesMiddleware, session_factory=session_factory
+    )
+
+    @routing_app.get("/which")
+    async def which(db: AsyncSession = Depends(read_session)) -> str:
+        return "replica" if db.bind is replica_engine else "primary"
+
+    @routing_app.post("/write")
+    async def write() -> str:
+        return "ok"
+
+    @routing_app.post("/fail")
+    async def fail() -> str:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=routing_app), base_url="http://test"
+    ) as ac:
+        yield ac
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.replica
+async def test_reads_go_to_replica_by_default(routing_client):
+    """Проверяет, что чтение без подсказок идёт на реплику."""
+    response = await routing_client.get("/which")
+
+    assert response.json() == "replica"
+
+
+@pytest.mark.asyncio
+@pytest.mark.replica
+async def test_consistency_header_forces_primary(routing_client):
+    """Проверяет, что заголовок X-Consistency направляет на основную БД."""
+    response = await routing_client.get(
+        "/which", headers={CONSISTENCY_HEADER: "primary"}
+    )
+
+    assert response.json() == "primary"
+
+
+@pytest.mark.asyncio
+@pytest.mark.replica
+async def test_write_sets_lsn_cookie_and_replica_is_caught_up(
+        routing_client
+):
+    """Проверяет cookie после записи и чтение с догнавшей реплики."""
+    write = await routing_client.post("/write")
+
+    assert LSN_COOKIE in write.cookies
+    response = await routing_client.get("/which")
+    assert response.json() == "replica"
+
+
+@pytest.mark.asyncio
+@pytest.mark.replica
+async def test_lagging_replica_falls_back_to_primary(routing_client):
+    """Проверяет чтение с основной БД, пока реплика не догнала запись."""
+    routing_client.cookies.set(LSN_COOKIE, "FFFFFFFF/FFFFFFFF")
+
+    response = await routing_client.get("/which")
+
+    assert response.json() == "primary"
+
+
+@pytest.mark.asyncio
+@pytest.mark.replica
+async def test_invalid_lsn_cookie_is_ignored(routing_client):
+    """Проверяет, что испорченная cookie не ломает чтение."""
+    routing_client.cookies.set(LSN_COOKIE, "not-an-lsn")
+
+    response = await routing_client.get("/which")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == "replica"
+
+
+@pytest.mark.asyncio
+@pytest.mark.replica
+async def test_no_lsn_cookie_for_reads_and_failed_writes(routing_client):
+    """Проверяет, что cookie ставится только после успешной записи."""
+    read = await routing_client.get("/which")
+    failed = await routing_client.post("/fail")
+
+    assert LSN_COOKIE not in read.cookies
+    assert failed.status_code == status.HTTP_400_BAD_REQUEST
+    assert LSN_COOKIE not in failed.cookies
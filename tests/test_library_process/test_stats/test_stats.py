@@ -0,0 +1,112 @@
+"""Тесты для материализованной статистики каталога."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from lib_api.business_models.library_models.models_lib import (Book, Reader,
+                                                               ReaderBook)
+from lib_api.business_models.stats.stats_views import refresh_stats_views
+
+
+async def create_catalogue(db_session):
+    """Создаёт книги, читателей и выдачи для статистики."""
+    readers = [
+        Reader(name=f"Reader S{i}", email=f"stats{i}@example.com", note="")
+        for i in range(2)
+    ]
+    books = [
+        Book(title="Popular", author="Author P", copies_count=3),
+        Book(title="Rare", author="Author R", copies_count=1),
+        Book(title="Empty", author="Author E", copies_count=0),
+    ]
+    db_session.add_all(readers + books)
+    await db_session.commit()
+
+    now = datetime.now(timezone.utc)
+    loans = [
+        ReaderBook(reader_id=readers[0].id, book_id=books[0].id,
+                   borrow_date=now - timedelta(days=1),
+                   due_date=now + timedelta(days=13)),
+        ReaderBook(reader_id=readers[1].id, book_id=books[0].id,
+                   borrow_date=now - timedelta(days=2),
+                   due_date=now - timedelta(days=1)),
+        ReaderBook(reader_id=readers[0].id, book_id=books[1].id,
+                   borrow_date=now - timedelta(days=3),
+                   due_date=now + timedelta(days=11)),
+        ReaderBook(reader_id=readers[1].id, book_id=books[1].id,
+                   borrow_date=now - timedelta(days=30),
+                   due_date=now - timedelta(days=16),
+                   return_date=now - timedelta(days=20)),
+    ]
+    db_session.add_all(loans)
+    await db_session.commit()
+    return readers, books
+
+
+@pytest.mark.asyncio
+@pytest.mark.stats
+async def test_stats_read_precomputed_data(
+        client, db_session, engine, create_and_authenticate_librarian
+):
+    """
+    Проверяет, что статистика читается из представлений.
+
+    До обновления представления пусты, после — отражают выдачи.
+    """
+    readers, books = await create_catalogue(db_session)
+    librarian, token = create_and_authenticate_librarian
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get("/api/stats/catalogue", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_titles"] == 0
+
+    async with engine.begin() as conn:
+        assert await refresh_stats_views(conn) is True
+
+    response = await client.get("/api/stats/catalogue", headers=headers)
+    data = response.json()
+    assert data["total_titles"] == 3
+    assert data["zero_copy_titles"] == 1
+    assert data["available_copies"] == 4
+    assert data["active_loans"] == 3
+    assert data["refreshed_at"] is not None
+
+    response = await client.get(
+        "/api/stats/top-books", params={"limit": 1}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    top = response.json()["books"]
+    assert [book["book_id"] for book in top] == [books[0].id]
+    assert top[0]["loans_count"] == 2
+
+    response = await client.get("/api/stats/reader-loans", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    items = {item["reader_id"]: item for item in response.json()["items"]}
+    assert items[readers[0].id]["active_loans"] == 2
+    assert items[readers[0].id]["overdue_loans"] == 0
+    assert items[readers[1].id]["active_loans"] == 1
+    assert items[readers[1].id]["overdue_loans"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.stats
+async def test_stats_refresh_single_worker(engine):
+    """
+    Проверяет, что обновление выполняет только один воркер.
+
+    Пока первая транзакция держит блокировку, вторая пропускает проход.
+    """
+    async with engine.begin() as first:
+        assert await refresh_stats_views(first) is True
+        async with engine.begin() as second:
+            assert await refresh_stats_views(second) is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.stats
+async def test_stats_requires_auth(client):
+    """Проверяет, что статистика недоступна без токена."""
+    response = await client.get("/api/stats/catalogue")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
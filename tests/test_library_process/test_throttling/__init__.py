@@ -0,0 +1 @@
+"""Инициализация тестов ограничения частоты запросов."""
@@ -0,0 +1,125 @@
+"""Тесты ограничения частоты попыток входа."""
+
+import pytest
+from fastapi import status
+from lib_api import routing
+from lib_api.throttling.login_throttle import (LOGIN_EMAIL_BURST,
+                                               LOGIN_IP_BURST, LOGIN_PATH,
+                                               LoginThrottleMiddleware)
+from lib_api.throttling.stores import PostgresBucketStore
+from sqlalchemy.exc import OperationalError
+
+
+@pytest.mark.asyncio
+@pytest.mark.throttle
+async def test_login_throttled_per_email(
+        client, create_and_authenticate_librarian
+):
+    """Проверяет отказ 429 после серии неверных паролей к одному email."""
+    librarian, _ = create_and_authenticate_librarian
+    form_data = {"username": librarian.email, "password": "wrong"}
+
+    responses = [
+        await client.post("/api/librarian/oauth2-login", data=form_data)
+        for _ in range(int(LOGIN_EMAIL_BURST))
+    ]
+
+    assert status.HTTP_429_TOO_MANY_REQUESTS in [
+        r.status_code for r in responses
+    ]
+    throttled = await client.post(
+        "/api/librarian/oauth2-login",
+        data={"username": librarian.email.upper(), "password": "secret123?"}
+    )
+    assert throttled.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(throttled.headers["retry-after"]) >= 1
+    assert throttled.json()["detail"] == {
+        "result": False,
+        "error_type": "TooManyRequests",
+        "error_message": "Too many login attempts",
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.throttle
+async def test_login_throttled_per_ip_before_auth(client, monkeypatch):
+    """Проверяет, что отказ по IP происходит без проверки пароля."""
+    calls = []
+    original = routing.get_librarian_by_auth
+
+    async def counting_auth(*args, **kwargs):
+        calls.append(kwargs)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(routing, "get_librarian_by_auth", counting_auth)
+
+    statuses = [
+        (await client.post(
+            "/api/librarian/oauth2-login",
+            data={"username": f"user{i}@example.com", "password": "x"}
+        )).status_code
+        for i in range(int(LOGIN_IP_BURST) + 5)
+    ]
+
+    assert statuses.count(status.HTTP_429_TOO_MANY_REQUESTS) == 5
+    assert len(calls) == int(LOGIN_IP_BURST)
+
+
+@pytest.mark.asyncio
+@pytest.mark.throttle
+async def test_other_routes_not_throttled(client):
+    """Проверяет, что ограничение не затрагивает другие маршруты."""
+    statuses = {
+        (await client.get("/healthz")).status_code
+        for _ in range(int(LOGIN_IP_BURST) + 5)
+    }
+
+    assert statuses == {status.HTTP_200_OK}
+
+
+async def call_login(store, username: str) -> list[int]:
+    """Отправляет форму входа в middleware и возвращает статусы ответа."""
+    statuses = []
+
+    async def app(scope, receive, send):
+        await receive()
+        statuses.append(status.HTTP_200_OK)
+
+    async def receive():
+        return {"type": "http.request",
+                "body": f"username={username}&password=x".encode(),
+                "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    scope = {"type": "http", "method": "POST", "path": LOGIN_PATH,
+             "client": ("10.0.0.1", 1), "headers": []}
+    await LoginThrottleMiddleware(app, store=store)(scope, receive, send)
+    return statuses
+
+
+@pytest.mark.asyncio
+@pytest.mark.throttle
+async def test_long_username_fits_postgres_bucket_key(engine):
+    """Проверяет, что имя длиннее колонки ключа не ломает вход."""
+    store = PostgresBucketStore(engine)
+
+    assert await call_login(store, "a" * 2000 + "@example.com") == [
+        status.HTTP_200_OK
+    ]
+    await store.reset()
+
+
+@pytest.mark.asyncio
+@pytest.mark.throttle
+async def test_store_outage_fails_open():
+    """Проверяет, что недоступность хранилища не отказывает во входе."""
+    class BrokenStore:
+        async def take(self, *args, **kwargs):
+            raise OperationalError("take", {}, ConnectionError())
+
+    assert await call_login(BrokenStore(), "user@example.com") == [
+        status.HTTP_200_OK
+    ]
@@ -0,0 +1,96 @@
+"""Тесты таблицы корзин токенов и хранилищ."""
+
+import pytest
+from lib_api.throttling.stores import PostgresBucketStore
+from lib_api.throttling.token_bucket import TokenBucketTable
+from sqlalchemy import text
+
+
+@pytest.mark.throttle
+def test_bucket_allows_burst_then_rejects():
+    """Проверяет, что после burst попыток корзина отказывает."""
+    table = TokenBucketTable(capacity=10)
+
+    results = [table.take("k", rate=1, burst=3, now=0.0) for _ in range(4)]
+
+    assert results[:3] == [0.0, 0.0, 0.0]
+    assert results[3] == pytest.approx(1.0)
+
+
+@pytest.mark.throttle
+def test_bucket_refills_over_time():
+    """Проверяет пополнение корзины со скоростью rate."""
+    table = TokenBucketTable(capacity=10)
+    for _ in range(2):
+        table.take("k", rate=0.5, burst=2, now=0.0)
+
+    assert table.take("k", rate=0.5, burst=2, now=1.0) == pytest.approx(1.0)
+    assert table.take("k", rate=0.5, burst=2, now=2.0) == 0.0
+
+
+@pytest.mark.throttle
+def test_bucket_table_evicts_least_recently_used():
+    """Проверяет вытеснение давно не использованного ключа."""
+    table = TokenBucketTable(capacity=3)
+    for key in ("a", "b", "c"):
+        table.take(key, rate=1, burst=1, now=0.0)
+    table.take("a", rate=1, burst=1, now=0.0)
+
+    table.take("d", rate=1, burst=1, now=0.0)
+
+    assert len(table) == 3
+    assert "b" not in table
+    assert all(key in table for key in ("a", "c", "d"))
+    assert table.take("b", rate=1, burst=1, now=0.0) == 0.0
+    assert "c" not in table
+
+
+@pytest.mark.throttle
+def test_bucket_table_memory_is_bounded():
+    """Проверяет, что число корзин не превышает ёмкость."""
+    table = TokenBucketTable(capacity=100)
+
+    for i in range(10_000):
+        table.take(f"ip:{i}", rate=1, burst=5, now=float(i))
+
+    assert len(table) == 100
+    assert "ip:9999" in table
+    assert "ip:0" not in table
+
+
+@pytest.mark.asyncio
+@pytest.mark.throttle
+async def test_postgres_store_shares_bucket(engine):
+    """Проверяет общую корзину в PostgreSQL для двух хранилищ."""
+    first = PostgresBucketStore(engine)
+    second = PostgresBucketStore(engine)
+
+    assert await first.take("email:a@b.c", rate=0.01, burst=2) == 0.0
+    assert await second.take("email:a@b.c", rate=0.01, burst=2) == 0.0
+    retry_after = await first.take("email:a@b.c", rate=0.01, burst=2)
+
+    assert retry_after > 0
+    await first.reset()
+    assert await second.take("email:a@b.c", rate=0.01, burst=2) == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.throttle
+async def test_postgres_store_purges_idle_buckets(engine):
+    """Проверяет удаление корзин, простоявших дольше полного пополнения."""
+    store = PostgresBucketStore(engine)
+    await store.take("email:old", rate=1, burst=2)
+    await store.take("email:fresh", rate=1, burst=2)
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "UPDATE rate_limit_buckets"
+            " SET updated_at = now() - interval '1 hour'"
+            " WHERE key = 'email:old'"
+        ))
+
+    assert await store.purge_idle(60) == 1
+    async with engine.connect() as conn:
+        keys = (await conn.execute(
+            text("SELECT key FROM rate_limit_buckets")
+        )).scalars().all()
+    assert keys == ["email:fresh"]
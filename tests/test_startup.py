@@ -0,0 +1,61 @@
+"""Тесты времени импорта приложения."""
+
+import re
+import subprocess
+import sys
+from os import getenv
+from pathlib import Path
+
+import pytest
+
+IMPORT_TIME_BUDGET_MS = int(getenv("IMPORT_TIME_BUDGET_MS") or 2500)
+LAZY_MODULES = ("passlib", "jose", "jwt", "psycopg2")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_cold_import(code: str) -> subprocess.CompletedProcess:
+    """Импортирует приложение в новом интерпретаторе."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+@pytest.mark.app
+def test_cold_import_time_within_budget():
+    """
+    Проверяет холодный импорт lib_api.app по -X importtime.
+
+    Суммарное время модуля должно укладываться в бюджет
+    IMPORT_TIME_BUDGET_MS.
+    """
+    result = run_cold_import("import lib_api.app")
+    match = re.search(
+        r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+lib_api\.app$",
+        result.stderr,
+        re.MULTILINE,
+    )
+    assert match, "lib_api.app not found in -X importtime output"
+
+    cumulative_ms = int(match.group(1)) / 1000
+    assert cumulative_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"Cold import of lib_api.app took {cumulative_ms:.0f} ms,"
+        f" budget is {IMPORT_TIME_BUDGET_MS} ms"
+    )
+
+
+@pytest.mark.app
+def test_rarely_used_modules_are_lazy():
+    """
+    Проверяет, что тяжёлые редко нужные модули не импортируются.
+
+    passlib, jose, jwt и psycopg2 загружаются при первом использовании.
+    """
+    result = run_cold_import(
+        "import sys, lib_api.app;"
+        f" print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    assert result.stdout.strip() == ""